@@ -0,0 +1,48 @@
+"""Fixtures for the brand asset generator tests (scripts/generate-brand-assets.py).
+
+Run from the repo root with ``python -m pytest __tests__/scripts/brand_assets``.
+"""
+
+import importlib.util
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[3] / "scripts" / "generate-brand-assets.py"
+
+
+def load_generator():
+    """Import the generator script as the module ``generate_brand_assets``."""
+    if "generate_brand_assets" in sys.modules:
+        return sys.modules["generate_brand_assets"]
+    spec = importlib.util.spec_from_file_location("generate_brand_assets", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    # Registered first so dataclasses and pickled pool jobs resolve the module.
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def gen():
+    return load_generator()
+
+
+@pytest.fixture
+def options(gen, tmp_path):
+    """Default command-line options with the build cache kept under tmp_path."""
+    return gen.parse_args(["--cache-dir", str(tmp_path / "cache")])
+
+
+@pytest.fixture
+def decode():
+    """Decode image bytes into an RGBA NumPy array."""
+    np = pytest.importorskip("numpy")
+    Image = pytest.importorskip("PIL.Image")
+
+    def decode(data):
+        return np.asarray(Image.open(BytesIO(data)).convert("RGBA"))
+
+    return decode
@@ -0,0 +1,44 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def segment_distances(points, polyline):
+    """Distance from each of ``points`` to the nearest segment of ``polyline``."""
+    start, chord = polyline[:-1], np.diff(polyline, axis=0)
+    rel = points[:, None, :] - start[None]
+    t = np.clip((rel * chord).sum(axis=2) / np.maximum((chord * chord).sum(axis=1), 1e-12), 0, 1)
+    off = rel - t[..., None] * chord
+    return np.hypot(off[..., 0], off[..., 1]).min(axis=1)
+
+
+@pytest.mark.parametrize("size", [16, 1024])
+def test_adaptive_arc_edges_stay_within_tolerance(gen, size):
+    tolerance = gen.arc_tolerance(size)
+    for args in gen.icon_arc_args((size,)):
+        sampled = gen.tapered_arc_outline(*args, tolerance=tolerance)
+        exact = gen.tapered_arc_outline(*args, steps=4000)
+        for edge, curve in zip(sampled, exact):
+            assert segment_distances(curve, edge).max() <= gen.ARC_TOLERANCE_PX
+
+
+def test_refinement_matches_between_python_and_numpy(gen):
+    for args in gen.icon_arc_args((16, 1024)):
+        tolerance = gen.arc_tolerance(args[0] * 2)
+        assert (gen.tapered_arc_path_py(*args, tolerance=tolerance)
+                == gen.tapered_arc_path_np(*args, tolerance=tolerance))
+
+
+def test_even_sampling_matches_between_python_and_numpy(gen):
+    for args in gen.icon_arc_args((32, 512)):
+        assert gen.tapered_arc_path_py(*args, steps=80) == gen.tapered_arc_path_np(*args, steps=80)
+
+
+@pytest.mark.parametrize("rx, ry, rot", [(40, 25, 0), (40, 25, -30), (10, 10, 75), (30, 0, 15)])
+def test_ellipse_arrays_match_the_scalar_helpers(gen, rx, ry, rot):
+    t = np.linspace(-90, 270, 37)
+    px, py = gen.ellipse_points_np(50, 60, rx, ry, rot, t)
+    nx, ny = gen.ellipse_normals_np(rx, ry, rot, t)
+    for i, deg in enumerate(t):
+        assert (px[i], py[i]) == pytest.approx(gen.ellipse_point(50, 60, rx, ry, rot, deg), abs=1e-12)
+        assert (nx[i], ny[i]) == pytest.approx(gen.ellipse_normal(rx, ry, rot, deg), abs=1e-12)
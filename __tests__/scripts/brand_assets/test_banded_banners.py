@@ -0,0 +1,33 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL.Image")
+
+
+@pytest.mark.parametrize("generator, args", [
+    ("generate_category_png", ("vehicles", 640, 360)),
+    ("generate_og_image", ("listing", 600, 315)),
+])
+def test_banded_banner_equals_the_full_frame_render(gen, decode, generator, args):
+    generator = getattr(gen, generator)
+    full = decode(gen.encode_png(generator(*args)))
+    # A tiny budget forces BANNER_MIN_BAND_ROWS-row bands.
+    banded = decode(gen.render_banner_bands(1, generator, *args))
+    assert banded.shape == full.shape
+    assert np.array_equal(banded, full)
+    # The drawn text leaves translucent pixels, which the bands must keep.
+    assert full[..., 3].min() < 255
+
+
+def test_band_rows_follow_the_budget(gen):
+    assert gen.banner_band_rows(7680, 4320, 1) == gen.BANNER_MIN_BAND_ROWS
+    assert gen.banner_band_rows(1920, 1080, 10_000) == 1080
+    assert gen.banner_banded(7680, 4320, 512) and not gen.banner_banded(1200, 630, 512)
+
+
+def test_streamed_png_round_trips_across_band_edges(gen, decode):
+    from PIL import Image
+    rng = np.random.default_rng(3)
+    pixels = rng.integers(0, 256, size=(37, 23, 4), dtype=np.uint8)
+    bands = (Image.fromarray(pixels[top:top + 8], "RGBA") for top in range(0, 37, 8))
+    assert np.array_equal(decode(gen.encode_png_stream(23, 37, bands, "RGBA")), pixels)
@@ -0,0 +1,37 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL.Image")
+
+BANNERS = [
+    ("generate_category_png", ("vehicles", 480, 270)),
+    ("generate_category_png", ("watches", 1200, 630)),
+    ("generate_og_image", ("default", 1200, 630)),
+    ("generate_og_image", ("listing", 600, 315)),
+]
+
+
+@pytest.mark.parametrize("generator, args", BANNERS)
+def test_numpy_banners_match_the_pillow_drawing(gen, monkeypatch, generator, args):
+    fast = np.asarray(getattr(gen, generator)(*args), dtype=int)
+    monkeypatch.setattr(gen, "HAS_NUMPY", False)
+    slow = np.asarray(getattr(gen, generator)(*args), dtype=int)
+    assert fast.shape == slow.shape
+    diff = np.abs(fast - slow)
+    # Only the glow differs: Pillow's GaussianBlur approximates the exact blur with box passes.
+    assert diff.max() <= 4 and diff.mean() < 0.5
+
+
+def test_category_background_rows_and_streak(gen):
+    canvas = gen.category_background_np(64, 100, (226, 34, 41), 50, 10)
+    assert canvas.shape == (100, 64, 3) and canvas.dtype == np.float32
+    assert (canvas == canvas[:, :1]).all()
+    assert canvas[0, 0].tolist() == [2, 1, 2] and canvas[40, 0].tolist() == [4, 3, 4]
+    streak = canvas[50:60, 0, 0]
+    assert streak.max() == canvas[55, 0, 0] > 100 and canvas[49, 0, 0] == canvas[60, 0, 0] == 4
+
+
+def test_backgrounds_drawn_in_bands_match_the_whole(gen):
+    whole = gen.og_background_np(200, 120, 90, 12)
+    parts = [gen.og_background_np(200, 120, 90, 12, band=(top, 40)) for top in range(0, 120, 40)]
+    assert np.array_equal(np.concatenate(parts), whole)
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+
+def result(best, size=None):
+    return {"best": best, "mean": best, "runs": 3, "bytes": size}
+
+
+@pytest.fixture
+def quick(gen, monkeypatch):
+    """Time each benchmark case once or twice instead of for half a second."""
+    monkeypatch.setattr(gen, "BENCH_MIN_TIME", 0)
+    monkeypatch.setattr(gen, "BENCH_RUNS", (1, 2))
+
+
+def test_case_names_are_unique(gen):
+    names = [name for name, _, _ in gen.benchmark_cases()]
+    assert len(names) == len(set(names))
+    assert any(n.startswith("raster/") for n in names) and any(n.startswith("svg-optimize/") for n in names)
+
+
+def test_time_case_records_output_size(gen, quick):
+    best, mean, runs, size = gen.time_case(lambda n: "x" * n, (7,))
+    assert 0 <= best <= mean and 1 <= runs <= 2 and size == 7
+    assert gen.time_case(lambda: None, ())[3] is None
+
+
+def test_compare_flags_only_real_slowdowns(gen, capsys):
+    baseline = {"backend": "b", "cases": {"fast": result(0.010), "slow": result(0.010, 100),
+                                          "tiny": result(0.00001)}}
+    results = {"backend": "b", "cases": {"fast": result(0.0105), "slow": result(0.020, 90),
+                                         "tiny": result(0.00005), "added": result(1.0)}}
+    assert gen.compare_benchmarks(results, baseline, threshold=0.25) == ["slow"]
+    out = capsys.readouterr().out
+    assert "bytes 100 -> 90" in out and "new case" in out
+    # A slowdown below BENCH_NOISE_FLOOR seconds is never a regression, whatever the ratio.
+    tiny = next(line for line in out.splitlines() if "tiny" in line)
+    assert "5.00x" in tiny and "REGRESSION" not in tiny
+
+
+def test_benchmark_cli_writes_results_and_fails_on_regression(gen, quick, tmp_path):
+    out = tmp_path / "bench.json"
+    assert gen.main(["--benchmark", str(out), "--bench-cases", "geometry/*"]) == str(out)
+    results = json.loads(out.read_text())
+    assert results["cases"] and all(name.startswith("geometry/") for name in results["cases"])
+
+    faster = {"backend": results["backend"],
+              "cases": {name: result(case["best"] / 10) for name, case in results["cases"].items()}}
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(faster))
+    with pytest.raises(SystemExit) as exit_info:
+        gen.main(["--benchmark", str(out), "--bench-cases", "geometry/*", "--baseline", str(baseline),
+                  "--bench-threshold", "0.5"])
+    assert exit_info.value.code == 1
+
+    with pytest.raises(SystemExit, match="No benchmark case matches"):
+        gen.main(["--benchmark", str(out), "--bench-cases", "nothing/*"])
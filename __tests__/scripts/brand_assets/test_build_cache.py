@@ -0,0 +1,86 @@
+import copy
+
+import pytest
+
+
+def icon_key(gen, size=64):
+    return gen.asset_cache_key((gen.render_generated_png, gen.generate_vortex_icon_svg),
+                               {"variant": "core", "size": [size, size]})
+
+
+def banner_key(gen):
+    return gen.asset_cache_key((gen.render_image_png, gen.generate_category_png),
+                               {"category": "vehicles", "size": [1200, 630]})
+
+
+@pytest.fixture
+def edit_spec(gen, monkeypatch):
+    """Apply ``change`` to a copy of the brand spec and read that copy from now on."""
+    def edit(change):
+        spec = copy.deepcopy(gen.brand_spec())
+        change(spec)
+        monkeypatch.setattr(gen, "brand_spec", lambda: spec)
+
+    return edit
+
+
+def gradient(spec, name):
+    return next(g for g in spec["gradientSystem"]["gradients"] if g["name"] == name)
+
+
+def test_key_changes_with_parameters(gen):
+    assert icon_key(gen, 64) != icon_key(gen, 128)
+    assert icon_key(gen) == icon_key(gen)
+
+
+def test_key_changes_with_a_gradient_the_asset_draws(gen, edit_spec):
+    before = icon_key(gen), banner_key(gen)
+    edit_spec(lambda spec: gradient(spec, "redArcGradient")["stops"][0].update(color="#000000"))
+    assert icon_key(gen) != before[0]
+    # Category banners paint from categoryExpressions, never from a named gradient.
+    assert banner_key(gen) == before[1]
+
+
+def test_key_ignores_gradients_the_asset_never_names(gen, edit_spec):
+    before = icon_key(gen)
+    edit_spec(lambda spec: gradient(spec, "heroOverlayGradient").update(angle=90))
+    assert icon_key(gen) == before
+
+
+def test_key_changes_with_the_spec_sections_read(gen, edit_spec):
+    before = icon_key(gen), banner_key(gen)
+    edit_spec(lambda spec: spec["categoryExpressions"]["vehicles"].update(note="changed"))
+    assert icon_key(gen) == before[0]
+    assert banner_key(gen) != before[1]
+
+
+def test_key_covers_helpers_reached_only_through_other_helpers(gen, monkeypatch):
+    code = gen.code_dependencies(gen.render_generated_png)[0]
+    assert {gen.refine_arc_params_np, gen.polygon_coverage, gen.svg_gradient_def} <= code
+    before = icon_key(gen), banner_key(gen)
+    monkeypatch.setitem(gen._source_digests, gen.refine_arc_params_np, "edited")
+    assert icon_key(gen) != before[0]
+    assert banner_key(gen) == before[1]
+
+
+def test_key_covers_module_constants(gen, monkeypatch):
+    before = icon_key(gen)
+    monkeypatch.setattr(gen, "ARC_TOLERANCE_PX", gen.ARC_TOLERANCE_PX / 2)
+    assert icon_key(gen) != before
+
+
+def test_targets_share_a_key_only_when_rendered_identically(gen, options):
+    jobs = {}
+    for target in gen.build_targets(options).values():
+        if target.key is not None:
+            assert jobs.setdefault(target.key, (target.fn, target.args)) == (target.fn, target.args)
+
+
+def test_asset_cache_round_trip(gen, tmp_path):
+    cache = gen.AssetCache(tmp_path)
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, b"asset")
+    assert cache.get("ab" * 32) == b"asset"
+    assert (cache.hits, cache.misses) == (1, 1)
+    disabled = gen.AssetCache(tmp_path, enabled=False)
+    assert disabled.get("ab" * 32) is None
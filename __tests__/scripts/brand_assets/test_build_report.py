@@ -0,0 +1,52 @@
+import csv
+import json
+
+import pytest
+
+
+@pytest.fixture
+def pack_root(gen, monkeypatch, tmp_path):
+    """Point the generator's output directory and ZIP at tmp_path."""
+    monkeypatch.setattr(gen, "OUTPUT_DIR", tmp_path / "brand-assets")
+    monkeypatch.setattr(gen, "ZIP_PATH", tmp_path / "itrader-brand-assets-v2.zip")
+    return tmp_path
+
+
+def test_partial_build_leaves_the_report_alone(gen, pack_root, capsys):
+    report = pack_root / "itrader-brand-assets-v2-report.json"
+    report.write_text('{"assets": "from the last full build"}')
+    assert gen.main(["--only", "favicon/icon.svg", "--no-cache"]) is None
+    assert report.read_text() == '{"assets": "from the last full build"}'
+    assert not (pack_root / "itrader-brand-assets-v2-report.csv").exists()
+    assert not (pack_root / "itrader-brand-assets-v2.zip").exists()
+    assert "Skipping build report files" in capsys.readouterr().out
+
+
+def test_write_report_json_and_csv(gen, options, tmp_path):
+    targets = gen.build_targets(options)
+    names = ["favicon/icon.svg", "manifest/site.webmanifest"]
+    queue = gen.RenderQueue(None, gen.AssetCache(tmp_path, enabled=False))
+    queue.run(targets, names)
+    json_path, csv_path = gen.write_report(gen.build_report(targets, queue, names), tmp_path / "report")
+    assets = json.loads(json_path.read_text())["assets"]
+    assert [a["name"] for a in assets] == names
+    assert assets[0]["status"] == "rendered" and assets[0]["width"] is not None
+    with open(csv_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert tuple(rows[0]) == gen.REPORT_FIELDS
+    assert [r["name"] for r in rows] == names
+
+
+def test_restored_assets_keep_their_render_profile(gen, options, tmp_path):
+    targets = gen.build_targets(options)
+    names = ["favicon/icon.png"]
+    records = []
+    for _ in range(2):
+        queue = gen.RenderQueue(None, gen.AssetCache(tmp_path / "cache"))
+        queue.run(targets, names)
+        records.append(gen.build_report(targets, queue, names)[0])
+    rendered, restored = records
+    assert (rendered["status"], restored["status"]) == ("rendered", "restored")
+    assert restored["backend"] == rendered["backend"] is not None
+    assert restored["rasterize"] == rendered["rasterize"] > 0
+    assert all(restored[p] == rendered[p] for p in gen.PHASES)
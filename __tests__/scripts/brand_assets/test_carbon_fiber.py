@@ -0,0 +1,25 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.mark.parametrize("width, height", [(16, 16), (50, 37), (5, 100)])
+def test_tiling_matches_pasting_the_unit(gen, monkeypatch, width, height):
+    unit = gen.carbon_fiber_unit(1)
+    tiled = np.asarray(gen.tile_image(unit, width, height))
+    monkeypatch.setattr(gen, "HAS_NUMPY", False)
+    assert np.array_equal(tiled, np.asarray(gen.tile_image(unit, width, height)))
+
+
+@pytest.mark.parametrize("density", [1, 3])
+def test_carbon_fiber_repeats_its_unit(gen, density):
+    unit = np.asarray(gen.carbon_fiber_unit(density))
+    assert unit.shape == (16 * density, 16 * density, 4)
+    texture = np.asarray(gen.generate_carbon_fiber_png(40, density))
+    assert texture.shape == (40 * density, 40 * density, 4)
+    period = unit.shape[0]
+    for y in range(0, texture.shape[0], period):
+        for x in range(0, texture.shape[1], period):
+            block = texture[y:y + period, x:x + period]
+            assert np.array_equal(block, unit[:block.shape[0], :block.shape[1]])
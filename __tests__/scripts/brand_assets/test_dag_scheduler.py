@@ -0,0 +1,72 @@
+import pytest
+
+CALLS = []
+
+
+def leaf(name):
+    CALLS.append(name)
+    return name.encode()
+
+
+def joined(name, outputs):
+    CALLS.append(name)
+    return b"+".join(outputs[dep] for dep in sorted(outputs))
+
+
+def broken(name):
+    CALLS.append(name)
+    raise RuntimeError("boom")
+
+
+def strict(name, outputs):
+    CALLS.append(name)
+    return None if len(outputs) < 1 else b"ok"
+
+
+@pytest.fixture
+def graph(gen):
+    """Four stages: c depends on a and b, e on the failing d, f on nothing."""
+    CALLS.clear()
+    T = gen.AssetTarget
+    targets = [T("c.txt", 1, joined, ("c.txt",), deps=("a.txt", "b.txt")),
+               T("a.txt", 1, leaf, ("a.txt",)),
+               T("d.txt", 2, broken, ("d.txt",)),
+               T("e.txt", 2, strict, ("e.txt",), deps=("d.txt",)),
+               T("b.txt", 3, leaf, ("b.txt",)),
+               T("f.txt", 4, leaf, ("f.txt",))]
+    return {t.name: t for t in targets}
+
+
+def test_dependencies_run_first_and_feed_their_dependents(gen, graph, tmp_path, capsys):
+    queue = gen.RenderQueue(tmp_path, gen.AssetCache(tmp_path, enabled=False))
+    finished = []
+    queue.run(graph, list(graph), write=set(graph), progress=lambda t, ok: finished.append((t.name, ok)))
+    assert CALLS.index("a.txt") < CALLS.index("c.txt") and CALLS.index("b.txt") < CALLS.index("c.txt")
+    assert queue.outputs["c.txt"] == b"a.txt+b.txt"
+    assert (tmp_path / "c.txt").read_bytes() == b"a.txt+b.txt"
+    # A failing job is reported; its dependents fail with it and the rest still render.
+    assert queue.failed == ["d.txt", "e.txt"]
+    assert "Render failed for d.txt: boom" in capsys.readouterr().out
+    assert dict(finished) == {"a.txt": True, "b.txt": True, "c.txt": True, "d.txt": False,
+                              "e.txt": False, "f.txt": True}
+    # Written files keep pack order whatever order the jobs ran in.
+    assert queue.generated_files == ["c.txt", "a.txt", "b.txt", "f.txt"]
+
+
+def test_dependencies_outside_the_run_come_from_outputs(gen, graph, tmp_path):
+    queue = gen.RenderQueue(None, gen.AssetCache(tmp_path, enabled=False))
+    queue.outputs.update({"a.txt": b"A", "b.txt": b"B"})
+    queue.run(graph, ["c.txt"])
+    assert CALLS == ["c.txt"] and queue.outputs["c.txt"] == b"A+B"
+
+
+def test_with_dependencies_puts_dependencies_first(gen, graph):
+    assert gen.with_dependencies(graph, ["c.txt", "e.txt", "a.txt"]) == ["a.txt", "b.txt", "c.txt", "d.txt", "e.txt"]
+
+
+def test_critical_path_is_the_slowest_chain(gen, graph):
+    timings = {"a.txt": 1.0, "b.txt": 3.0, "c.txt": 0.5, "d.txt": 2.0, "e.txt": 2.0, "f.txt": 3.9}
+    assert gen.critical_path(graph, timings) == (4.0, ["d.txt", "e.txt"])
+    timings["f.txt"] = 4.5
+    assert gen.critical_path(graph, timings) == (4.5, ["f.txt"])
+    assert gen.critical_path(graph, {}) == (0.0, [])
@@ -0,0 +1,76 @@
+import pytest
+
+ImageFont = pytest.importorskip("PIL.ImageFont")
+
+
+@pytest.fixture
+def font_bytes():
+    """A TrueType font to ship: the one Pillow embeds as its scalable default."""
+    try:
+        source = ImageFont.load_default(20).path
+    except TypeError:
+        pytest.skip("Pillow < 10.1 has no scalable default font")
+    if not hasattr(source, "getvalue"):
+        pytest.skip("this Pillow build has no embedded TrueType font")
+    return source.getvalue()
+
+
+@pytest.fixture
+def font_dir(gen, monkeypatch, tmp_path, font_bytes):
+    """FONT_DIRS pointed at an empty tmp_path/fonts, with the registry caches reset."""
+    fonts = tmp_path / "fonts"
+    fonts.mkdir()
+    monkeypatch.setattr(gen, "FONT_DIRS", (fonts, tmp_path / "missing"))
+    monkeypatch.setattr(gen, "FONT_FALLBACKS", {"regular": ("no-such-font.ttf",), "bold": ("no-such-font.ttf",)})
+    for cached in (gen.font_files, gen.brand_font, gen.text_length):
+        cached.cache_clear()
+    yield fonts
+    for cached in (gen.font_files, gen.brand_font, gen.text_length):
+        cached.cache_clear()
+
+
+def ship(font_dir, font_bytes, *names):
+    for name in names:
+        path = font_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(font_bytes)
+
+
+def test_family_names_include_the_approximations(gen):
+    assert gen.font_family_names("geometricSans (approx: Montserrat / Gotham)") == ["geometricSans", "Montserrat",
+                                                                                  "Gotham"]
+    assert gen.font_family_names("Inter") == ["Inter"]
+
+
+def test_candidates_prefer_the_styled_cut(gen, font_dir, font_bytes):
+    ship(font_dir, font_bytes, "Montserrat-SemiBold.ttf", "Montserrat-Regular.ttf", "sub/GothamRounded-Book.otf",
+         "readme.txt")
+    family = "geometricSans (approx: Montserrat / Gotham)"
+    assert [p.rsplit("/", 1)[-1] for p in gen.font_candidates(family, "semiBold")] == [
+        "Montserrat-SemiBold.ttf", "Montserrat-Regular.ttf", "GothamRounded-Book.otf", "no-such-font.ttf"]
+    assert gen.font_candidates(family)[0].endswith("Montserrat-Regular.ttf")
+    assert gen.font_candidates("Unknown") == ["no-such-font.ttf"]
+
+
+def test_brand_font_loads_the_shipped_file_once(gen, font_dir, font_bytes):
+    ship(font_dir, font_bytes, "Montserrat-Bold.ttf")
+    font = gen.brand_font("Montserrat", 24, "bold")
+    assert font.path == str(font_dir / "Montserrat-Bold.ttf") and font.size == 24
+    assert gen.brand_font("Montserrat", 24, "bold") is font
+    assert gen.text_length(font, "iTrader") == font.getlength("iTrader")
+    assert gen.text_length.cache_info().currsize == 1
+
+
+def test_brand_font_falls_back_to_the_default(gen, font_dir):
+    font = gen.brand_font("Montserrat", 30)
+    assert font.size == 30 and not isinstance(font.path, str)
+
+
+def test_font_stamp_tracks_the_shipped_files(gen, font_dir, font_bytes):
+    assert gen.font_stamp() == ""
+    ship(font_dir, font_bytes, "Inter-Regular.ttf")
+    gen.font_files.cache_clear()
+    stamp = gen.font_stamp()
+    assert stamp.startswith(f"Inter-Regular.ttf:{len(font_bytes)}:")
+    (font_dir / "Inter-Regular.ttf").write_bytes(font_bytes + b"\0")
+    assert gen.font_stamp() != stamp
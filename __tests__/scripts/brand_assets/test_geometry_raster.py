@@ -0,0 +1,80 @@
+import functools
+import struct
+from io import BytesIO
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def no_cairo(gen, monkeypatch):
+    monkeypatch.setattr(gen, "has_cairo", lambda: False)
+
+
+def ico_images(data):
+    """Decode every entry of an .ico file into RGBA arrays keyed by width."""
+    count = struct.unpack("<HHH", data[:6])[2]
+    images = {}
+    for i in range(count):
+        size, offset = struct.unpack("<II", data[6 + 16 * i + 8:6 + 16 * i + 16])
+        img = np.asarray(Image.open(BytesIO(data[offset:offset + size])).convert("RGBA"))
+        images[img.shape[1]] = img
+    return images
+
+
+def test_svg_to_pil_draws_generator_geometry_without_cairo(gen, no_cairo):
+    icon = functools.partial(gen.generate_vortex_icon_svg, 512, "core", False)
+    img = np.asarray(gen.svg_to_pil(icon, 48, 48))
+    expected = np.asarray(gen.geometry_image(gen.generate_vortex_icon_svg, (512, "core", False, 48), 48, 48))
+    assert np.array_equal(img, expected)
+    assert len(np.unique(img.reshape(-1, 4), axis=0)) > 16
+
+
+def test_svg_to_pil_never_returns_a_blank_placeholder(gen, no_cairo):
+    assert gen.svg_to_pil(gen.generate_vortex_icon_svg(512, "core", False), 48, 48) is None
+    assert gen.render_ico(gen.generate_badge_svg("premium"), [16, 32]) is None
+
+
+def test_ico_without_cairo_holds_the_icon_at_every_size(gen, no_cairo):
+    icon = functools.partial(gen.generate_vortex_icon_svg, 512, "core", False)
+    images = ico_images(gen.render_ico(icon, [16, 32, 48]))
+    assert sorted(images) == [16, 32, 48]
+    for img in images.values():
+        assert img[..., 3].min() == 0 and img[..., 3].max() > 200
+
+
+def test_geometry_raster_matches_the_svg_canvas(gen):
+    img = gen.geometry_image(gen.generate_vortex_icon_svg, (1024, "core", True, 128), 128, 128)
+    alpha = np.asarray(img)[..., 3]
+    # Glow and arcs stay inside the canvas and the centre of the vortex is drawn.
+    assert img.size == (128, 128)
+    assert alpha[64, 64] > 0
+    assert alpha[0].max() < 255 and alpha[:, 0].max() < 255
+
+
+def test_generators_without_a_scene_have_no_geometry(gen):
+    assert gen.geometry_image(gen.generate_badge_svg, ("premium",), 64, 64) is None
+
+
+def test_vortex_app_icon_is_drawn_without_cairo(gen, no_cairo, decode):
+    img = decode(gen.render_generated_png(gen.generate_app_icon_svg, ("vortexOnly",), 128, 128))
+    expected = np.asarray(gen.geometry_image(gen.generate_app_icon_svg, ("vortexOnly",), 128, 128))
+    assert np.array_equal(img, expected)
+    assert len(np.unique(img.reshape(-1, 4), axis=0)) > 16
+    # Rounded corners are clipped away; the background is opaque inside them.
+    assert img[0, 0, 3] == 0 and img[64, 4, 3] == 255 and img[64, 64, 3] == 255
+
+
+def test_text_app_icon_keeps_the_placeholder(gen):
+    assert gen.geometry_image(gen.generate_app_icon_svg, ("monogramIT",), 64, 64) is None
+
+
+def test_rounded_rect_shape_fills_its_box(gen):
+    shape = gen.Shape("rect", (8, 8, 48, 32, 0), fill="#ffffff")
+    alpha = np.asarray(gen.rasterize_shapes([shape], 64, 64, 64, 64))[..., 3]
+    assert alpha[8:40, 8:56].min() == 255 and alpha.sum() == 255 * 48 * 32
+    rounded = gen.Shape("rect", (8, 8, 48, 32, 12), fill="#ffffff")
+    alpha = np.asarray(gen.rasterize_shapes([rounded], 64, 64, 64, 64))[..., 3]
+    assert alpha[8, 8] == 0 and alpha[24, 32] == 255
@@ -0,0 +1,20 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL.Image")
+
+
+@pytest.mark.parametrize("numpy_path", [True, False])
+def test_glass_noise_is_faint_grey_grain(gen, monkeypatch, numpy_path):
+    monkeypatch.setattr(gen, "HAS_NUMPY", numpy_path)
+    pixels = np.asarray(gen.generate_glass_noise_png(64), dtype=int)
+    assert pixels.shape == (64, 64, 4)
+    assert (pixels[..., 0] == pixels[..., 1]).all() and (pixels[..., 1] == pixels[..., 2]).all()
+    assert pixels[..., 3].min() >= 5 and pixels[..., 3].max() <= 25
+    assert len(np.unique(pixels[..., 0])) > 200
+
+
+def test_glass_noise_is_deterministic_per_seed(gen):
+    first = np.asarray(gen.generate_glass_noise_png(128, seed=7))
+    assert np.array_equal(first, np.asarray(gen.generate_glass_noise_png(128, seed=7)))
+    assert not np.array_equal(first, np.asarray(gen.generate_glass_noise_png(128, seed=8)))
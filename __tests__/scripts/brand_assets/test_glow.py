@@ -0,0 +1,76 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def exact_glow(gen, box, sigma, w, h):
+    """Coverage of the ellipse ``box`` blurred by an exact, full-resolution Gaussian."""
+    x0, y0, x1, y1 = box
+    t = np.linspace(0, 360, 2048, endpoint=False)
+    px, py = gen.ellipse_points_np((x0 + x1 + 1) / 2, (y0 + y1 + 1) / 2, (x1 - x0 + 1) / 2, (y1 - y0 + 1) / 2, 0, t)
+    coverage = gen.polygon_coverage([np.column_stack((px, py))], w, h)
+    return gen.coarse_gaussian_blur(coverage.astype(np.float32), sigma)
+
+
+GLOWS = {
+    "small-disc": ((40, 40, 55, 55), 6, 96, 96),
+    "disc": ((64, 64, 191, 191), 32, 256, 256),
+    "wide-disc": ((100, 100, 411, 411), 120, 512, 512),
+    "ellipse": ((128, 80, 383, 175), 40, 512, 256),
+}
+
+
+@pytest.mark.parametrize("name", sorted(GLOWS))
+def test_glow_coverage_within_tolerance_of_an_exact_blur(gen, name):
+    box, sigma, w, h = GLOWS[name]
+    glow = gen.EllipseGlow(box, sigma)
+    coverage = glow.coverage(0, h, 0, w)
+    assert coverage.dtype == np.float32
+    assert np.abs(coverage - exact_glow(gen, box, sigma, w, h)).max() <= gen.GLOW_TOLERANCE
+
+
+def test_glow_is_evaluated_on_a_coarse_grid(gen):
+    glow = gen.EllipseGlow((480, 60, 1439, 1019), 240)
+    assert glow.step >= 8
+    assert glow.grid.dtype == np.float32 and glow.grid.size * glow.step ** 2 >= 1920 * 1080
+
+
+def test_coverage_windows_agree_with_the_whole(gen):
+    box, sigma, w, h = GLOWS["disc"]
+    glow = gen.EllipseGlow(box, sigma)
+    whole = glow.coverage(0, h, 0, w)
+    assert np.array_equal(glow.coverage(37, 50, 20, 200), whole[37:87, 20:200])
+
+
+def test_glow_over_blends_like_a_blurred_straight_alpha_layer(gen):
+    box, sigma, w, h = GLOWS["ellipse"]
+    canvas = np.random.default_rng(1).uniform(0, 255, (h, w, 3)).astype(np.float32)
+    before = canvas.copy()
+    gen.glow_over(canvas, w, h, box, (226, 34, 41, 40), sigma, (0, h))
+    glow = gen.EllipseGlow(box, sigma)
+    x0, x1 = glow.extent[0], glow.extent[2]
+    coverage = glow.coverage(0, h, x0, x1)[..., None]
+    alpha = coverage * 40 / 255
+    expected = before[:, x0:x1] * (1 - alpha) + coverage * np.float32([226, 34, 41]) * alpha
+    assert np.allclose(canvas[:, x0:x1], expected, atol=1e-3)
+    # Beyond the extent the glow is negligible and the canvas is left alone.
+    assert np.array_equal(canvas[:, :x0], before[:, :x0]) and np.array_equal(canvas[:, x1:], before[:, x1:])
+
+
+def test_glow_over_draws_only_the_band_rows(gen):
+    box, sigma, w, h = GLOWS["disc"]
+    full = np.zeros((h, w, 3), dtype=np.float32)
+    gen.glow_over(full, w, h, box, (21, 123, 202, 255), sigma, (0, h))
+    band = np.zeros((60, w, 3), dtype=np.float32)
+    gen.glow_over(band, w, h, box, (21, 123, 202, 255), sigma, (100, 60))
+    assert np.allclose(band, full[100:160], atol=1e-4)
+
+
+def test_composite_over_broadcasts_rows_and_columns(gen):
+    canvas = np.full((4, 5, 3), 100, dtype=np.float32)
+    rows = np.float32([0, 0.25, 0.5, 1])[:, None, None]
+    gen.composite_over(canvas, (200, 0, 40), rows)
+    assert np.allclose(canvas[:, 0], [[100, 100, 100], [125, 75, 85], [150, 50, 70], [200, 0, 40]])
+    cols = np.float32([1, 0, 0, 0, 0.5])[None, :, None]
+    gen.composite_over(canvas, (0, 0, 0), cols, rows=slice(0, 1))
+    assert np.allclose(canvas[0, :, 0], [0, 100, 100, 100, 50])
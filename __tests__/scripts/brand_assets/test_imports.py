@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+from conftest import SCRIPT
+
+PROBE = textwrap.dedent(f"""
+    import importlib.util, json, sys, types
+    spec = importlib.util.spec_from_file_location("generate_brand_assets", {str(SCRIPT)!r})
+    gen = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = gen
+    spec.loader.exec_module(gen)
+    loaded = lambda name: type(sys.modules.get(name)) is types.ModuleType
+    result = {{"pillow": gen.HAS_PILLOW, "image_loaded": loaded("PIL.Image"),
+               "numpy_loaded": loaded("numpy"), "spec_parsed": gen.brand_spec.cache_info().currsize > 0}}
+    result["svg"] = "<svg" in gen.generate_vortex_icon_svg(64)
+    result["backend"] = gen.raster_backend()
+    print(json.dumps(result))
+""")
+
+
+def probe(pythonpath=None):
+    env = dict(os.environ)
+    if pythonpath:
+        env["PYTHONPATH"] = os.pathsep.join([str(pythonpath), env.get("PYTHONPATH", "")])
+    out = subprocess.run([sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def test_import_defers_heavy_modules_and_the_spec():
+    result = probe()
+    assert not result["image_loaded"]
+    assert not result["numpy_loaded"]
+    assert not result["spec_parsed"]
+    assert result["svg"]
+
+
+def test_broken_pillow_counts_as_missing(tmp_path):
+    pil = tmp_path / "PIL"
+    pil.mkdir()
+    (pil / "__init__.py").write_text("")
+    (pil / "_imaging.py").write_text("raise OSError('libjpeg.so.8: cannot open shared object file')\n")
+    (pil / "Image.py").write_text("from . import _imaging as core\n")
+    result = probe(tmp_path)
+    assert result["pillow"] is False
+    assert result["svg"]
+    assert result["backend"].startswith("none")
@@ -0,0 +1,43 @@
+import pytest
+
+
+def test_list_targets_is_the_pack_in_order(gen, options):
+    names = gen.list_targets(options)
+    assert names == list(gen.build_targets(options))
+    assert names.index("favicon/icon.png") < names.index("favicon/favicon.ico")
+
+
+def test_match_targets_keeps_pack_order(gen, options):
+    targets = gen.build_targets(options)
+    names = gen.match_targets(targets, ["og/*.png", "favicon/icon.*"])
+    assert names == ["favicon/icon.svg", "favicon/icon.png", "og/opengraph-image.png",
+                     "og/opengraph-image-listing.png", "og/opengraph-image-categories.png", "og/twitter-image.png"]
+    with pytest.raises(KeyError, match="no-such"):
+        gen.match_targets(targets, ["og/*.png", "no-such/*"])
+
+
+def test_render_targets_returns_only_the_matches(gen, options):
+    assets = gen.render_targets(["favicon/favicon.ico", "manifest/site.webmanifest"], options)
+    assert list(assets) == ["favicon/favicon.ico", "manifest/site.webmanifest"]
+    assert assets["favicon/favicon.ico"][:4] == b"\x00\x00\x01\x00"
+    assert b'"name"' in assets["manifest/site.webmanifest"]
+
+
+def test_only_writes_just_the_selected_targets(gen, monkeypatch, tmp_path):
+    out = tmp_path / "brand-assets"
+    monkeypatch.setattr(gen, "OUTPUT_DIR", out)
+    monkeypatch.setattr(gen, "ZIP_PATH", tmp_path / "pack.zip")
+    # favicon.ico is built from favicon/icon.png, which is rendered but not written.
+    assert gen.main(["--only", "favicon/favicon.ico", "--only", "badges/*", "--no-cache"]) is None
+    written = sorted(p.relative_to(out).as_posix() for p in out.rglob("*") if p.is_file())
+    assert written == ["badges/badge-featured.svg", "badges/badge-premium.svg",
+                       "badges/badge-verified-dealer.svg", "badges/payment-secure.svg",
+                       "badges/payment-stripe.svg", "favicon/favicon.ico"]
+    assert not (tmp_path / "pack.zip").exists()
+
+
+def test_only_rejects_a_pattern_that_matches_nothing(gen, monkeypatch, tmp_path):
+    monkeypatch.setattr(gen, "OUTPUT_DIR", tmp_path / "brand-assets")
+    with pytest.raises(SystemExit, match="no target matches"):
+        gen.main(["--only", "nothing/*"])
+    assert not (tmp_path / "brand-assets").exists()
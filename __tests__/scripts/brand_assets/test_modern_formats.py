@@ -0,0 +1,63 @@
+import json
+from io import BytesIO
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+
+def test_ssim_scores_identity_and_degradation(gen):
+    rng = np.random.default_rng(3)
+    a = np.tile(np.arange(64, dtype=np.uint8) * 4, (64, 1))
+    assert gen.ssim(a, a) == pytest.approx(1)
+    light = np.clip(a + rng.normal(0, 4, a.shape), 0, 255).astype(np.uint8)
+    heavy = np.clip(a + rng.normal(0, 40, a.shape), 0, 255).astype(np.uint8)
+    assert 1 > gen.ssim(a, light) > gen.ssim(a, heavy)
+
+
+@pytest.mark.parametrize("fmt", ["webp", "avif"])
+def test_perceptual_encode_picks_the_lowest_passing_quality(gen, fmt):
+    if fmt not in gen.supported_formats([fmt]):
+        pytest.skip(f"Pillow cannot encode {fmt}")
+    img = gen.generate_og_image("default", 300, 158).convert("RGBA")
+    target = 0.98
+    data, quality = gen.encode_perceptual(img, fmt, target)
+    lo, hi = gen.QUALITY_RANGE
+    assert lo <= quality <= hi
+
+    def score(blob):
+        decoded = Image.open(BytesIO(blob)).convert("RGBA")
+        return min(gen.ssim(m, d) for m, d in zip(gen.perceptual_planes(img), gen.perceptual_planes(decoded)))
+
+    assert Image.open(BytesIO(data)).format == gen.MODERN_FORMATS[fmt][0]
+    if quality < hi:
+        assert score(data) >= target
+    if quality > lo:
+        assert score(gen.encode_lossy(img, fmt, quality - 1)) < target
+
+
+def test_banner_formats_add_siblings_listed_best_first(gen, tmp_path):
+    if not gen.supported_formats(["webp"]):
+        pytest.skip("Pillow cannot encode webp")
+    options = gen.parse_args(["--cache-dir", str(tmp_path), "--banner-formats", "webp"])
+    targets = gen.build_targets(options)
+    assert targets["og/opengraph-image.webp"].fn is gen.render_image_perceptual
+    manifest = targets["manifest/image-formats.json"]
+    outputs = {name: b"x" * 10 for name in manifest.deps}
+    entries = json.loads(gen.image_formats_manifest(*manifest.args, outputs))
+    og = entries["og/opengraph-image"]
+    assert (og["width"], og["height"]) == (1200, 630)
+    assert [s["type"] for s in og["sources"]] == ["image/webp", "image/png"]
+    assert og["sources"][0] == {"type": "image/webp", "src": "/og/opengraph-image.webp", "bytes": 10}
+
+
+def test_failed_siblings_drop_out_of_the_manifest(gen, tmp_path):
+    images = [("og/x", 10, 5, ["og/x.webp", "og/x.png"]), ("og/y", 10, 5, ["og/y.png"])]
+    entries = json.loads(gen.image_formats_manifest(images, {"og/x.png": b"png"}))
+    assert list(entries) == ["og/x"] and len(entries["og/x"]["sources"]) == 1
+
+
+def test_unknown_banner_format_is_rejected(gen):
+    with pytest.raises(SystemExit):
+        gen.parse_args(["--banner-formats", "jxl"])
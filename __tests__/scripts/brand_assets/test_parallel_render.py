@@ -0,0 +1,32 @@
+import os
+
+NAMES = ["favicon/icon.svg", "favicon/icon.png", "favicon/apple-icon.png", "favicon/favicon.ico",
+         "icon/icon-core-64.png", "manifest/site.webmanifest"]
+
+
+def render(gen, targets, tmp_path, workers):
+    base = tmp_path / f"workers-{workers}"
+    for name in NAMES:
+        (base / name).parent.mkdir(parents=True, exist_ok=True)
+    queue = gen.RenderQueue(base, gen.AssetCache(tmp_path, enabled=False), workers=workers)
+    try:
+        queue.run(targets, NAMES, write=set(NAMES))
+    finally:
+        queue.shutdown()
+    return base, queue
+
+
+def test_process_pool_matches_inline_rendering(gen, options, tmp_path):
+    targets = gen.build_targets(options)
+    inline_base, inline = render(gen, targets, tmp_path, 1)
+    pool_base, pool = render(gen, targets, tmp_path, 2)
+    assert not inline.failed and not pool.failed
+    assert inline.generated_files == pool.generated_files == NAMES
+    for name in NAMES:
+        assert (pool_base / name).read_bytes() == (inline_base / name).read_bytes() == pool.outputs[name]
+    assert set(pool.timings) == set(NAMES)
+
+
+def test_workers_zero_uses_every_cpu(gen):
+    assert gen.parse_args(["--workers", "0"]).workers == (os.cpu_count() or 1)
+    assert gen.parse_args([]).workers == 1
@@ -0,0 +1,82 @@
+from io import BytesIO
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+
+def png(pixels, mode=None):
+    buf = BytesIO()
+    Image.fromarray(np.asarray(pixels, dtype=np.uint8), mode).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def smooth_rgba(w=96, h=64):
+    """A translucent gradient with far more than 256 colours."""
+    y, x = np.mgrid[0:h, 0:w]
+    return np.stack([x * 255 // w, y * 255 // h, (x + y) % 256, 128 + x % 64], axis=2)
+
+
+def flat_rgba(colors, w=40, h=24):
+    """Vertical stripes cycling through ``colors`` (RGBA tuples)."""
+    stripes = np.arange(w) % len(colors)
+    return np.broadcast_to(np.asarray(colors)[stripes], (h, w, 4))
+
+
+IMAGES = {
+    "smooth": smooth_rgba(),
+    "two-colour": flat_rgba([(0, 0, 0, 255), (255, 255, 255, 255)]),
+    "four-colour": flat_rgba([(226, 34, 41, 255), (21, 123, 202, 255), (0, 0, 0, 0), (9, 9, 9, 90)]),
+    "sixteen-colour": flat_rgba([(i * 16, i * 8, 255 - i * 16, 255) for i in range(16)]),
+    "grey": np.repeat(smooth_rgba()[..., :1], 4, axis=2),
+}
+
+
+@pytest.mark.parametrize("effort", [1, 2, 3])
+@pytest.mark.parametrize("name", sorted(IMAGES))
+def test_optimize_png_is_lossless(gen, decode, name, effort):
+    data = png(IMAGES[name])
+    optimized = gen.optimize_png(data, effort)
+    assert len(optimized) <= len(data)
+    assert np.array_equal(decode(optimized), decode(data))
+
+
+@pytest.mark.parametrize("method", [0, 1, 2, 3, 4, "adaptive"])
+@pytest.mark.parametrize("name", ["smooth", "two-colour", "four-colour", "sixteen-colour"])
+def test_every_filter_and_bit_depth_round_trips(gen, decode, monkeypatch, name, method):
+    monkeypatch.setitem(gen.PNG_FILTERS, 3, (method,))
+    img = Image.open(BytesIO(png(IMAGES[name])))
+    for candidate in (img, gen.reduce_png_mode(img), gen.palette_candidate(img)):
+        if candidate is not None:
+            assert np.array_equal(decode(gen.encode_png_search(candidate, 3)), decode(png(IMAGES[name])))
+
+
+def test_adaptive_filter_picks_the_cheapest_row(gen):
+    rows = np.asarray(smooth_rgba(), dtype=np.uint8).reshape(64, -1)
+    residuals = gen.png_filter_residuals(rows, 4)
+    filtered = gen.filter_png_rows(residuals, "adaptive")
+    cost = np.abs(residuals.view(np.int8).astype(np.int32)).sum(axis=2)
+    assert np.array_equal(cost[filtered[:, 0], np.arange(64)], cost.min(axis=0))
+
+
+def test_near_lossless_palette_only_when_asked(gen, decode):
+    data = png(IMAGES["smooth"])
+    img = Image.open(BytesIO(data))
+    assert gen.palette_candidate(img) is None
+    assert np.array_equal(decode(gen.optimize_png(data, 2)), decode(data))
+    quantized = gen.palette_candidate(img, max_error=255)
+    assert quantized.mode == "P"
+    error = np.abs(np.asarray(quantized.convert("RGBA"), dtype=int) - decode(data))
+    assert 0 < error.max() <= 255
+
+
+def test_report_records_sizes_before_and_after_optimization(gen, options, tmp_path):
+    targets = gen.build_targets(options)
+    name = "favicon/icon.png"
+    for status in ("rendered", "restored"):
+        queue = gen.RenderQueue(None, gen.AssetCache(tmp_path / "cache"), png_effort=2)
+        queue.run(targets, [name])
+        record, = gen.build_report(targets, queue, [name])
+        assert record["status"] == status
+        assert record["optimized_bytes"] == record["bytes"] <= record["original_bytes"]
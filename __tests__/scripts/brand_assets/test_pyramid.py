@@ -0,0 +1,45 @@
+from io import BytesIO
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+
+def red_disc(size=256):
+    """An opaque red disc on transparent black."""
+    y, x = np.mgrid[0:size, 0:size] + 0.5
+    inside = np.hypot(x - size / 2, y - size / 2) < size * 0.4
+    pixels = np.zeros((size, size, 4), dtype=np.uint8)
+    pixels[inside] = (226, 34, 41, 255)
+    return Image.fromarray(pixels, "RGBA")
+
+
+def test_pyramid_levels_take_the_requested_sizes(gen):
+    master = red_disc(256).resize((256, 128))
+    levels = gen.downsample_pyramid(master, [16, 100, 128, 48])
+    assert {sz: img.size for sz, img in levels.items()} == {128: (128, 64), 100: (100, 50), 48: (48, 24), 16: (16, 8)}
+
+
+def test_pyramid_edges_keep_their_colour(gen):
+    levels = gen.downsample_pyramid(red_disc(256), [128, 32, 17])
+    for img in levels.values():
+        pixels = np.asarray(img, dtype=int)
+        edge = pixels[(pixels[..., 3] > 32) & (pixels[..., 3] < 255)]
+        assert len(edge)
+        # Premultiplied rounding only; straight-alpha averaging would pull these towards black.
+        assert np.abs(edge[:, :3] - (226, 34, 41)).max() <= 8
+
+
+def test_pyramid_mode_derives_the_ladder_from_its_largest_size(gen, tmp_path):
+    options = gen.parse_args(["--cache-dir", str(tmp_path), "--pyramid", "--vector-sizes", "32"])
+    targets = gen.build_targets(options)
+    assert targets["icon/icon-core-1024.png"].fn is gen.render_generated_png
+    assert targets["icon/icon-core-32.png"].fn is gen.render_generated_png
+    derived = targets["icon/icon-core-64.png"]
+    assert derived.fn is gen.downsample_png and derived.deps == ("icon/icon-core-1024.png",)
+    assert derived.key != gen.build_targets(gen.parse_args(["--cache-dir", str(tmp_path)]))[derived.name].key
+
+    queue = gen.RenderQueue(None, gen.AssetCache(tmp_path, enabled=False))
+    queue.run(targets, ["icon/icon-core-1024.png", "icon/icon-core-64.png"])
+    assert Image.open(BytesIO(queue.outputs["icon/icon-core-64.png"])).size == (64, 64)
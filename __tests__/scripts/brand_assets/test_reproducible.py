@@ -0,0 +1,65 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import zipfile
+
+from conftest import SCRIPT
+
+
+def test_date_time_follows_source_date_epoch(gen, monkeypatch):
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    assert gen.reproducible_date_time() == gen.ZIP_EPOCH
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    assert gen.reproducible_date_time() == (2023, 11, 14, 22, 13, 20)
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "0")
+    assert gen.reproducible_date_time() == gen.ZIP_EPOCH
+
+
+def test_sorted_archives_ignore_the_order_entries_arrive_in(gen, tmp_path):
+    entries = [("b/two.svg", b"<svg/>" * 40), ("a/one.txt", b"one"), ("a/zero.png", b"\x89PNG" * 64)]
+    digests = []
+    for i, order in enumerate((entries, entries[::-1])):
+        path = tmp_path / f"pack-{i}.zip"
+        stream = gen.ZipStream(path, workers=2, date_time=gen.ZIP_EPOCH, sort=True)
+        for name, data in order:
+            stream.add(name, data)
+        stream.close()
+        digests.append(hashlib.sha256(path.read_bytes()).hexdigest())
+        with zipfile.ZipFile(path) as archive:
+            assert archive.namelist() == sorted(name for name, _ in entries)
+    assert digests[0] == digests[1]
+
+
+def test_canonical_numbers_only_trims_float_noise(gen):
+    text = 'd="M15.560999999999998 2.5L0.30000000000000004 -1.000001"'
+    assert gen.canonical_numbers(text) == 'd="M15.561 2.5L.3 -1.000001"'
+
+
+def test_reproducible_svgs_are_canonical(gen, tmp_path):
+    options = gen.parse_args(["--cache-dir", str(tmp_path), "--reproducible", "--no-svg-optimize"])
+    svg = gen.render_targets(["icon/icon-core.svg"], options)["icon/icon-core.svg"].decode("utf-8")
+    assert gen.canonical_numbers(svg) == svg
+
+
+PROBE = textwrap.dedent(f"""
+    import hashlib, importlib.util, json, sys
+    spec = importlib.util.spec_from_file_location("generate_brand_assets", {str(SCRIPT)!r})
+    gen = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = gen
+    spec.loader.exec_module(gen)
+    options = gen.parse_args(["--cache-dir", sys.argv[1], "--reproducible"])
+    outputs = gen.render_targets(["icon/*.svg", "logo/*.svg", "spinners/*", "favicon/icon.png"], options)
+    print(json.dumps({{name: hashlib.sha256(data).hexdigest() for name, data in outputs.items()}}))
+""")
+
+
+def test_output_is_identical_across_hash_seeds(tmp_path):
+    runs = []
+    for seed in ("1", "2"):
+        out = subprocess.run([sys.executable, "-c", PROBE, str(tmp_path)], capture_output=True, text=True,
+                             check=True, env=dict(os.environ, PYTHONHASHSEED=seed))
+        runs.append(json.loads(out.stdout.splitlines()[-1]))
+    assert runs[0] == runs[1] and len(runs[0]) > 10
@@ -0,0 +1,44 @@
+import json
+from io import BytesIO
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def test_srcset_targets_derive_from_the_hero(gen, tmp_path):
+    options = gen.parse_args(["--cache-dir", str(tmp_path), "--srcset", "480,1024,2400"])
+    targets = gen.build_targets(options)
+    hero = "category/category-watches.png"
+    assert targets["category/category-watches-480w.png"].deps == (hero,)
+    assert "category/category-watches-2400w.png" not in targets
+    assert set(targets["manifest/category-srcset.ts"].deps) >= {hero, "category/category-watches-1024w.png"}
+
+
+def test_default_ladder(gen):
+    assert gen.parse_args(["--srcset"]).srcset == list(gen.SRCSET_WIDTHS)
+    assert gen.parse_args([]).srcset == []
+
+
+def test_srcset_widths_and_manifests(gen, tmp_path):
+    options = gen.parse_args(["--cache-dir", str(tmp_path), "--srcset", "480,768"])
+    targets = gen.build_targets(options)
+    names = ["category/category-luxury.png", "category/category-luxury-480w.png",
+             "category/category-luxury-768w.png"]
+    queue = gen.RenderQueue(None, gen.AssetCache(tmp_path, enabled=False))
+    queue.run(targets, names)
+    assert Image.open(BytesIO(queue.outputs[names[1]])).size == (480, 270)
+    assert Image.open(BytesIO(queue.outputs[names[2]])).size == (768, 432)
+
+    banners = targets["manifest/category-srcset.json"].args[1]
+    manifest = json.loads(gen.srcset_manifest_file("json", banners, queue.outputs))
+    assert [(v["width"], v["height"], v["src"]) for v in manifest["category-luxury"]] == [
+        (480, 270, "/category/category-luxury-480w.png"),
+        (768, 432, "/category/category-luxury-768w.png"),
+        (1920, 1080, "/category/category-luxury.png"),
+    ]
+    # Banners that weren't rendered list no widths.
+    assert manifest["category-vehicles"] == []
+    ts = gen.srcset_manifest_file("ts", banners, queue.outputs).decode("utf-8")
+    assert ts.startswith("// Generated by") and "export const categorySrcset" in ts
+    assert json.loads(ts.split(" = ", 1)[1].rstrip(";\n")) == manifest
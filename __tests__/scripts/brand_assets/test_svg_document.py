@@ -0,0 +1,45 @@
+import re
+import xml.etree.ElementTree as ET
+
+import pytest
+
+GRADIENT = '<linearGradient id="__def_id__"><stop offset="0" stop-color="#E22229"/></linearGradient>'
+
+
+def test_identical_defs_are_emitted_once(gen):
+    doc = gen.SvgDocument(10, 10)
+    first = doc.define("grad", GRADIENT)
+    assert doc.define("grad", GRADIENT) == first
+    other = doc.define("grad", GRADIENT.replace("E22229", "157BCA"))
+    assert other != first and other.startswith("grad-")
+    assert doc.define("grad", "") is None
+    svg = doc.to_svg()
+    assert svg.count("<linearGradient") == 2 and f'id="{first}"' in svg and gen.DEF_ID not in svg
+
+
+def test_symbols_are_placed_with_use(gen):
+    doc = gen.SvgDocument(100, 50)
+    symbol = doc.symbol("mark", [gen.SvgNode("circle", {"r": "4"})], 8, 8)
+    doc.add(doc.use(symbol, 0, 0, 8, 8), doc.use(symbol, 20, 0, 16, 16))
+    root = ET.fromstring(doc.to_svg().split("?>", 1)[1])
+    ns = "{http://www.w3.org/2000/svg}"
+    assert len(root.findall(f"{ns}defs/{ns}symbol")) == 1
+    assert [u.get("href") for u in root.findall(f"{ns}use")] == [f"#{symbol}"] * 2
+
+
+def svg_targets(gen, options, tmp_path):
+    targets = gen.build_targets(options)
+    names = [name for name in targets if name.endswith(".svg")]
+    queue = gen.RenderQueue(None, gen.AssetCache(tmp_path, enabled=False))
+    queue.run(targets, names)
+    return {name: queue.outputs[name].decode("utf-8") for name in names}
+
+
+@pytest.mark.parametrize("optimize", [True, False])
+def test_every_reference_resolves_to_one_def(gen, tmp_path, optimize):
+    argv = ["--cache-dir", str(tmp_path)] + ([] if optimize else ["--no-svg-optimize"])
+    for name, svg in svg_targets(gen, gen.parse_args(argv), tmp_path).items():
+        ids = re.findall(r'\bid="([^"]+)"', svg)
+        assert len(ids) == len(set(ids)), name
+        refs = set(re.findall(r'url\(#([^)]+)\)', svg)) | set(re.findall(r'href="#([^"]+)"', svg))
+        assert refs <= set(ids), name
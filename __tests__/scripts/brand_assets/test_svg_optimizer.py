@@ -0,0 +1,116 @@
+import math
+import re
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def segment_distances(points, polyline):
+    """Distance from each of ``points`` to the nearest segment of ``polyline``."""
+    points, polyline = np.asarray(points, dtype=float), np.asarray(polyline, dtype=float)
+    start, chord = polyline[:-1], np.diff(polyline, axis=0)
+    rel = points[:, None, :] - start[None]
+    t = np.clip((rel * chord).sum(axis=2) / np.maximum((chord * chord).sum(axis=1), 1e-12), 0, 1)
+    off = rel - t[..., None] * chord
+    return np.hypot(off[..., 0], off[..., 1]).min(axis=1)
+
+
+def flatten(segments, steps=16):
+    """Dense polyline through ``(p0, p1)`` line and ``(p0, c1, c2, p1)`` cubic segments."""
+    t = np.linspace(0, 1, steps + 1)[:, None]
+    out = [segments[0][0]]
+    for seg in segments:
+        p = np.asarray(seg, dtype=float)
+        if len(seg) == 2:
+            out.extend(p[1:])
+        else:
+            mt = 1 - t
+            out.extend((mt ** 3 * p[0] + 3 * mt * mt * t * p[1] + 3 * mt * t * t * p[2] + t ** 3 * p[3])[1:])
+    return np.asarray(out)
+
+
+def parse_path(d):
+    """Segments of an M/L/C/Z path as written by optimize_path_data."""
+    segments, current, start = [], None, None
+    for command, args in re.findall(r"([MLCZ])([^MLCZ]*)", d):
+        values = [float(v) for v in re.findall(r"-?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?", args)]
+        points = list(zip(values[::2], values[1::2]))
+        if command == "M":
+            current = start = points[0]
+        elif command == "Z":
+            if current != start:
+                segments.append((current, start))
+        else:
+            segments.append((current, *points))
+            current = points[-1]
+    return segments
+
+
+def wobbly_ring(n=240, radius=100.0):
+    """A closed, smooth but non-circular polygon plus one sharp notch."""
+    pts = []
+    for i in range(n):
+        a = 2 * math.pi * i / n
+        r = radius * (1 + 0.1 * math.sin(3 * a)) - (25 if i == n // 2 else 0)
+        pts.append((200 + r * math.cos(a), 200 + r * math.sin(a)))
+    return pts
+
+
+@pytest.mark.parametrize("value, decimals, text", [(0.5, 2, ".5"), (-0.25, 3, "-.25"), (12.0, 1, "12"),
+                                                   (-0.0001, 2, "0"), (3.14159, 2, "3.14"), (100, 0, "100")])
+def test_format_number_is_shortest(gen, value, decimals, text):
+    assert gen.format_number(value, decimals) == text
+
+
+def test_coordinate_decimals_follow_the_render_scale(gen):
+    assert gen.coordinate_decimals(1024, 1024) == 1
+    assert gen.coordinate_decimals(1024, 32) == 0
+    assert gen.coordinate_decimals(100, 1000) == 2
+
+
+@pytest.mark.parametrize("tolerance", [0.05, 0.5, 2])
+def test_douglas_peucker_stays_within_tolerance(gen, tolerance):
+    points = wobbly_ring()
+    kept = gen.douglas_peucker(points, tolerance)
+    assert kept[0] == points[0] and kept[-1] == points[-1] and len(kept) < len(points)
+    assert segment_distances(points, kept).max() <= tolerance + 1e-9
+
+
+def test_douglas_peucker_collapses_collinear_points(gen):
+    assert gen.douglas_peucker([(0, 0), (1, 1), (2, 2), (5, 5)], 1e-6) == [(0, 0), (5, 5)]
+
+
+@pytest.mark.parametrize("tolerance", [0.05, 0.25, 1])
+def test_cubic_refit_stays_within_tolerance(gen, tolerance):
+    points = wobbly_ring()
+    segments = gen.fit_polygon_cubics(points, tolerance)
+    # Tight tolerances need cubics; loose ones may settle for a short polyline.
+    assert any(len(s) == 4 for s in segments) or tolerance >= 1
+    assert sum(len(s) - 1 for s in segments) < len(points)
+    curve = flatten(segments)
+    assert segment_distances(points, curve).max() <= tolerance + 1e-6
+    # ...and the curve doesn't wander off between the input points.
+    assert segment_distances(curve, points + points[:1]).max() <= 2 * tolerance
+
+
+def test_cubic_refit_keeps_corners(gen):
+    points = wobbly_ring()
+    notch = points[len(points) // 2]
+    ends = {seg[0] for seg in gen.fit_polygon_cubics(points, 0.25)}
+    assert notch in ends
+
+
+def test_optimized_svg_round_trips_within_tolerance(gen):
+    svg = gen.generate_vortex_icon_svg(1024, "core", True)
+    optimized = gen.optimize_svg(svg, render_size=1024, tolerance_px=0.1)
+    assert len(optimized) < len(svg) and not optimized.startswith("<?xml")
+    before = re.findall(r' d="([^"]+)"', svg)
+    after = re.findall(r' d="([^"]+)"', optimized)
+    assert len(before) == len(after)
+    for d, refit in zip(before, after):
+        coords = [float(v) for v in re.findall(r"-?\d+\.?\d*", d)]
+        polygon = list(zip(coords[::2], coords[1::2]))
+        curve = flatten(parse_path(refit))
+        # Refit tolerance plus half a unit in the last written decimal place (0.1 px at 1:1).
+        assert segment_distances(polygon, curve).max() <= 0.1 + 0.05 + 1e-6
@@ -0,0 +1,43 @@
+import os
+import zipfile
+
+import pytest
+
+ENTRIES = [
+    ("logo/logo.svg", b"<svg>" + b"<path d='M0 0L10 10Z'/>" * 200 + b"</svg>"),
+    ("icon/noise.png", os.urandom(4096)),
+    ("icon/flat.png", b"\x89PNG" + b"\0" * 20000),
+    ("legal/résumé.txt", "café ".encode("utf-8") * 50),
+    ("manifest/empty.json", b""),
+]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_stream_writes_a_valid_archive_in_order(gen, tmp_path, workers):
+    path = tmp_path / "pack.zip"
+    stream = gen.ZipStream(path, workers)
+    for name, data in ENTRIES:
+        stream.add(name, data)
+    assert stream.close() == len(ENTRIES) == stream.count
+    assert stream.size == path.stat().st_size
+    assert not path.with_name("pack.zip.tmp").exists()
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        infos = archive.infolist()
+        assert [i.filename for i in infos] == [name for name, _ in ENTRIES]
+        for (name, data), info in zip(ENTRIES, infos):
+            assert archive.read(info) == data
+            assert info.external_attr >> 16 == 0o100644
+    methods = {i.filename: i.compress_type for i in infos}
+    assert methods["logo/logo.svg"] == zipfile.ZIP_DEFLATED
+    # Incompressible rasters are stored; a flat one still deflates well enough to pay off.
+    assert methods["icon/noise.png"] == zipfile.ZIP_STORED
+    assert methods["icon/flat.png"] == zipfile.ZIP_DEFLATED
+
+
+def test_entries_carry_the_given_timestamp(gen, tmp_path):
+    stream = gen.ZipStream(tmp_path / "pack.zip", date_time=(2024, 5, 17, 13, 45, 30))
+    stream.add("a.txt", b"a")
+    stream.close()
+    with zipfile.ZipFile(tmp_path / "pack.zip") as archive:
+        assert archive.getinfo("a.txt").date_time == (2024, 5, 17, 13, 45, 30)
@@ -2,46 +2,197 @@
 """
 iTrader.im Brand Asset Generator
 Reads create-ui-components-2.json and produces all production brand assets.
+
+Also importable: list_targets() names every file of the pack and
+render_targets() renders any subset of them to bytes in memory.
 """
 
+import argparse
+import ast
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import inspect
 import json
+import marshal
 import math
 import os
+import re
 import struct
-import zipfile
+import sys
+import threading
+import time
+import zlib
+from collections import deque
 from io import BytesIO
 from pathlib import Path
 
-try:
-    from PIL import Image, ImageDraw, ImageFilter, ImageFont
-    HAS_PILLOW = True
-except ImportError:
-    HAS_PILLOW = False
 
-try:
-    import cairosvg
-    HAS_CAIRO = True
-except Exception:
-    HAS_CAIRO = False
+def lazy_module(name):
+    """Return module ``name``, imported on first attribute access, or None if not installed.
+
+    Keeps ``import`` of this script cheap: numpy and Pillow are only
+    loaded by the generators that touch them.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.find_spec(name)
+    except ImportError:
+        spec = None
+    if spec is None:
+        return None
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def imports(name):
+    """Import module ``name`` now; False if it is missing or its binary fails to load."""
+    try:
+        importlib.import_module(name)
+    except (ImportError, OSError):
+        return False
+    return True
+
+
+Image = lazy_module("PIL.Image")
+ImageDraw = lazy_module("PIL.ImageDraw")
+ImageFilter = lazy_module("PIL.ImageFilter")
+ImageColor = lazy_module("PIL.ImageColor")
+ImageFont = lazy_module("PIL.ImageFont")
+features = lazy_module("PIL.features")
+# A broken Pillow (missing shared library, wrong ABI) only fails once its C
+# core loads, so load that here, a couple of milliseconds, rather than
+# crash on the first lazy attribute access.
+HAS_PILLOW = Image is not None and imports("PIL._imaging")
+if not HAS_PILLOW:
+    Image = ImageDraw = ImageFilter = ImageColor = ImageFont = features = None
+
+np = lazy_module("numpy")
+HAS_NUMPY = np is not None
+
+
+@functools.lru_cache(maxsize=None)
+def has_cairo():
+    """Import cairosvg on first call; False if it or the cairo library is missing."""
+    try:
+        import cairosvg  # noqa: F401
+    except Exception:
+        return False
+    return True
+
 
 ROOT = Path(__file__).resolve().parent.parent
 JSON_PATH = ROOT / "private" / "create-ui-components-2.json"
 OUTPUT_DIR = ROOT / "brand-assets"
+# The packaged pack; the build report is written next to it.
+ZIP_PATH = ROOT / "itrader-brand-assets-v2.zip"
+CACHE_DIR = ROOT / ".cache" / "brand-assets"
+# Font files shipped with the repo, searched by the font registry.
+FONT_DIRS = (ROOT / "public" / "fonts", ROOT / "brand-renderer" / "fonts")
+
+# Environment variable naming an alternative brand spec (set by --spec).
+SPEC_ENV = "BRAND_SPEC"
+# Specs tried, in order, when JSON_PATH is absent.
+SPEC_FALLBACKS = (ROOT / "brand-renderer" / "input" / "brand.json",)
+
+
+def spec_path():
+    """The brand spec to read: $BRAND_SPEC, else JSON_PATH, else the first fallback present."""
+    override = os.environ.get(SPEC_ENV)
+    if override:
+        return Path(override)
+    for path in (JSON_PATH,) + SPEC_FALLBACKS:
+        if path.exists():
+            return path
+    return JSON_PATH
+
+
+@functools.lru_cache(maxsize=None)
+def brand_spec():
+    """Parse the brand spec once per process.
+
+    The parsed spec is snapshotted with marshal under CACHE_DIR, keyed on
+    the file's path, size and mtime, so warm starts skip the JSON parse.
+    """
+    path = spec_path()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        if os.environ.get(SPEC_ENV):
+            raise FileNotFoundError(f"Brand spec not found at {path}") from None
+        tried = ", ".join(str(p) for p in (JSON_PATH,) + SPEC_FALLBACKS)
+        raise FileNotFoundError(f"Brand spec not found (tried {tried}); "
+                                f"pass --spec or set {SPEC_ENV}") from None
+    stamp = f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}:{marshal.version}"
+    snapshot = CACHE_DIR / f"spec-{hashlib.sha256(stamp.encode('utf-8')).hexdigest()[:16]}.marshal"
+    try:
+        with open(snapshot, "rb") as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    try:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        tmp = snapshot.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            marshal.dump(spec, f)
+        os.replace(tmp, snapshot)
+    except OSError:
+        pass
+    return spec
+
+
+class SpecSection:
+    """Read-only view of one part of the brand spec, resolved on first use."""
+
+    __slots__ = ("_keys",)
+
+    def __init__(self, *keys):
+        self._keys = keys
+
+    def _value(self):
+        value = brand_spec()
+        for key in self._keys:
+            value = value[key]
+        return value
+
+    def __getitem__(self, key):
+        return self._value()[key]
+
+    def __iter__(self):
+        return iter(self._value())
+
+    def __len__(self):
+        return len(self._value())
 
-with open(JSON_PATH, "r", encoding="utf-8") as f:
-    BRAND = json.load(f)
+    def __contains__(self, key):
+        return key in self._value()
 
-C = BRAND["colorSystem"]
-G = BRAND["gradientSystem"]["gradients"]
-GLOW = BRAND["glowSystem"]
-ICON = BRAND["iconSystem"]
-LOGO = BRAND["logoSystem"]
-TYPO = BRAND["typographySystem"]
-SURFACE = BRAND["surfaceSystem"]
-BADGES = BRAND["badgeSystem"]
-CATEGORIES = BRAND["categoryExpressions"]
-MOTION = BRAND["motionGraphics"]
-APP_ICON = BRAND["appIconSystem"]
+    def __getattr__(self, name):
+        return getattr(self._value(), name)
+
+    def __repr__(self):
+        return f"SpecSection{self._keys!r}"
+
+
+BRAND = SpecSection()
+C = SpecSection("colorSystem")
+G = SpecSection("gradientSystem", "gradients")
+GLOW = SpecSection("glowSystem")
+ICON = SpecSection("iconSystem")
+LOGO = SpecSection("logoSystem")
+TYPO = SpecSection("typographySystem")
+SURFACE = SpecSection("surfaceSystem")
+BADGES = SpecSection("badgeSystem")
+CATEGORIES = SpecSection("categoryExpressions")
+MOTION = SpecSection("motionGraphics")
+APP_ICON = SpecSection("appIconSystem")
 
 
 def color(name):
@@ -143,13 +294,118 @@ def ellipse_normal(rx, ry, rot_deg, t_deg):
     return nx, ny
 
 
+# Max deviation, in output pixels, between a sampled arc edge and the true curve.
+ARC_TOLERANCE_PX = 0.25
+# Interior points per chord at which the deviation is checked, and the most
+# rounds of chord splitting spent on chords that still exceed the tolerance.
+ARC_PROBES = 7
+ARC_REFINE_PASSES = 6
+
+
+def arc_tolerance(size, render_size=None):
+    """ARC_TOLERANCE_PX in the units of a ``size`` canvas drawn ``render_size`` px wide."""
+    return ARC_TOLERANCE_PX * size / (render_size or size)
+
+
 def tapered_arc_path(cx, cy, rx, ry, rot_deg, start_deg, end_deg, max_thickness,
-                      start_ratio=1.0, end_ratio=0.18, exponent=1.8, steps=80):
-    """Create SVG path for a tapered elliptical arc."""
+                      start_ratio=1.0, end_ratio=0.18, exponent=1.8, steps=80, tolerance=None):
+    """Create SVG path for a tapered elliptical arc.
+
+    With ``tolerance`` (in SVG units) the arc is sampled adaptively so that
+    neither edge strays further than that from the true curve; otherwise it
+    is sampled at ``steps`` even intervals.
+    """
+    if HAS_NUMPY:
+        return tapered_arc_path_np(cx, cy, rx, ry, rot_deg, start_deg, end_deg, max_thickness,
+                                   start_ratio, end_ratio, exponent, steps, tolerance)
+    return tapered_arc_path_py(cx, cy, rx, ry, rot_deg, start_deg, end_deg, max_thickness,
+                               start_ratio, end_ratio, exponent, steps, tolerance)
+
+
+def arc_sample_params_py(edges, tolerance, grid=128):
+    """Positions in [0, 1] spaced so every chord stays within ``tolerance``.
+
+    ``edges(s)`` returns the outer and inner edge points at ``s``. Both edges
+    are traced on a fine ``grid`` and each cell is charged the number of
+    chords its turning needs (sagitta ~ turn * length / 8), so tight
+    curvature and fast taper changes draw extra samples and flat runs few.
+    Samples are then placed at equal steps of that cumulative count.
+    """
+    fine = [i / grid for i in range(grid + 1)]
+    points = [edges(s) for s in fine]
+    need = [0.0] * grid
+    for k in (0, 1):
+        edge = [p[k] for p in points]
+        seg = [(b[0] - a[0], b[1] - a[1]) for a, b in zip(edge, edge[1:])]
+        heading = [math.atan2(dy, dx) for dx, dy in seg]
+        for i in range(grid):
+            turn = 0.0
+            for j in (i - 1, i + 1):
+                if 0 <= j < grid:
+                    delta = heading[max(i, j)] - heading[min(i, j)]
+                    turn += abs((delta + math.pi) % (2 * math.pi) - math.pi) / 2
+            need[i] = max(need[i], math.sqrt(turn * math.hypot(*seg[i]) / (8 * tolerance)))
+    cumulative = [0.0]
+    for n in need:
+        cumulative.append(cumulative[-1] + max(n, 1e-9))
+    count = max(2, math.ceil(cumulative[-1]))
+    params, cell = [], 0
+    for k in range(count + 1):
+        target = cumulative[-1] * k / count
+        while cell < grid - 1 and cumulative[cell + 1] < target:
+            cell += 1
+        frac = (target - cumulative[cell]) / (cumulative[cell + 1] - cumulative[cell])
+        params.append(fine[cell] + min(max(frac, 0.0), 1.0) / grid)
+    return refine_arc_params_py(edges, params, tolerance)
+
+
+def _segment_distance(p, a, b):
+    """Distance from point ``p`` to the segment ``a``-``b``."""
+    abx, aby = b[0] - a[0], b[1] - a[1]
+    t = ((p[0] - a[0]) * abx + (p[1] - a[1]) * aby) / max(abx * abx + aby * aby, 1e-12)
+    t = min(max(t, 0.0), 1.0)
+    return math.hypot(p[0] - a[0] - t * abx, p[1] - a[1] - t * aby)
+
+
+def refine_arc_params_py(edges, params, tolerance):
+    """Halve every chord of ``params`` that strays more than ``tolerance`` from either edge.
+
+    The curvature estimate of arc_sample_params_py() is coarse where the
+    taper changes fast, so each chord is checked at ARC_PROBES interior
+    points and split until it holds, for up to ARC_REFINE_PASSES rounds.
+    """
+    fractions = [j / (ARC_PROBES + 1) for j in range(1, ARC_PROBES + 1)]
+    for _ in range(ARC_REFINE_PASSES):
+        refined = [params[0]]
+        for a, b in zip(params, params[1:]):
+            ends = edges(a), edges(b)
+            if any(_segment_distance(edges(a + (b - a) * f)[k], ends[0][k], ends[1][k]) > tolerance
+                   for f in fractions for k in (0, 1)):
+                refined.append((a + b) / 2)
+            refined.append(b)
+        if len(refined) == len(params):
+            break
+        params = refined
+    return params
+
+
+def tapered_arc_path_py(cx, cy, rx, ry, rot_deg, start_deg, end_deg, max_thickness,
+                        start_ratio=1.0, end_ratio=0.18, exponent=1.8, steps=80, tolerance=None):
+    """Pure-Python tapered_arc_path, sampling one point at a time."""
+    def edges(s):
+        t = start_deg + s * (end_deg - start_deg)
+        px, py = ellipse_point(cx, cy, rx, ry, rot_deg, t)
+        nx, ny = ellipse_normal(rx, ry, rot_deg, t)
+        half_w = max_thickness * (start_ratio * (1 - s ** exponent) + end_ratio * (s ** exponent)) / 2
+        return (px + nx * half_w, py + ny * half_w), (px - nx * half_w, py - ny * half_w)
+
+    if tolerance:
+        params = arc_sample_params_py(edges, tolerance)
+    else:
+        params = [i / steps for i in range(steps + 1)]
     outer_points = []
     inner_points = []
-    for i in range(steps + 1):
-        s = i / steps
+    for s in params:
         t = start_deg + s * (end_deg - start_deg)
         px, py = ellipse_point(cx, cy, rx, ry, rot_deg, t)
         nx, ny = ellipse_normal(rx, ry, rot_deg, t)
@@ -167,12 +423,380 @@ def tapered_arc_path(cx, cy, rx, ry, rot_deg, start_deg, end_deg, max_thickness,
     return " ".join(path_parts)
 
 
+# ---------------------------------------------------------------------------
+# VECTORIZED GEOMETRY (NumPy)
+# ---------------------------------------------------------------------------
+# Array versions of the ellipse helpers above. They evaluate whole sample
+# arrays in one pass, with the same operation order as the scalar code, so
+# the emitted paths match tapered_arc_path_py().
+
+def ellipse_points_np(cx, cy, rx, ry, rot_deg, t_deg):
+    """Points on a rotated ellipse for an array of parameters (degrees)."""
+    t = np.radians(t_deg)
+    rot = math.radians(rot_deg)
+    x = rx * np.cos(t)
+    y = ry * np.sin(t)
+    xr = x * math.cos(rot) - y * math.sin(rot) + cx
+    yr = x * math.sin(rot) + y * math.cos(rot) + cy
+    return xr, yr
+
+
+def ellipse_normals_np(rx, ry, rot_deg, t_deg):
+    """Outward unit normals on a rotated ellipse for an array of parameters."""
+    t = np.radians(t_deg)
+    rot = math.radians(rot_deg)
+    dx = -rx * np.sin(t)
+    dy = ry * np.cos(t)
+    tx = dx * math.cos(rot) - dy * math.sin(rot)
+    ty = dx * math.sin(rot) + dy * math.cos(rot)
+    length = np.sqrt(tx * tx + ty * ty)
+    degenerate = length < 1e-9
+    safe = np.where(degenerate, 1.0, length)
+    nx = np.where(degenerate, 0.0, -ty / safe)
+    ny = np.where(degenerate, 1.0, tx / safe)
+    return nx, ny
+
+
+def taper_profile_np(s, start_ratio, end_ratio, exponent):
+    """Thickness factor along an arc for normalized positions ``s`` in [0, 1]."""
+    s_exp = s ** exponent
+    return start_ratio * (1 - s_exp) + end_ratio * s_exp
+
+
+def tapered_arc_outline(cx, cy, rx, ry, rot_deg, start_deg, end_deg, max_thickness,
+                        start_ratio=1.0, end_ratio=0.18, exponent=1.8, steps=80, tolerance=None):
+    """Outer and inner edges of a tapered arc as (N, 2) arrays.
+
+    N is ``steps + 1`` for even sampling, or whatever arc_sample_params_np
+    settles on when a ``tolerance`` is given.
+    """
+    def edges(s):
+        t = start_deg + s * (end_deg - start_deg)
+        px, py = ellipse_points_np(cx, cy, rx, ry, rot_deg, t)
+        nx, ny = ellipse_normals_np(rx, ry, rot_deg, t)
+        half_w = max_thickness * taper_profile_np(s, start_ratio, end_ratio, exponent) / 2
+        outer = np.column_stack((px + nx * half_w, py + ny * half_w))
+        inner = np.column_stack((px - nx * half_w, py - ny * half_w))
+        return outer, inner
+
+    if tolerance:
+        return edges(arc_sample_params_np(edges, tolerance))
+    return edges(np.arange(steps + 1) / steps)
+
+
+def arc_sample_params_np(edges, tolerance, grid=128):
+    """Array version of arc_sample_params_py."""
+    fine = np.arange(grid + 1) / grid
+    need = np.zeros(grid)
+    for edge in edges(fine):
+        seg = np.diff(edge, axis=0)
+        turn = np.abs(np.diff(np.unwrap(np.arctan2(seg[:, 1], seg[:, 0])))) / 2
+        cell_turn = np.zeros(grid)
+        cell_turn[:-1] += turn
+        cell_turn[1:] += turn
+        need = np.maximum(need, np.sqrt(cell_turn * np.hypot(seg[:, 0], seg[:, 1]) / (8 * tolerance)))
+    cumulative = np.concatenate(([0.0], np.cumsum(np.maximum(need, 1e-9))))
+    count = max(2, math.ceil(cumulative[-1]))
+    return refine_arc_params_np(edges, np.interp(np.linspace(0, cumulative[-1], count + 1), cumulative, fine),
+                                tolerance)
+
+
+def refine_arc_params_np(edges, params, tolerance):
+    """Array version of refine_arc_params_py."""
+    fractions = np.arange(1, ARC_PROBES + 1) / (ARC_PROBES + 1)
+    for _ in range(ARC_REFINE_PASSES):
+        a, b = params[:-1], params[1:]
+        probes = (a[:, None] + (b - a)[:, None] * fractions).ravel()
+        worst = np.zeros(len(a))
+        for end, mid in zip(edges(params), edges(probes)):
+            p = mid.reshape(len(a), ARC_PROBES, 2)
+            start, chord = end[:-1, None, :], (end[1:] - end[:-1])[:, None, :]
+            t = np.clip(((p - start) * chord).sum(axis=2) / np.maximum((chord * chord).sum(axis=2), 1e-12), 0, 1)
+            off = p - start - t[..., None] * chord
+            worst = np.maximum(worst, np.hypot(off[..., 0], off[..., 1]).max(axis=1))
+        split = worst > tolerance
+        if not split.any():
+            break
+        params = np.sort(np.concatenate((params, ((a + b) / 2)[split])))
+    return params
+
+
+@functools.lru_cache(maxsize=None)
+def _polygon_template(n_points):
+    return "M " + " L ".join(["%.2f %.2f"] * n_points) + " Z"
+
+
+def polygon_path(points):
+    """Closed SVG path through an (N, 2) point array, formatted in one batch."""
+    return _polygon_template(len(points)) % tuple(points.ravel().tolist())
+
+
+def tapered_arc_path_np(cx, cy, rx, ry, rot_deg, start_deg, end_deg, max_thickness,
+                        start_ratio=1.0, end_ratio=0.18, exponent=1.8, steps=80, tolerance=None):
+    """NumPy tapered_arc_path: whole-array sampling and batched formatting."""
+    outer, inner = tapered_arc_outline(cx, cy, rx, ry, rot_deg, start_deg, end_deg, max_thickness,
+                                       start_ratio, end_ratio, exponent, steps, tolerance)
+    return polygon_path(np.concatenate((outer, inner[::-1])))
+
+
+def icon_arc_args(sizes=(1024, 512, 32)):
+    """tapered_arc_path arguments for the two icon arcs at each of ``sizes``."""
+    geom = ICON["geometry"]
+    taper = geom["tailTaper"]
+    arcs = []
+    for size in sizes:
+        rx = geom["ellipseOuter"]["rxRatio"] * size
+        ry = geom["ellipseOuter"]["ryRatio"] * size
+        thick = geom["arcThickness"]["outerRatioToOuterRy"] * ry
+        for start, end, scale in ((-30, 200, 1.0), (150, 380, 0.8)):
+            arcs.append((size / 2, size / 2, rx, ry, geom["ellipseOuter"]["rotationDeg"],
+                         start, end, thick * scale, taper["startThicknessRatio"],
+                         taper["endThicknessRatio"], taper["taperExponent"]))
+    return arcs
+
+
+def benchmark_geometry(repeat=200):
+    """Time tapered_arc_path_py against tapered_arc_path_np on the icon arcs."""
+    if not HAS_NUMPY:
+        print("NumPy is not installed; nothing to compare.")
+        return False
+    arcs = icon_arc_args()
+    identical = all(tapered_arc_path_py(*a) == tapered_arc_path_np(*a) for a in arcs)
+    timings = {}
+    for impl in (tapered_arc_path_py, tapered_arc_path_np):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for a in arcs:
+                impl(*a)
+        timings[impl.__name__] = (time.perf_counter() - start) / (repeat * len(arcs))
+
+    py_t, np_t = timings["tapered_arc_path_py"], timings["tapered_arc_path_np"]
+    print(f"tapered_arc_path over {len(arcs)} arcs x {repeat} runs")
+    print(f"  pure Python: {py_t * 1e6:8.1f} us/arc")
+    print(f"  NumPy:       {np_t * 1e6:8.1f} us/arc  ({py_t / np_t:.1f}x faster)")
+    print(f"  identical output: {'yes' if identical else 'NO'}")
+    return identical
+
+
+# ---------------------------------------------------------------------------
+# BUILD PROFILE
+# ---------------------------------------------------------------------------
+# Render jobs account their time to phases so the build report can say
+# where each asset's time went and which rasterizer drew it. Time is
+# exclusive: an encode nested in a rasterization counts as encode only.
+# The counters are per thread so jobs sharing the thread pool stay apart.
+
+PHASES = ("generate", "rasterize", "encode")
+_profile = threading.local()
+
+
+def profile_state():
+    """This thread's phase totals, the last rasterizer used and any traced memory peak."""
+    if not hasattr(_profile, "totals"):
+        _profile.totals = dict.fromkeys(PHASES, 0.0)
+        _profile.nested = []
+        _profile.backend = None
+        _profile.peak = None
+    return _profile
+
+
+@contextlib.contextmanager
+def phase(name, backend=None):
+    """Account the time spent in the block to phase ``name``, drawn by ``backend`` if given."""
+    state = profile_state()
+    if backend is not None:
+        state.backend = backend
+    state.nested.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        state.totals[name] += elapsed - state.nested.pop()
+        if state.nested:
+            state.nested[-1] += elapsed
+
+
+def profiled(name, backend=None):
+    """Decorator form of phase()."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with phase(name, backend):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ---------------------------------------------------------------------------
+# SVG DOCUMENT MODEL
+# ---------------------------------------------------------------------------
+
+# Placeholder id in def markup handed to SvgDocument.define().
+DEF_ID = "__def_id__"
+
+
+class SvgNode:
+    """An SVG element. Children are nodes or ready-made markup strings."""
+
+    def __init__(self, tag, attrs=None, children=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children = list(children or [])
+
+    def append(self, child):
+        self.children.append(child)
+        return child
+
+    def to_xml(self):
+        attrs = "".join(f' {k}="{v}"' for k, v in self.attrs.items() if v is not None)
+        if not self.children:
+            return f"<{self.tag}{attrs}/>"
+        inner = "".join(c if isinstance(c, str) else c.to_xml() for c in self.children)
+        return f"<{self.tag}{attrs}>{inner}</{self.tag}>"
+
+
+class SvgDocument:
+    """A root <svg> whose <defs> are deduplicated by content.
+
+    ``define`` names each def after a hash of its markup, so identical
+    gradients and filters are emitted once and defs pulled in from
+    different generators can never collide on an id. Composite artwork
+    such as the vortex icon is registered once as a <symbol> and placed
+    with <use>.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.defs = {}
+        self._ids = {}
+        self.body = []
+
+    def define(self, prefix, markup):
+        """Register def ``markup`` (its id written as DEF_ID) and return its id."""
+        if not markup:
+            return None
+        if markup not in self._ids:
+            digest = hashlib.sha1(markup.encode("utf-8")).hexdigest()[:6]
+            def_id = f"{prefix}-{digest}"
+            self._ids[markup] = def_id
+            self.defs[def_id] = markup
+        return self._ids[markup]
+
+    def symbol(self, prefix, children, width, height):
+        """Register ``children`` as a <symbol> with a ``width`` x ``height`` viewBox."""
+        node = SvgNode("symbol", {"id": DEF_ID, "viewBox": f"0 0 {width} {height}",
+                                  "overflow": "visible"}, children)
+        return self.define(prefix, node.to_xml())
+
+    @staticmethod
+    def use(symbol_id, x, y, width, height):
+        return SvgNode("use", {"href": f"#{symbol_id}", "x": f"{x:.1f}", "y": f"{y:.1f}",
+                               "width": f"{width:.1f}", "height": f"{height:.1f}"})
+
+    def add(self, *elements):
+        self.body.extend(elements)
+
+    def to_svg(self):
+        defs = "\n".join(markup.replace(DEF_ID, def_id) for def_id, markup in self.defs.items())
+        body = "".join(e if isinstance(e, str) else e.to_xml() for e in self.body)
+        return f'''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {self.width} {self.height}" width="{self.width}" height="{self.height}">
+<defs>
+{defs}
+</defs>
+{body}
+</svg>'''
+
+
 # ---------------------------------------------------------------------------
 # ICON GENERATION
 # ---------------------------------------------------------------------------
 
-def generate_vortex_icon_svg(size, variant="core", with_glow=True):
-    """Generate the vortex icon SVG at a given size."""
+# Particle speck seed. crc32, unlike hash(), is the same in every process.
+SPECK_SEED = zlib.crc32(b"iTrader.im") % 10000
+
+
+class Shape:
+    """One painted primitive of generated artwork.
+
+    ``kind`` is "ellipse" or "circle" with ``geometry`` (cx, cy, rx, ry,
+    rotation), "rect" with (x, y, width, height, corner radius), or "arc"
+    with the tapered_arc_path arguments. Paints are
+    colour strings or (def prefix, gradient spec) pairs. ``effect`` is
+    (def prefix, filter, args) for one of SHAPE_FILTERS. The same record
+    becomes markup through to_svg() or pixels through rasterize_shapes().
+    """
+
+    __slots__ = ("kind", "geometry", "fill", "stroke", "stroke_width", "opacity", "effect")
+
+    def __init__(self, kind, geometry, fill=None, stroke=None, stroke_width=None, opacity=1, effect=None):
+        self.kind = kind
+        self.geometry = tuple(geometry)
+        self.fill = fill
+        self.stroke = stroke
+        self.stroke_width = stroke_width
+        self.opacity = opacity
+        self.effect = effect
+
+    def to_svg(self, doc):
+        """Markup for the shape, registering its gradient and filter defs on ``doc``."""
+        def paint(value):
+            if isinstance(value, tuple):
+                prefix, grad = value
+                return f"url(#{doc.define(prefix, svg_gradient_def(grad, DEF_ID))})"
+            return value
+
+        if self.kind == "arc":
+            tag, attrs = "path", {"d": tapered_arc_path(*self.geometry)}
+        elif self.kind == "rect":
+            x, y, w, h, r = self.geometry
+            tag, attrs = "rect", {"x": x, "y": y, "width": w, "height": h, "rx": r}
+        else:
+            cx, cy, rx, ry, rot = self.geometry
+            if self.kind == "circle":
+                tag, attrs = "circle", {"cx": cx, "cy": cy, "r": rx}
+            else:
+                tag, attrs = "ellipse", {"cx": cx, "cy": cy, "rx": rx, "ry": ry,
+                                         "transform": f"rotate({rot} {cx} {cy})"}
+        attrs["fill"] = paint(self.fill) if self.fill else "none"
+        if self.stroke:
+            attrs["stroke"] = paint(self.stroke)
+            attrs["stroke-width"] = self.stroke_width
+        attrs["opacity"] = self.opacity
+        if self.effect:
+            prefix, kind, args = self.effect
+            attrs["filter"] = f"url(#{doc.define(prefix, SHAPE_FILTERS[kind](DEF_ID, *args))})"
+        return SvgNode(tag, attrs).to_xml()
+
+
+# Filter kinds a Shape effect can name, with the helper writing their def.
+SHAPE_FILTERS = {"glow": svg_glow_filter, "shadow": svg_drop_shadow_filter, "blur": svg_gaussian_blur_filter}
+
+# Arc gradients per variant: (def prefix, gradient name) for the primary
+# and secondary arcs and the chrome ring.
+VORTEX_PAINTS = {
+    "core": (("redArc", "redArcGradient"), ("blueArc", "blueArcGradient"),
+             ("chromeCore", "chromeRingGradient")),
+    "energy": (("redArc", "redArcGradientStrong"), ("redArc", "redArcGradientStrong"),
+               ("chromeCore", "chromeRingGradient")),
+    "trust": (None, ("blueArc", "blueArcGradientStrong"), ("chromeCore", "chromeRingGradient")),
+    "premium": (("goldArc", "goldArcGradient"), ("goldArc", "goldArcGradient"),
+                ("chromeCore", "chromeRingGradientWarm")),
+    "monochromeWhite": (("monoGrad", "monoWhiteGradient"), ("monoGrad", "monoWhiteGradient"),
+                        ("monoGrad", "monoWhiteGradient")),
+    "monochromeDark": (("monoGrad", "monoDarkGradient"), ("monoGrad", "monoDarkGradient"),
+                       ("monoGrad", "monoDarkGradient")),
+}
+
+
+def vortex_icon_shapes(size, variant="core", with_glow=True, render_size=None):
+    """The vortex icon as Shapes in paint order.
+
+    Arc outlines are sampled for display ``render_size`` px wide (default
+    ``size``), so small renders carry far fewer vertices.
+    """
     cx, cy = size / 2, size / 2
     geom = ICON["geometry"]
     var_data = ICON["variants"][variant]
@@ -182,7 +806,6 @@ def generate_vortex_icon_svg(size, variant="core", with_glow=True):
     rot = geom["ellipseOuter"]["rotationDeg"]
     
     outer_thick = geom["arcThickness"]["outerRatioToOuterRy"] * outer_ry
-    inner_thick = geom["arcThickness"]["innerRatioToOuterRy"] * outer_ry
     
     core_rx = geom["coreCutout"]["rxRatio"] * size
     core_ry = geom["coreCutout"]["ryRatio"] * size
@@ -193,209 +816,103 @@ def generate_vortex_icon_svg(size, variant="core", with_glow=True):
     ring_thick = outer_rx - core_rx
     
     taper = geom["tailTaper"]
+    tolerance = arc_tolerance(size, render_size)
+    primary, secondary, ring = [(p[0], find_gradient(p[1])) if p else None for p in VORTEX_PAINTS[variant]]
+
+    def arc(start, end, thickness):
+        return (cx, cy, outer_rx, outer_ry, rot, start, end, thickness, taper["startThicknessRatio"],
+                taper["endThicknessRatio"], taper["taperExponent"], 80, tolerance)
+
+    shapes = []
     
-    defs = []
-    elements = []
-    
-    # Gradient defs based on variant
-    if variant == "core":
-        red_grad = find_gradient("redArcGradient")
-        blue_grad = find_gradient("blueArcGradient")
-        chrome_grad = find_gradient("chromeRingGradient")
-        defs.append(svg_gradient_def(red_grad, "redArc"))
-        defs.append(svg_gradient_def(blue_grad, "blueArc"))
-        defs.append(svg_gradient_def(chrome_grad, "chromeCore"))
-    elif variant == "energy":
-        red_grad = find_gradient("redArcGradientStrong")
-        chrome_grad = find_gradient("chromeRingGradient")
-        defs.append(svg_gradient_def(red_grad, "redArc"))
-        defs.append(svg_gradient_def(chrome_grad, "chromeCore"))
-    elif variant == "trust":
-        blue_grad = find_gradient("blueArcGradientStrong")
-        chrome_grad = find_gradient("chromeRingGradient")
-        defs.append(svg_gradient_def(blue_grad, "blueArc"))
-        defs.append(svg_gradient_def(chrome_grad, "chromeCore"))
-    elif variant == "premium":
-        gold_grad = find_gradient("goldArcGradient")
-        chrome_grad = find_gradient("chromeRingGradientWarm")
-        defs.append(svg_gradient_def(gold_grad, "goldArc"))
-        defs.append(svg_gradient_def(chrome_grad, "chromeCore"))
-    elif variant == "monochromeWhite":
-        mono_grad = find_gradient("monoWhiteGradient")
-        defs.append(svg_gradient_def(mono_grad, "monoGrad"))
-    elif variant == "monochromeDark":
-        mono_grad = find_gradient("monoDarkGradient")
-        defs.append(svg_gradient_def(mono_grad, "monoGrad"))
-    
-    # Glow filters
+    # LAYER 6: Outer glow (behind everything, but rendered after for SVG layering)
     if with_glow and "glow" in var_data:
-        outer_glow = var_data["glow"].get("outer", {})
-        for glow_name, glow_data in outer_glow.items():
-            fid = f"glow_{glow_name}"
-            defs.append(svg_glow_filter(fid, glow_data["color"],
-                                         glow_data["blurPx"] * size / 1024,
-                                         glow_data.get("spreadPx", 0),
-                                         glow_data["opacity"]))
-    
-    # Shadow filter
-    if geom["shadow"]["enabled"]:
-        sh = geom["shadow"]
-        scale = size / 1024
-        defs.append(svg_drop_shadow_filter("iconShadow",
-                                            sh["offset"]["x"] * scale,
-                                            sh["offset"]["y"] * scale,
-                                            sh["blurPx"] * scale,
-                                            sh["color"], sh["opacity"]))
-    
-    # Specular filter
-    spec = geom["specular"]["topHighlight"]
-    defs.append(svg_gaussian_blur_filter("specBlur", spec["blurPx"] * size / 1024))
-    
-    defs_str = "\n".join(defs)
+        for glow_name, glow_data in var_data["glow"].get("outer", {}).items():
+            effect = (f"glow_{glow_name}", "glow", (glow_data["color"], glow_data["blurPx"] * size / 1024,
+                                                    glow_data.get("spreadPx", 0), glow_data["opacity"]))
+            shapes.append(Shape("ellipse", (cx, cy, outer_rx * 1.1, outer_ry * 1.1, rot), fill=glow_data["color"],
+                                opacity=glow_data["opacity"] * 0.6, effect=effect))
     
     # LAYER 1: Shadow ellipse
     if geom["shadow"]["enabled"]:
-        elements.append(f'<ellipse cx="{cx}" cy="{cy}" rx="{outer_rx}" ry="{outer_ry}" '
-                        f'transform="rotate({rot} {cx} {cy})" '
-                        f'fill="{C["graphiteBackground"]["hex"]}" opacity="0.6" filter="url(#iconShadow)"/>')
+        sh = geom["shadow"]
+        scale = size / 1024
+        effect = ("iconShadow", "shadow", (sh["offset"]["x"] * scale, sh["offset"]["y"] * scale,
+                                           sh["blurPx"] * scale, sh["color"], sh["opacity"]))
+        shapes.append(Shape("ellipse", (cx, cy, outer_rx, outer_ry, rot), fill=C["graphiteBackground"]["hex"],
+                            opacity=0.6, effect=effect))
     
     # LAYER 2: Blue arc (back) / secondary arc
     if variant == "core":
-        blue_path = tapered_arc_path(cx, cy, outer_rx, outer_ry, rot,
-                                      150, 380, outer_thick,
-                                      taper["startThicknessRatio"], taper["endThicknessRatio"],
-                                      taper["taperExponent"])
-        elements.append(f'<path d="{blue_path}" fill="url(#blueArc)" opacity="0.9"/>')
+        shapes.append(Shape("arc", arc(150, 380, outer_thick), fill=secondary, opacity=0.9))
     elif variant == "trust":
-        blue_path = tapered_arc_path(cx, cy, outer_rx, outer_ry, rot,
-                                      -30, 200, outer_thick,
-                                      taper["startThicknessRatio"], taper["endThicknessRatio"],
-                                      taper["taperExponent"])
-        blue_path2 = tapered_arc_path(cx, cy, outer_rx, outer_ry, rot,
-                                       150, 380, outer_thick,
-                                       taper["startThicknessRatio"], taper["endThicknessRatio"],
-                                       taper["taperExponent"])
-        elements.append(f'<path d="{blue_path}" fill="url(#blueArc)" opacity="0.85"/>')
-        elements.append(f'<path d="{blue_path2}" fill="url(#blueArc)" opacity="0.7"/>')
+        shapes.append(Shape("arc", arc(-30, 200, outer_thick), fill=secondary, opacity=0.85))
+        shapes.append(Shape("arc", arc(150, 380, outer_thick), fill=secondary, opacity=0.7))
     
     # LAYER 3: Chrome core ring
-    if variant in ("monochromeWhite", "monochromeDark"):
-        fill = "url(#monoGrad)"
-    else:
-        fill = "url(#chromeCore)"
-    
-    elements.append(
-        f'<ellipse cx="{cx}" cy="{cy}" rx="{ring_rx}" ry="{ring_ry}" '
-        f'transform="rotate({rot} {cx} {cy})" '
-        f'fill="none" stroke="{fill}" stroke-width="{ring_thick:.1f}" opacity="0.95"/>'
-    )
+    shapes.append(Shape("ellipse", (cx, cy, ring_rx, ring_ry, rot), stroke=ring,
+                        stroke_width=round(ring_thick, 1), opacity=0.95))
     
     # LAYER 4: Red arc (front) / primary arc
     if variant == "core":
-        red_path = tapered_arc_path(cx, cy, outer_rx, outer_ry, rot,
-                                     -30, 200, outer_thick,
-                                     taper["startThicknessRatio"], taper["endThicknessRatio"],
-                                     taper["taperExponent"])
-        elements.append(f'<path d="{red_path}" fill="url(#redArc)" opacity="0.92"/>')
-    elif variant == "energy":
-        red_path = tapered_arc_path(cx, cy, outer_rx, outer_ry, rot,
-                                     -30, 200, outer_thick,
-                                     taper["startThicknessRatio"], taper["endThicknessRatio"],
-                                     taper["taperExponent"])
-        red_path2 = tapered_arc_path(cx, cy, outer_rx, outer_ry, rot,
-                                      150, 380, outer_thick * 0.8,
-                                      taper["startThicknessRatio"], taper["endThicknessRatio"],
-                                      taper["taperExponent"])
-        elements.append(f'<path d="{red_path}" fill="url(#redArc)" opacity="0.95"/>')
-        elements.append(f'<path d="{red_path2}" fill="url(#redArc)" opacity="0.65"/>')
-    elif variant == "premium":
-        gold_path = tapered_arc_path(cx, cy, outer_rx, outer_ry, rot,
-                                      -30, 200, outer_thick,
-                                      taper["startThicknessRatio"], taper["endThicknessRatio"],
-                                      taper["taperExponent"])
-        gold_path2 = tapered_arc_path(cx, cy, outer_rx, outer_ry, rot,
-                                       150, 380, outer_thick * 0.8,
-                                       taper["startThicknessRatio"], taper["endThicknessRatio"],
-                                       taper["taperExponent"])
-        elements.append(f'<path d="{gold_path}" fill="url(#goldArc)" opacity="0.92"/>')
-        elements.append(f'<path d="{gold_path2}" fill="url(#goldArc)" opacity="0.65"/>')
-    elif variant in ("monochromeWhite", "monochromeDark"):
-        mono_path = tapered_arc_path(cx, cy, outer_rx, outer_ry, rot,
-                                      -30, 200, outer_thick,
-                                      taper["startThicknessRatio"], taper["endThicknessRatio"],
-                                      taper["taperExponent"])
-        mono_path2 = tapered_arc_path(cx, cy, outer_rx, outer_ry, rot,
-                                       150, 380, outer_thick * 0.8,
-                                       taper["startThicknessRatio"], taper["endThicknessRatio"],
-                                       taper["taperExponent"])
-        elements.append(f'<path d="{mono_path}" fill="url(#monoGrad)" opacity="0.9"/>')
-        elements.append(f'<path d="{mono_path2}" fill="url(#monoGrad)" opacity="0.65"/>')
+        shapes.append(Shape("arc", arc(-30, 200, outer_thick), fill=primary, opacity=0.92))
+    elif variant != "trust":
+        shapes.append(Shape("arc", arc(-30, 200, outer_thick), fill=primary,
+                            opacity=0.95 if variant == "energy" else 0.92 if variant == "premium" else 0.9))
+        shapes.append(Shape("arc", arc(150, 380, outer_thick * 0.8), fill=secondary, opacity=0.65))
     
     # LAYER 5: Specular highlight
+    spec = geom["specular"]["topHighlight"]
+    spec_blur = ("specBlur", "blur", (spec["blurPx"] * size / 1024,))
     spec_angle = spec["positionPolar"]["angleDeg"]
     spec_r = spec["positionPolar"]["radiusRatio"] * size / 2
-    spec_x = cx + spec_r * math.cos(math.radians(spec_angle))
-    spec_y = cy + spec_r * math.sin(math.radians(spec_angle))
-    spec_size = spec["sizeRatio"] * size / 2
-    elements.append(
-        f'<circle cx="{spec_x:.1f}" cy="{spec_y:.1f}" r="{spec_size:.1f}" '
-        f'fill="white" opacity="{spec["opacity"]}" filter="url(#specBlur)"/>'
-    )
+    spec_x = round(cx + spec_r * math.cos(math.radians(spec_angle)), 1)
+    spec_y = round(cy + spec_r * math.sin(math.radians(spec_angle)), 1)
+    spec_size = round(spec["sizeRatio"] * size / 2, 1)
+    shapes.append(Shape("circle", (spec_x, spec_y, spec_size, spec_size, 0), fill="white",
+                        opacity=spec["opacity"], effect=spec_blur))
     
     # Inner rim highlight
     if geom["specular"]["innerRimHighlight"]["enabled"]:
         rim = geom["specular"]["innerRimHighlight"]
         rim_offset = rim["offsetRatio"] * size
-        elements.append(
-            f'<ellipse cx="{cx}" cy="{cy - rim_offset}" rx="{core_rx * 0.95}" ry="{core_ry * 0.95}" '
-            f'transform="rotate({core_rot} {cx} {cy - rim_offset})" '
-            f'fill="none" stroke="{C["silverHighlight"]["hex"]}" stroke-width="1.5" '
-            f'opacity="{rim["opacity"]}" filter="url(#specBlur)"/>'
-        )
-    
-    # LAYER 6: Outer glow (behind everything, but rendered after for SVG layering)
-    glow_elements = []
-    if with_glow and "glow" in var_data:
-        outer_glow = var_data["glow"].get("outer", {})
-        for glow_name, glow_data in outer_glow.items():
-            fid = f"glow_{glow_name}"
-            glow_elements.append(
-                f'<ellipse cx="{cx}" cy="{cy}" rx="{outer_rx * 1.1}" ry="{outer_ry * 1.1}" '
-                f'transform="rotate({rot} {cx} {cy})" '
-                f'fill="{glow_data["color"]}" opacity="{glow_data["opacity"] * 0.6}" '
-                f'filter="url(#{fid})"/>'
-            )
+        shapes.append(Shape("ellipse", (cx, cy - rim_offset, core_rx * 0.95, core_ry * 0.95, core_rot),
+                            stroke=C["silverHighlight"]["hex"], stroke_width=1.5, opacity=rim["opacity"],
+                            effect=spec_blur))
     
     # LAYER 7: Particle specks
-    particle_elements = []
     if variant == "core" and var_data.get("particleSpecks", {}).get("enabled"):
         ps = var_data["particleSpecks"]
         count = int(ps["countPer1024px"] * size / 1024)
-        seed = hash("iTrader.im") % 10000
         import random
-        rng = random.Random(seed)
+        rng = random.Random(SPECK_SEED)
         for i in range(count):
             angle = rng.uniform(0, 360)
             radius = rng.uniform(outer_rx * 0.6, outer_rx * 1.3)
-            px = cx + radius * math.cos(math.radians(angle))
-            py = cy + radius * math.sin(math.radians(angle))
-            ps_size = rng.uniform(ps["sizePx"][0], ps["sizePx"][1]) * size / 1024
-            ps_opacity = rng.uniform(ps["opacity"][0], ps["opacity"][1])
-            particle_elements.append(
-                f'<circle cx="{px:.1f}" cy="{py:.1f}" r="{ps_size:.1f}" '
-                f'fill="white" opacity="{ps_opacity}"/>'
-            )
+            px = round(cx + radius * math.cos(math.radians(angle)), 1)
+            py = round(cy + radius * math.sin(math.radians(angle)), 1)
+            ps_size = round(rng.uniform(ps["sizePx"][0], ps["sizePx"][1]) * size / 1024, 1)
+            ps_opacity = round(rng.uniform(ps["opacity"][0], ps["opacity"][1]), 3)
+            shapes.append(Shape("circle", (px, py, ps_size, ps_size, 0), fill="white", opacity=ps_opacity))
     
-    all_elements = glow_elements + elements + particle_elements
-    
-    svg = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" width="{size}" height="{size}">
-<defs>
-{defs_str}
-</defs>
-{"".join(all_elements)}
-</svg>'''
-    return svg
+    return shapes
+
+
+def vortex_icon_layers(doc, size, variant="core", with_glow=True, render_size=None):
+    """Register the vortex icon's defs on ``doc`` and return its layer markup."""
+    return [shape.to_svg(doc) for shape in vortex_icon_shapes(size, variant, with_glow, render_size)]
+
+
+def vortex_icon_symbol(doc, size, variant="core", with_glow=True):
+    """Register the vortex icon on ``doc`` as a <symbol> and return its id."""
+    return doc.symbol("vortex", vortex_icon_layers(doc, size, variant, with_glow), size, size)
+
+
+def generate_vortex_icon_svg(size, variant="core", with_glow=True, render_size=None):
+    """Generate the vortex icon SVG at a given size, optionally for a smaller render."""
+    doc = SvgDocument(size, size)
+    doc.add(*vortex_icon_layers(doc, size, variant, with_glow, render_size))
+    return doc.to_svg()
 
 
 # ---------------------------------------------------------------------------
@@ -406,31 +923,14 @@ def generate_wordmark_svg(width, height, mode="dark", include_icon=True, include
     """Generate the logo wordmark SVG."""
     props = LOGO["proportions"]
     
-    defs = []
-    elements = []
-    
-    # Gradient defs
-    chrome_grad = find_gradient("chromeTextGradient")
-    red_grad = find_gradient("redArcGradientStrong")
-    white_grad = find_gradient("softWhiteGradient")
-    red_streak_grad = find_gradient("redStreakGradient")
-    
-    defs.append(svg_gradient_def(chrome_grad, "chromeText"))
-    defs.append(svg_gradient_def(red_grad, "redAccent"))
-    defs.append(svg_gradient_def(white_grad, "whiteGrad"))
-    defs.append(svg_gradient_def(red_streak_grad, "redStreak"))
-    
-    # Glow filters
-    defs.append(svg_glow_filter("textGlow", "#FFFFFF", 10, 0, 0.18))
-    defs.append(svg_glow_filter("redGlow", "#FF2436", 18, 0, 0.55))
-    defs.append(svg_glow_filter("taglineGlow", "#FFFFFF", 6, 0, 0.12))
+    doc = SvgDocument(width, height)
     
     is_dark = mode == "dark"
     
     if is_dark:
         vignette_grad = find_gradient("graphiteVignette")
-        defs.append(svg_gradient_def(vignette_grad, "bgVignette"))
-        elements.append(f'<rect width="{width}" height="{height}" fill="url(#bgVignette)"/>')
+        vignette_id = doc.define("bgVignette", svg_gradient_def(vignette_grad, DEF_ID))
+        doc.add(f'<rect width="{width}" height="{height}" fill="url(#{vignette_id})"/>')
     
     # Icon area
     icon_w = width * props["iconToTotalWidth"] if include_icon else 0
@@ -441,39 +941,50 @@ def generate_wordmark_svg(width, height, mode="dark", include_icon=True, include
     wordmark_y = height * 0.52
     
     if is_dark:
-        wordmark_fill = "url(#chromeText)"
-        im_fill = "url(#redAccent)"
-        tagline_fill = "url(#whiteGrad)"
+        chrome_id = doc.define("chromeText", svg_gradient_def(find_gradient("chromeTextGradient"), DEF_ID))
+        red_id = doc.define("redAccent", svg_gradient_def(find_gradient("redArcGradientStrong"), DEF_ID))
+        white_id = doc.define("whiteGrad", svg_gradient_def(find_gradient("softWhiteGradient"), DEF_ID))
+        text_glow_id = doc.define("textGlow", svg_glow_filter(DEF_ID, "#FFFFFF", 10, 0, 0.18))
+        tagline_glow_id = doc.define("taglineGlow", svg_glow_filter(DEF_ID, "#FFFFFF", 6, 0, 0.12))
+        wordmark_fill = f"url(#{chrome_id})"
+        im_fill = f"url(#{red_id})"
+        tagline_fill = f"url(#{white_id})"
+        text_filter = f' filter="url(#{text_glow_id})"'
+        tagline_filter = f' filter="url(#{tagline_glow_id})"'
     else:
         wordmark_fill = "#101114"
         im_fill = "#C7001A"
         tagline_fill = "#2B2C31"
+        text_filter = ""
+        tagline_filter = ""
     
     # Wordmark text
     italic_angle = props["italicAngleDeg"]
     skew_transform = f'skewX({italic_angle})'
     
-    text_group = f'''<g transform="translate({wordmark_x:.1f}, {wordmark_y:.1f}) {skew_transform}" {'filter="url(#textGlow)"' if is_dark else ''}>
+    text_group = f'''<g transform="translate({wordmark_x:.1f}, {wordmark_y:.1f}) {skew_transform}"{text_filter}>
   <text font-family="'Montserrat', 'Eurostile', 'Bank Gothic', Arial, sans-serif" 
         font-weight="bold" font-size="{wordmark_font_size:.1f}" 
         letter-spacing="-1" fill="{wordmark_fill}" dominant-baseline="central">
     <tspan>iTrader</tspan><tspan fill="{im_fill}">.im</tspan>
   </text>
 </g>'''
-    elements.append(text_group)
+    doc.add(text_group)
     
     # Red underline streak
     if is_dark and LOGO["highlightEffects"]["redUnderlineStreak"]["enabled"]:
         streak = LOGO["highlightEffects"]["redUnderlineStreak"]
+        streak_id = doc.define("redStreak", svg_gradient_def(find_gradient("redStreakGradient"), DEF_ID))
+        glow_id = doc.define("redGlow", svg_glow_filter(DEF_ID, "#FF2436", 18, 0, 0.55))
         sx = width * streak["start"]["x"]
         sy = height * streak["start"]["y"]
         ex = width * streak["end"]["x"]
         ey = height * streak["end"]["y"]
         streak_h = wordmark_font_size * streak["thicknessRatioToWordmarkCapHeight"]
-        elements.append(
+        doc.add(
             f'<rect x="{sx:.1f}" y="{sy:.1f}" width="{ex - sx:.1f}" height="{streak_h:.1f}" '
-            f'rx="{streak_h / 2:.1f}" fill="url(#redStreak)" opacity="{streak["opacity"]}" '
-            f'filter="url(#redGlow)"/>'
+            f'rx="{streak_h / 2:.1f}" fill="url(#{streak_id})" opacity="{streak["opacity"]}" '
+            f'filter="url(#{glow_id})"/>'
         )
     
     # Tagline
@@ -481,13 +992,12 @@ def generate_wordmark_svg(width, height, mode="dark", include_icon=True, include
         tagline_size = wordmark_font_size * TYPO["supporting"]["tagline"]["sizeRatioToWordmark"]
         tagline_y = height * 0.83
         tagline_x = width * 0.5
-        elements.append(
+        doc.add(
             f'<text x="{tagline_x:.1f}" y="{tagline_y:.1f}" text-anchor="middle" '
             f'font-family="\'Montserrat\', \'Gotham\', Arial, sans-serif" '
             f'font-weight="500" font-size="{tagline_size:.1f}" '
             f'letter-spacing="{TYPO["supporting"]["tagline"]["tracking"] / 100:.1f}" '
-            f'fill="{tagline_fill}" opacity="0.9" '
-            f'{"filter=\"url(#taglineGlow)\"" if is_dark else ""}>'
+            f'fill="{tagline_fill}" opacity="0.9"{tagline_filter}>'
             f'BUY &bull; SELL &bull; UPGRADE</text>'
         )
     
@@ -496,21 +1006,10 @@ def generate_wordmark_svg(width, height, mode="dark", include_icon=True, include
         icon_size = height * 0.65
         icon_x = width * 0.02
         icon_y = (height - icon_size) / 2 - height * 0.05
-        icon_svg_inner = generate_vortex_icon_svg(icon_size, "core", with_glow=is_dark)
-        icon_inner = icon_svg_inner.split("<defs>")[1].split("</defs>")[0] if "<defs>" in icon_svg_inner else ""
-        icon_body = icon_svg_inner.split("</defs>")[1].split("</svg>")[0] if "</defs>" in icon_svg_inner else ""
-        defs.append(icon_inner)
-        elements.append(f'<g transform="translate({icon_x:.1f}, {icon_y:.1f})">{icon_body}</g>')
+        icon_id = vortex_icon_symbol(doc, icon_size, "core", with_glow=is_dark)
+        doc.add(doc.use(icon_id, icon_x, icon_y, icon_size, icon_size))
     
-    defs_str = "\n".join(defs)
-    svg = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" width="{width}" height="{height}">
-<defs>
-{defs_str}
-</defs>
-{"".join(elements)}
-</svg>'''
-    return svg
+    return doc.to_svg()
 
 
 # ---------------------------------------------------------------------------
@@ -549,10 +1048,8 @@ def generate_badge_svg(badge_type):
     glow_spec = spec.get("glow", {})
     if glow_spec:
         preset = glow_spec.get("preset", "blue")
-        glow_col = GLOW.get(preset, {}).get("color", "#3CAAFF")
-        defs.append(svg_glow_filter("badgeGlow", glow_col,
-                                     glow_spec.get("blurPx", 22),
-                                     0, glow_spec.get("opacity", 0.35)))
+        glow = glow_preset(preset, blurPx=glow_spec.get("blurPx", 22), opacity=glow_spec.get("opacity", 0.35))
+        defs.append(svg_glow_filter("badgeGlow", glow["color"], glow["blurPx"], 0, glow["opacity"]))
     
     # Icon paths
     icon_type = spec["icon"]["type"]
@@ -759,19 +1256,13 @@ def generate_spinner_svg(preset="default"):
 def generate_logo_animated_svg():
     """Generate the animated logo loader SVG."""
     size = 120
-    icon_svg = generate_vortex_icon_svg(80, "core", with_glow=True)
-    icon_inner = icon_svg.split("<defs>")[1].split("</defs>")[0] if "<defs>" in icon_svg else ""
-    icon_body = icon_svg.split("</defs>")[1].split("</svg>")[0] if "</defs>" in icon_svg else ""
+    doc = SvgDocument(size, size)
+    icon_id = vortex_icon_symbol(doc, 80, "core", with_glow=True)
     
     anim = MOTION["suggestedAnimation"]
     pulse = anim["iconPulse"]
     
-    return f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" width="{size}" height="{size}">
-<defs>
-{icon_inner}
-</defs>
-<style>
+    doc.add(f'''<style>
 @keyframes pulse {{
   0%, 100% {{ transform: scale(1); opacity: 0.45; }}
   50% {{ transform: scale(1.03); opacity: 0.62; }}
@@ -787,10 +1278,10 @@ def generate_logo_animated_svg():
   transform-origin: {size/2}px {size/2}px;
 }}
 </style>
-<g class="icon-pulse" transform="translate({(size-80)/2}, {(size-80)/2})">
-{icon_body}
-</g>
-</svg>'''
+''')
+    doc.add(SvgNode("g", {"class": "icon-pulse", "transform": f"translate({(size-80)/2}, {(size-80)/2})"},
+                    [doc.use(icon_id, 0, 0, 80, 80)]))
+    return doc.to_svg()
 
 
 # ---------------------------------------------------------------------------
@@ -823,159 +1314,605 @@ def generate_payment_badge_svg(ptype):
 
 
 # ---------------------------------------------------------------------------
-# CATEGORY EXPRESSION GENERATION (PNG via Pillow)
+# FONT REGISTRY
 # ---------------------------------------------------------------------------
+# Raster text (banners, placeholder PNGs) is set in the typographySystem
+# families. A family resolves to the first matching font file shipped under
+# FONT_DIRS, then to common system fonts, then to Pillow's default font.
+# Loaded fonts and measured text widths are cached per process.
 
-def generate_category_png(cat_name, w, h):
-    """Generate category expression banner as PNG using Pillow."""
-    if not HAS_PILLOW:
-        return None
-    
-    cat = CATEGORIES.get(cat_name)
-    if not cat:
-        cat = CATEGORIES.get("vehicles")
-    
-    img = Image.new("RGBA", (w, h), (5, 4, 5, 255))
-    draw = ImageDraw.Draw(img)
-    
-    accent_hex = color(cat["primaryAccent"])
-    accent_r, accent_g, accent_b = int(accent_hex[1:3], 16), int(accent_hex[3:5], 16), int(accent_hex[5:7], 16)
-    
-    for y in range(h):
-        ratio = y / h
-        overlay_opacity = 0.55 if ratio < 0.3 else (0.15 if ratio < 0.7 else 0.55)
-        r = int(5 * (1 - overlay_opacity))
-        g = int(4 * (1 - overlay_opacity))
-        b = int(5 * (1 - overlay_opacity))
-        draw.line([(0, y), (w, y)], fill=(r, g, b, 255))
-    
-    streak_y = int(h * 0.5)
-    streak_h = int(h * cat.get("motionStreak", {}).get("thicknessRatio", 0.1))
-    for dy in range(streak_h):
-        dist = abs(dy - streak_h / 2) / (streak_h / 2)
-        opacity = int((1 - dist ** 2) * 180)
-        blend = max(0, min(255, opacity))
-        draw.line([(0, streak_y + dy), (w, streak_y + dy)],
-                  fill=(accent_r, accent_g, accent_b, blend))
-    
-    glow_radius = max(w, h) // 4
-    glow_img = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-    glow_draw = ImageDraw.Draw(glow_img)
-    glow_draw.ellipse([w // 2 - glow_radius, h // 2 - glow_radius,
-                        w // 2 + glow_radius, h // 2 + glow_radius],
-                       fill=(accent_r, accent_g, accent_b, 40))
-    glow_img = glow_img.filter(ImageFilter.GaussianBlur(radius=glow_radius // 2))
-    img = Image.alpha_composite(img, glow_img)
-    
-    draw = ImageDraw.Draw(img)
-    
-    lp = cat.get("logoPlacementRatio", {"x": 0.09, "y": 0.22})
-    text_x = int(w * lp["x"])
-    text_y = int(h * lp["y"])
-    
-    try:
-        font_large = ImageFont.truetype("arial.ttf", max(28, h // 14))
-        font_small = ImageFont.truetype("arial.ttf", max(14, h // 28))
-    except (OSError, IOError):
-        font_large = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-    
-    draw.text((text_x, text_y), "iTrader", fill=(239, 240, 243, 255), font=font_large)
-    im_x = text_x + font_large.getlength("iTrader") if hasattr(font_large, 'getlength') else text_x + 180
-    draw.text((im_x, text_y), ".im", fill=(226, 34, 41, 255), font=font_large)
-    
-    cat_labels = {
-        "vehicles": "VEHICLES",
-        "hifiAv": "HI-FI & AV",
-        "watches": "WATCHES",
-        "luxury": "LUXURY",
-        "default": "MARKETPLACE"
-    }
-    label = cat_labels.get(cat_name, "MARKETPLACE")
-    draw.text((text_x, text_y + h // 10), label, fill=(250, 250, 252, 200), font=font_small)
-    
-    tagline_y = int(h * 0.83)
-    draw.text((w // 2 - 80, tagline_y), "BUY \u2022 SELL \u2022 UPGRADE",
-              fill=(207, 207, 212, 180), font=font_small)
-    
-    return img
+FONT_SUFFIXES = (".ttf", ".otf")
+# System fonts tried, by weight, when no shipped file matches a family.
+FONT_FALLBACKS = {
+    "regular": ("DejaVuSans.ttf", "arial.ttf"),
+    "bold": ("DejaVuSans-Bold.ttf", "arialbd.ttf", "arial.ttf"),
+}
 
 
-# ---------------------------------------------------------------------------
-# OG IMAGE GENERATION (PNG via Pillow)
-# ---------------------------------------------------------------------------
+def _font_key(text):
+    return re.sub(r"[^a-z0-9]", "", text.lower())
 
-def generate_og_image(variant="default", w=1200, h=630):
-    """Generate Open Graph image using Pillow."""
-    if not HAS_PILLOW:
-        return None
-    
-    img = Image.new("RGBA", (w, h), (5, 4, 5, 255))
-    draw = ImageDraw.Draw(img)
-    
-    for y in range(h):
-        ratio = y / h
-        v = int(5 + 6 * math.sin(ratio * math.pi))
-        draw.line([(0, y), (w, y)], fill=(v, v - 1, v + 2, 255))
-    
-    for x in range(w):
-        ratio = x / w
-        edge_fade = min(ratio, 1 - ratio) * 2
-        opacity = int((1 - edge_fade) * 40)
-        if opacity > 0:
-            draw.line([(x, 0), (x, h)], fill=(0, 0, 0, opacity))
-    
-    streak_y = h // 2 + 30
-    streak_h = 12
-    for dy in range(streak_h):
-        dist = abs(dy - streak_h / 2) / (streak_h / 2)
-        opacity = int((1 - dist ** 2) * 120)
-        draw.line([(w * 0.15, streak_y + dy), (w * 0.85, streak_y + dy)],
-                  fill=(226, 34, 41, opacity))
-    
-    blue_glow = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-    bd = ImageDraw.Draw(blue_glow)
-    bd.ellipse([w // 2 - 200, h // 2 - 100, w // 2 + 200, h // 2 + 100],
-               fill=(21, 123, 202, 25))
-    blue_glow = blue_glow.filter(ImageFilter.GaussianBlur(radius=80))
-    img = Image.alpha_composite(img, blue_glow)
-    
+
+def font_family_names(family):
+    """Names in a typographySystem family, most specific first.
+
+    "geometricSans (approx: Montserrat / Gotham)" -> ["geometricSans", "Montserrat", "Gotham"]
+    """
+    name, _, approx = family.partition("(")
+    names = [name.strip()] + [re.sub(r"\s+style$", "", n.strip())
+                              for n in approx.rstrip(")").split(":", 1)[-1].split("/")]
+    return [n for n in names if n]
+
+
+@functools.lru_cache(maxsize=None)
+def font_files():
+    """{normalized file stem: path} of every font file under FONT_DIRS."""
+    files = {}
+    for directory in FONT_DIRS:
+        if directory.is_dir():
+            for path in sorted(directory.rglob("*")):
+                if path.suffix.lower() in FONT_SUFFIXES:
+                    files.setdefault(_font_key(path.stem), path)
+    return files
+
+
+def font_candidates(family, style=""):
+    """Font files and system font names to try for ``family`` in ``style``, best first.
+
+    A shipped file matches a family name plus the style ("Montserrat" +
+    "semiBold" -> Montserrat-SemiBold.ttf), then the plain or Regular cut,
+    then any file whose name starts with the family.
+    """
+    files = font_files()
+    style_key = _font_key(style)
+    candidates = []
+    for name in font_family_names(family):
+        key = _font_key(name)
+        exact = [files[k] for k in (key + style_key, key + "regular", key) if k in files]
+        candidates += exact or [path for stem, path in files.items() if stem.startswith(key)]
+    weight = "bold" if "bold" in style_key else "regular"
+    return [str(path) for path in candidates] + list(FONT_FALLBACKS[weight])
+
+
+@functools.lru_cache(maxsize=64)
+def brand_font(family, size, style=""):
+    """Font for a typographySystem ``family`` at ``size`` px, loaded once per process."""
+    for source in font_candidates(family, style):
+        try:
+            return ImageFont.truetype(source, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1 has no scalable default font
+        return ImageFont.load_default()
+
+
+def typo_font(role, size):
+    """brand_font() for a typographySystem role: "wordmark" or a "supporting" entry like "tagline"."""
+    entry = TYPO[role] if role in TYPO else TYPO["supporting"][role]
+    return brand_font(entry["family"], size, entry.get("style", ""))
+
+
+@functools.lru_cache(maxsize=4096)
+def text_length(font, text):
+    """Advance width of ``text`` in ``font``, memoized for the cached fonts of brand_font()."""
+    return font.getlength(text)
+
+
+def font_stamp():
+    """Names, sizes and mtimes of the shipped font files, for cache keys."""
+    return ";".join(f"{path.name}:{path.stat().st_size}:{path.stat().st_mtime_ns}"
+                    for path in font_files().values())
+
+
+# ---------------------------------------------------------------------------
+# GLOW ENGINE (NumPy)
+# ---------------------------------------------------------------------------
+# Glows are Gaussian-blurred shapes, but never blurred at full resolution:
+# each is evaluated on a grid coarsened as far as the error tolerance
+# allows (circles from their exact radial profile, other shapes by a
+# blur), then bilinearly upsampled in float32. Cost follows the glow's
+# softness plus one cheap pass over the pixels it covers.
+
+# Largest coverage error (0-1) accepted from a glow, half an 8-bit step.
+GLOW_TOLERANCE = 0.5 / 255
+
+
+def glow_preset(name, **overrides):
+    """GLOW preset ``name`` over outerGlowDefaults: color, blurPx, spreadPx and opacity."""
+    preset = {"color": "#3CAAFF"}
+    preset.update(GLOW.get("outerGlowDefaults", {}))
+    preset.update(GLOW.get(name, {}))
+    preset.update(overrides)
+    return preset
+
+
+def glow_grid_factor(sigma, tolerance=GLOW_TOLERANCE):
+    """Coarsest power-of-two grid step (px) for blurring at ``sigma`` within ``tolerance``.
+
+    Averaging, blurring and bilinearly upsampling an edge errs by up to
+    about 0.12 * (step / sigma)^2 (measured against an exact blur).
+    """
+    step = sigma * math.sqrt(tolerance / 0.12)
+    return 1 << max(0, int(math.log2(step))) if step >= 2 else 1
+
+
+def sample_grid(grid, origin, step, ys, xs):
+    """Bilinear samples of a coarse ``grid`` at pixel rows ``ys`` and columns ``xs``.
+
+    Cell (i, j) averages the ``step``-px square at ``origin`` + (j, i) * step;
+    samples beyond the grid fade to zero.
+    """
+    padded = np.pad(grid, 1)
+
+    def axis(coords, start, n):
+        u = np.clip((coords + 0.5 - start) / step + 0.5, 0, n + 1)
+        index = np.minimum(np.floor(u).astype(np.int64), n)
+        return index, (u - index).astype(np.float32)
+
+    i, wy = axis(np.asarray(ys), origin[1], grid.shape[0])
+    rows = padded[i] * (1 - wy)[:, None] + padded[i + 1] * wy[:, None]
+    j, wx = axis(np.asarray(xs), origin[0], grid.shape[1])
+    return rows[:, j] * (1 - wx) + rows[:, j + 1] * wx
+
+
+def gaussian_operator(n, sigma):
+    """(n, n) matrix applying an exact Gaussian blur along an axis of length ``n``.
+
+    Each weight integrates the Gaussian over one pixel; samples beyond the
+    axis count as zero.
+    """
+    if sigma < 1e-3:
+        return np.eye(n, dtype=np.float32)
+    offsets = np.arange(-n, n + 1) + 0.5
+    cdf = np.array([0.5 * (1 + math.erf(d / (sigma * math.sqrt(2)))) for d in offsets])
+    weights = np.diff(cdf).astype(np.float32)
+    index = np.arange(n)
+    return weights[index[None, :] - index[:, None] + n - 1]
+
+
+def coarse_gaussian_blur(grid, sigma):
+    """Exact Gaussian blur of a small 2-D ``grid`` as two matrix products."""
+    rows, cols = grid.shape
+    return gaussian_operator(rows, sigma) @ grid @ gaussian_operator(cols, sigma).T
+
+
+def blur_coverage(alpha, sigma, tolerance=GLOW_TOLERANCE):
+    """Gaussian blur of a 2-D coverage array, computed on the coarsest grid within ``tolerance``."""
+    step = glow_grid_factor(sigma, tolerance)
+    if step == 1:
+        return gaussian_blur_np(alpha, sigma)
+    h, w = alpha.shape
+    padded = np.zeros((-(-h // step) * step, -(-w // step) * step), dtype=np.float32)
+    padded[:h, :w] = alpha
+    grid = padded.reshape(padded.shape[0] // step, step, -1, step).mean(axis=(1, 3))
+    # Cell averaging and the per-cell kernel weights each add a box of variance step^2 / 12.
+    grid = coarse_gaussian_blur(grid, math.sqrt(max(sigma * sigma - step * step / 6, 0)) / step)
+    return sample_grid(grid, (0, 0), step, np.arange(h), np.arange(w)).astype(np.float32)
+
+
+def disc_glow_profile(radius, sigma, tolerance=GLOW_TOLERANCE, angles=512):
+    """Coverage of a disc blurred by a Gaussian, as (distances from centre, coverage) tables.
+
+    Around each sample point the Gaussian is integrated in polar form: a ray
+    crossing the disc between t1 and t2 contributes exp(-t1^2 / 2 sigma^2) -
+    exp(-t2^2 / 2 sigma^2). Samples are spaced so linear interpolation stays
+    within ``tolerance``.
+    """
+    spacing = sigma * math.sqrt(20 * tolerance)
+    r = np.arange(0, radius + 4 * sigma + 2 * spacing, spacing)[:, None]
+    theta = (np.arange(angles) + 0.5) * math.pi / angles
+    half_chord = np.sqrt(np.maximum(radius * radius - (r * np.sin(theta)) ** 2, 0))
+    near = np.maximum(-r * np.cos(theta) - half_chord, 0)
+    far = np.maximum(-r * np.cos(theta) + half_chord, 0)
+    falloff = np.exp(-near * near / (2 * sigma * sigma)) - np.exp(-far * far / (2 * sigma * sigma))
+    return r[:, 0], falloff.mean(axis=1)
+
+
+class EllipseGlow:
+    """Coverage of an ellipse blurred by a Gaussian of ``sigma``, evaluated on demand.
+
+    ``box`` is a Pillow ellipse box [x0, y0, x1, y1] (inclusive pixels).
+    The coverage lives on a coarse grid: sampled from disc_glow_profile()
+    for circles, blurred from the outline for other ellipses.
+    ``extent`` bounds where the coverage is non-negligible.
+    """
+
+    def __init__(self, box, sigma, tolerance=GLOW_TOLERANCE):
+        x0, y0, x1, y1 = box
+        self.centre = ((x0 + x1 + 1) / 2, (y0 + y1 + 1) / 2)
+        rx, ry = (x1 - x0 + 1) / 2, (y1 - y0 + 1) / 2
+        self.step = step = glow_grid_factor(sigma, tolerance)
+        reach = math.ceil(3 * sigma) + step
+        self.extent = (x0 - reach, y0 - reach, x1 + 1 + reach, y1 + 1 + reach)
+        self.origin = (self.extent[0] // step * step, self.extent[1] // step * step)
+        cols = -(-(self.extent[2] - self.origin[0]) // step)
+        rows = -(-(self.extent[3] - self.origin[1]) // step)
+        if rx == ry:
+            # The radial profile read at the cell centres; it and the upsampling split the tolerance.
+            gx = self.origin[0] + (np.arange(cols) + 0.5) * step - self.centre[0]
+            gy = self.origin[1] + (np.arange(rows) + 0.5) * step - self.centre[1]
+            profile = disc_glow_profile(rx, sigma, tolerance / 2)
+            self.grid = np.interp(np.hypot(gx[None, :], gy[:, None]), *profile)
+        else:
+            # Chords cut inside the outline; keep that shrinkage to about sigma * tolerance.
+            sagitta = min(sigma * tolerance / max(rx, ry), 1)
+            segments = max(32, math.ceil(math.pi / math.acos(1 - sagitta)))
+            t = np.linspace(0, 360, segments, endpoint=False)
+            px, py = ellipse_points_np(self.centre[0], self.centre[1], rx, ry, 0, t)
+            outline = np.column_stack(((px - self.origin[0]) / step, (py - self.origin[1]) / step))
+            grid = polygon_coverage([outline], cols, rows, max(COVERAGE_SUBSAMPLES, 4 * step))
+            self.grid = coarse_gaussian_blur(grid, math.sqrt(max(sigma * sigma - step * step / 6, 0)) / step)
+        self.grid = self.grid.astype(np.float32)
+
+    def coverage(self, top, rows, x0, x1):
+        """(rows, x1 - x0) coverage of pixel rows top.. and columns x0..x1."""
+        ys, xs = np.arange(top, top + rows), np.arange(x0, x1)
+        return sample_grid(self.grid, self.origin, self.step, ys, xs).astype(np.float32, copy=False)
+
+
+# ---------------------------------------------------------------------------
+# BANNER COMPOSITING (NumPy)
+# ---------------------------------------------------------------------------
+# Banner backgrounds are opaque float32 RGB canvases of shape (h, w, 3).
+# Layers are whole arrays blended with alpha-over, so a gradient, vignette
+# or streak band costs one array operation instead of a draw call per row.
+
+def row_gradient_canvas(w, row_rgb):
+    """Canvas whose rows take the colours in ``row_rgb`` (an (h, 3) array)."""
+    row_rgb = np.asarray(row_rgb, dtype=np.float32)
+    return np.repeat(row_rgb[:, None, :], w, axis=1)
+
+
+def composite_over(canvas, rgb, alpha, rows=slice(None), cols=slice(None), weight=None):
+    """Alpha-over blend a solid ``rgb`` onto ``canvas[rows, cols]`` in place.
+
+    ``alpha`` is in [0, 1] and broadcasts against the region, e.g. (n, 1, 1)
+    for a per-row band or (1, n, 1) for a per-column fade. ``weight``
+    (default ``alpha``) scales the added colour on its own, for a layer
+    whose colour fades with its alpha, like a blurred straight-alpha layer.
+    """
+    region = canvas[rows, cols]
+    alpha = np.asarray(alpha, dtype=np.float32)[:region.shape[0], :region.shape[1], 0]
+    weight = alpha if weight is None else np.asarray(weight, dtype=np.float32)[:region.shape[0], :region.shape[1], 0]
+    keep = 1 - alpha
+    # Channel by channel: broadcasting a (..., 1) alpha over interleaved RGB is several times slower.
+    for channel, value in enumerate(np.asarray(rgb, dtype=np.float32)):
+        plane = region[..., channel]
+        plane *= keep
+        plane += weight * value
+
+
+def band_opacity(n, peak):
+    """Opacity profile (0-255 ints) of a soft streak ``n`` pixels thick."""
+    dist = np.abs(np.arange(n) - n / 2) / (n / 2)
+    return np.clip(np.floor((1 - dist ** 2) * peak), 0, 255)
+
+
+def band_slices(start, count, band):
+    """Rows ``start``..``start + count`` of a layer that fall inside ``band`` (top, rows),
+    as (slice of the layer, slice of the band)."""
+    top, rows = band
+    lo = max(start, top)
+    hi = max(lo, min(start + count, top + rows))
+    return slice(lo - start, hi - start), slice(lo - top, hi - top)
+
+
+def canvas_to_image(canvas):
+    """Convert an RGB float canvas to an opaque RGBA PIL image."""
+    h, w, _ = canvas.shape
+    rgba = np.empty((h, w, 4), dtype=np.uint8)
+    rgba[..., :3] = np.clip(np.rint(canvas), 0, 255)
+    rgba[..., 3] = 255
+    return Image.fromarray(rgba, "RGBA")
+
+
+def glow_over(canvas, w, h, box, rgba, radius, band):
+    """Blend a solid ellipse ``box`` blurred to GaussianBlur(``radius``) onto the band canvas.
+
+    The glow comes from EllipseGlow, evaluated only over the band rows it
+    reaches. The colour is scaled with the coverage like a blurred
+    straight-alpha RGBA layer.
+    """
+    glow = EllipseGlow(box, radius)
+    ex0, ey0, ex1, ey1 = glow.extent
+    layer, rows = band_slices(ey0, ey1 - ey0, band)
+    x0, x1 = max(0, ex0), min(w, ex1)
+    if rows.stop <= rows.start or x1 <= x0:
+        return
+    coverage = glow.coverage(band[0] + rows.start, rows.stop - rows.start, x0, x1)[..., None]
+    alpha = coverage * np.float32(rgba[3] / 255)
+    composite_over(canvas, rgba[:3], alpha, rows=rows, cols=slice(x0, x1), weight=alpha * coverage)
+
+
+def category_background_np(w, h, accent_rgb, streak_y, streak_h, band=None):
+    """Category banner background: banded graphite rows plus the accent streak.
+
+    ``band`` (top, rows) limits the canvas to those rows of the frame.
+    """
+    band = band or (0, h)
+    ratio = np.arange(band[0], band[0] + band[1]) / h
+    overlay = np.where(ratio < 0.3, 0.55, np.where(ratio < 0.7, 0.15, 0.55))
+    rows = np.floor(np.outer(1 - overlay, (5, 4, 5)))
+    canvas = row_gradient_canvas(w, rows)
+    if streak_h > 0:
+        layer, rows = band_slices(streak_y, streak_h, band)
+        alpha = band_opacity(streak_h, 180)[layer, None, None] / 255
+        composite_over(canvas, accent_rgb, alpha, rows=rows)
+    return canvas
+
+
+def og_background_np(w, h, streak_y, streak_h, band=None):
+    """OG image background: sine-lit rows, dark side vignette, red streak.
+
+    ``band`` (top, rows) limits the canvas to those rows of the frame.
+    """
+    band = band or (0, h)
+    v = np.floor(5 + 6 * np.sin(np.arange(band[0], band[0] + band[1]) / h * math.pi))
+    canvas = row_gradient_canvas(w, np.column_stack((v, v - 1, v + 2)))
+    ratio = np.arange(w) / w
+    edge_fade = np.minimum(ratio, 1 - ratio) * 2
+    vignette = np.floor((1 - edge_fade) * 40)[None, :, None] / 255
+    composite_over(canvas, (0, 0, 0), vignette)
+    layer, rows = band_slices(streak_y, streak_h, band)
+    alpha = band_opacity(streak_h, 120)[layer, None, None] / 255
+    composite_over(canvas, (226, 34, 41), alpha, rows=rows,
+                   cols=slice(round(w * 0.15), round(w * 0.85) + 1))
+    return canvas
+
+
+# ---------------------------------------------------------------------------
+# CATEGORY EXPRESSION GENERATION (PNG via Pillow)
+# ---------------------------------------------------------------------------
+
+def generate_category_png(cat_name, w, h, band=None):
+    """Generate category expression banner as PNG using Pillow.
+
+    With NumPy, ``band`` (top, rows) draws just those rows of the banner;
+    render_banner_bands() streams large banners this way.
+    """
+    if not HAS_PILLOW:
+        return None
+    
+    cat = CATEGORIES.get(cat_name)
+    if not cat:
+        cat = CATEGORIES.get("vehicles")
+    
+    accent_hex = color(cat["primaryAccent"])
+    accent_r, accent_g, accent_b = int(accent_hex[1:3], 16), int(accent_hex[3:5], 16), int(accent_hex[5:7], 16)
+    
+    streak_y = int(h * 0.5)
+    streak_h = int(h * cat.get("motionStreak", {}).get("thicknessRatio", 0.1))
+    
+    glow_radius = max(w, h) // 4
+    glow_box = [w // 2 - glow_radius, h // 2 - glow_radius, w // 2 + glow_radius, h // 2 + glow_radius]
+    top = band[0] if band and HAS_NUMPY else 0
+    
+    if HAS_NUMPY:
+        band = band or (0, h)
+        canvas = category_background_np(w, h, (accent_r, accent_g, accent_b), streak_y, streak_h, band)
+        glow_over(canvas, w, h, glow_box, (accent_r, accent_g, accent_b, 40), glow_radius // 2, band)
+        img = canvas_to_image(canvas)
+    else:
+        img = Image.new("RGBA", (w, h), (5, 4, 5, 255))
+        draw = ImageDraw.Draw(img)
+        for y in range(h):
+            ratio = y / h
+            overlay_opacity = 0.55 if ratio < 0.3 else (0.15 if ratio < 0.7 else 0.55)
+            r = int(5 * (1 - overlay_opacity))
+            g = int(4 * (1 - overlay_opacity))
+            b = int(5 * (1 - overlay_opacity))
+            draw.line([(0, y), (w, y)], fill=(r, g, b, 255))
+        
+        streak = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        streak_draw = ImageDraw.Draw(streak)
+        for dy in range(streak_h):
+            dist = abs(dy - streak_h / 2) / (streak_h / 2)
+            opacity = int((1 - dist ** 2) * 180)
+            blend = max(0, min(255, opacity))
+            streak_draw.line([(0, streak_y + dy), (w, streak_y + dy)],
+                             fill=(accent_r, accent_g, accent_b, blend))
+        img = Image.alpha_composite(img, streak)
+        
+        glow_img = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        glow_draw = ImageDraw.Draw(glow_img)
+        glow_draw.ellipse(glow_box, fill=(accent_r, accent_g, accent_b, 40))
+        glow_img = glow_img.filter(ImageFilter.GaussianBlur(radius=glow_radius // 2))
+        img = Image.alpha_composite(img, glow_img)
+    
     draw = ImageDraw.Draw(img)
     
-    try:
-        font_brand = ImageFont.truetype("arial.ttf", 52)
-        font_tag = ImageFont.truetype("arial.ttf", 18)
-    except (OSError, IOError):
-        font_brand = ImageFont.load_default()
-        font_tag = ImageFont.load_default()
+    lp = cat.get("logoPlacementRatio", {"x": 0.09, "y": 0.22})
+    text_x = int(w * lp["x"])
+    text_y = int(h * lp["y"]) - top
     
-    brand_text = "iTrader.im"
-    if hasattr(font_brand, 'getlength'):
-        tw = font_brand.getlength(brand_text)
+    font_large = typo_font("wordmark", max(28, h // 14))
+    font_small = typo_font("labelsSmall", max(14, h // 28))
+    
+    draw.text((text_x, text_y), "iTrader", fill=(239, 240, 243, 255), font=font_large)
+    im_x = text_x + text_length(font_large, "iTrader")
+    draw.text((im_x, text_y), ".im", fill=(226, 34, 41, 255), font=font_large)
+    
+    cat_labels = {
+        "vehicles": "VEHICLES",
+        "hifiAv": "HI-FI & AV",
+        "watches": "WATCHES",
+        "luxury": "LUXURY",
+        "default": "MARKETPLACE"
+    }
+    label = cat_labels.get(cat_name, "MARKETPLACE")
+    draw.text((text_x, text_y + h // 10), label, fill=(250, 250, 252, 200), font=font_small)
+    
+    tagline_y = int(h * 0.83) - top
+    draw.text((w // 2 - 80, tagline_y), "BUY \u2022 SELL \u2022 UPGRADE",
+              fill=(207, 207, 212, 180), font=font_small)
+    
+    return img
+
+
+# ---------------------------------------------------------------------------
+# OG IMAGE GENERATION (PNG via Pillow)
+# ---------------------------------------------------------------------------
+
+def generate_og_image(variant="default", w=1200, h=630, band=None):
+    """Generate Open Graph image using Pillow.
+
+    With NumPy, ``band`` (top, rows) draws just those rows of the image.
+    """
+    if not HAS_PILLOW:
+        return None
+    
+    streak_y = h // 2 + 30
+    streak_h = 12
+    glow_box = [w // 2 - 200, h // 2 - 100, w // 2 + 200, h // 2 + 100]
+    top = band[0] if band and HAS_NUMPY else 0
+    
+    if HAS_NUMPY:
+        band = band or (0, h)
+        canvas = og_background_np(w, h, streak_y, streak_h, band)
+        glow_over(canvas, w, h, glow_box, (21, 123, 202, 25), 80, band)
+        img = canvas_to_image(canvas)
     else:
-        tw = 300
+        img = Image.new("RGBA", (w, h), (5, 4, 5, 255))
+        draw = ImageDraw.Draw(img)
+        for y in range(h):
+            ratio = y / h
+            v = int(5 + 6 * math.sin(ratio * math.pi))
+            draw.line([(0, y), (w, y)], fill=(v, v - 1, v + 2, 255))
+        
+        overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        overlay_draw = ImageDraw.Draw(overlay)
+        for x in range(w):
+            ratio = x / w
+            edge_fade = min(ratio, 1 - ratio) * 2
+            opacity = int((1 - edge_fade) * 40)
+            if opacity > 0:
+                overlay_draw.line([(x, 0), (x, h)], fill=(0, 0, 0, opacity))
+        img = Image.alpha_composite(img, overlay)
+        
+        streak = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        streak_draw = ImageDraw.Draw(streak)
+        for dy in range(streak_h):
+            dist = abs(dy - streak_h / 2) / (streak_h / 2)
+            opacity = int((1 - dist ** 2) * 120)
+            streak_draw.line([(w * 0.15, streak_y + dy), (w * 0.85, streak_y + dy)],
+                             fill=(226, 34, 41, opacity))
+        img = Image.alpha_composite(img, streak)
+        
+        blue_glow = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        bd = ImageDraw.Draw(blue_glow)
+        bd.ellipse(glow_box, fill=(21, 123, 202, 25))
+        blue_glow = blue_glow.filter(ImageFilter.GaussianBlur(radius=80))
+        img = Image.alpha_composite(img, blue_glow)
+    
+    draw = ImageDraw.Draw(img)
+    
+    font_brand = typo_font("wordmark", 52)
+    font_tag = typo_font("tagline", 18)
+    
+    brand_text = "iTrader.im"
+    tw = text_length(font_brand, brand_text)
     tx = (w - tw) / 2
-    ty = h * 0.38
+    ty = h * 0.38 - top
     
     draw.text((tx, ty), "iTrader", fill=(239, 240, 243, 255), font=font_brand)
-    im_offset = font_brand.getlength("iTrader") if hasattr(font_brand, 'getlength') else 220
+    im_offset = text_length(font_brand, "iTrader")
     draw.text((tx + im_offset, ty), ".im", fill=(226, 34, 41, 255), font=font_brand)
     
     tag = "BUY \u2022 SELL \u2022 UPGRADE"
-    if hasattr(font_tag, 'getlength'):
-        ttw = font_tag.getlength(tag)
-    else:
-        ttw = 200
-    draw.text(((w - ttw) / 2, h * 0.58), tag, fill=(207, 207, 212, 200), font=font_tag)
+    ttw = text_length(font_tag, tag)
+    draw.text(((w - ttw) / 2, h * 0.58 - top), tag, fill=(207, 207, 212, 200), font=font_tag)
     
     if variant == "listing":
-        draw.text((w * 0.1, h * 0.78), "LISTING DETAILS", fill=(183, 172, 170, 120), font=font_tag)
+        draw.text((w * 0.1, h * 0.78 - top), "LISTING DETAILS", fill=(183, 172, 170, 120), font=font_tag)
     elif variant == "categories":
-        draw.text((w * 0.1, h * 0.78), "BROWSE CATEGORIES", fill=(183, 172, 170, 120), font=font_tag)
+        draw.text((w * 0.1, h * 0.78 - top), "BROWSE CATEGORIES", fill=(183, 172, 170, 120), font=font_tag)
     
     return img
 
 
+# ---------------------------------------------------------------------------
+# BANDED BANNER RENDERING
+# ---------------------------------------------------------------------------
+# Banners too large to hold in memory whole (8K heroes, print sizes) are
+# drawn a horizontal band at a time and each band is filtered and deflated
+# into the PNG before the next is drawn. Peak memory then scales with the
+# band height, which is sized from a byte budget; the peak actually
+# traced is recorded for the build report.
+
+# Working set of the band pipeline per banner pixel: float canvas, RGBA
+# band and the five-way PNG filter search, measured with tracemalloc.
+BANNER_BYTES_PER_PIXEL = 210
+BANNER_MEMORY_BUDGET_MB = 512
+BANNER_MIN_BAND_ROWS = 16
+
+
+def banner_banded(w, h, budget_mb=BANNER_MEMORY_BUDGET_MB):
+    """Whether a ``w`` x ``h`` banner must be rendered in bands to stay within ``budget_mb``."""
+    return HAS_NUMPY and w * h * BANNER_BYTES_PER_PIXEL > budget_mb * 1024 * 1024
+
+
+def banner_band_rows(w, h, budget_mb=BANNER_MEMORY_BUDGET_MB):
+    """Rows per band that keep a ``w``-wide banner's working set within ``budget_mb``."""
+    rows = budget_mb * 1024 * 1024 // (w * BANNER_BYTES_PER_PIXEL)
+    return int(min(h, max(BANNER_MIN_BAND_ROWS, rows)))
+
+
+def encode_png_stream(width, height, bands, mode="RGB"):
+    """PNG bytes from ``bands``, an iterable of ``width``-wide images covering ``height`` rows top to bottom.
+
+    Each band is filtered (adaptive per row, as encode_png_search) and fed
+    to one deflate stream as it arrives, so no full-frame buffer exists.
+    """
+    channels = len(mode)
+    chunks = [PNG_SIGNATURE + png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8,
+                                                              PNG_COLOR_TYPES[mode], 0, 0, 0))]
+    compressor = zlib.compressobj(9)
+    previous = np.zeros((1, width * channels), dtype=np.uint8)
+    for band in bands:
+        with phase("encode"):
+            rows = np.asarray(band.convert(mode)).reshape(-1, width * channels)
+            residuals = png_filter_residuals(np.concatenate((previous, rows)), channels)[:, 1:]
+            data = compressor.compress(filter_png_rows(residuals, "adaptive").tobytes())
+            if data:
+                chunks.append(png_chunk(b"IDAT", data))
+        previous = rows[-1:]
+    chunks.append(png_chunk(b"IDAT", compressor.flush()))
+    chunks.append(png_chunk(b"IEND", b""))
+    return b"".join(chunks)
+
+
+def render_banner_bands(budget_mb, generator, *args):
+    """Render banner ``generator(*args, band=...)`` band by band into PNG bytes.
+
+    ``args`` end with the banner's width and height. Bands are sized by
+    banner_band_rows(); the tracemalloc peak of the job is recorded on the
+    build profile.
+    """
+    import tracemalloc
+    w, h = args[-2:]
+    rows = banner_band_rows(w, h, budget_mb)
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        def bands():
+            for top in range(0, h, rows):
+                with phase("rasterize", "pillow-banded"):
+                    band = generator(*args, band=(top, min(rows, h - top)))
+                yield band
+
+        # RGBA like the full-frame render: the drawn text leaves translucent pixels.
+        data = encode_png_stream(w, h, bands(), "RGBA")
+        profile_state().peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if started:
+            tracemalloc.stop()
+    return data
+
+
 # ---------------------------------------------------------------------------
 # FAVICON ICO GENERATION
 # ---------------------------------------------------------------------------
@@ -985,6 +1922,16 @@ def create_ico(images_dict, output_path):
     if not HAS_PILLOW:
         return
     
+    with open(output_path, 'wb') as f:
+        f.write(ico_bytes(images_dict))
+
+
+@profiled("encode")
+def ico_bytes(images_dict, png_effort=0):
+    """Encode a dict of {size: PIL.Image} as .ico file bytes.
+
+    Entries are re-encoded by optimize_png at ``png_effort`` (0 disables).
+    """
     sizes = sorted(images_dict.keys())
     entries = []
     image_data_list = []
@@ -994,7 +1941,7 @@ def create_ico(images_dict, output_path):
         img = images_dict[sz].convert("RGBA").resize((sz, sz), Image.LANCZOS)
         buf = BytesIO()
         img.save(buf, format="PNG")
-        png_data = buf.getvalue()
+        png_data = optimize_png(buf.getvalue(), png_effort, reduce=False)
         
         entry = struct.pack('<BBBBHHII',
                            sz if sz < 256 else 0,
@@ -1005,26 +1952,55 @@ def create_ico(images_dict, output_path):
         image_data_list.append(png_data)
         offset += len(png_data)
     
-    with open(output_path, 'wb') as f:
-        f.write(struct.pack('<HHH', 0, 1, len(sizes)))
-        for e in entries:
-            f.write(e)
-        for d in image_data_list:
-            f.write(d)
+    header = struct.pack('<HHH', 0, 1, len(sizes))
+    return header + b"".join(entries) + b"".join(image_data_list)
+
+
+def render_ico(svg_content, sizes, png_effort=0, reuse=None, outputs=None):
+    """Pack an SVG rasterized at each of ``sizes`` as .ico bytes.
+
+    ``svg_content`` may be a callable returning the SVG for a render size.
+    ``reuse`` maps ICO sizes to PNGs already rendered in ``outputs``, taken
+    as is when they match the size and downsampled when larger; other sizes
+    are rasterized by svg_to_pil(). ``png_effort`` is passed to ico_bytes.
+    Returns None if any size could not be rendered.
+    """
+    if not HAS_PILLOW:
+        return None
+    images = {}
+    sources = {}
+    for sz in sizes:
+        name = (reuse or {}).get(sz)
+        if name in (outputs or {}):
+            sources.setdefault(name, []).append(sz)
+            continue
+        pil_img = svg_to_pil(svg_content, sz, sz)
+        if pil_img:
+            images[sz] = pil_img
+    for name, source_sizes in sources.items():
+        source = Image.open(BytesIO(outputs[name])).convert("RGBA")
+        smaller = [sz for sz in source_sizes if sz != source.width]
+        images.update(downsample_pyramid(source, smaller) if smaller else {})
+        if len(smaller) < len(source_sizes):
+            images[source.width] = source
+    return ico_bytes(images, png_effort) if len(images) == len(sizes) else None
 
 
 # ---------------------------------------------------------------------------
 # CARBON FIBER PATTERN (PNG via Pillow)
 # ---------------------------------------------------------------------------
 
-def generate_carbon_fiber_png(size=256):
-    if not HAS_PILLOW:
-        return None
-    img = Image.new("RGBA", (size, size), (15, 13, 16, 255))
-    draw = ImageDraw.Draw(img)
-    cell = 8
-    for y in range(0, size, cell):
-        for x in range(0, size, cell):
+# Pixel densities emitted for the carbon texture (1x, @2x, @3x).
+CARBON_DENSITIES = (1, 2, 3)
+
+
+def carbon_fiber_unit(density=1):
+    """One repeat unit of the carbon weave: a 2x2 block of checker cells."""
+    cell = 8 * density
+    unit = Image.new("RGBA", (2 * cell, 2 * cell), (15, 13, 16, 255))
+    draw = ImageDraw.Draw(unit)
+    for y in range(0, 2 * cell, cell):
+        for x in range(0, 2 * cell, cell):
             checker = ((x // cell) + (y // cell)) % 2
             if checker == 0:
                 draw.rectangle([x, y, x + cell - 1, y + cell - 1],
@@ -1032,16 +2008,48 @@ def generate_carbon_fiber_png(size=256):
             else:
                 draw.rectangle([x, y, x + cell - 1, y + cell - 1],
                               fill=(12, 10, 14, 255))
-            draw.line([(x, y), (x + cell - 1, y)], fill=(25, 24, 28, 80))
-            draw.line([(x, y), (x, y + cell - 1)], fill=(25, 24, 28, 60))
+            draw.rectangle([x, y, x + cell - 1, y + density - 1], fill=(25, 24, 28, 80))
+            draw.rectangle([x, y, x + density - 1, y + cell - 1], fill=(25, 24, 28, 60))
+    return unit
+
+
+def tile_image(unit, width, height):
+    """Repeat ``unit`` across a ``width`` x ``height`` image, cropping the edges."""
+    uw, uh = unit.size
+    reps_x, reps_y = -(-width // uw), -(-height // uh)
+    if HAS_NUMPY:
+        tiled = np.tile(np.asarray(unit), (reps_y, reps_x, 1))[:height, :width]
+        return Image.fromarray(tiled, unit.mode)
+    img = Image.new(unit.mode, (width, height))
+    for ty in range(reps_y):
+        for tx in range(reps_x):
+            img.paste(unit, (tx * uw, ty * uh))
     return img
 
 
-def generate_glass_noise_png(size=256):
+def generate_carbon_fiber_png(size=256, density=1):
+    """Carbon weave texture ``size`` CSS pixels square at ``density`` x resolution."""
     if not HAS_PILLOW:
         return None
+    px = size * density
+    return tile_image(carbon_fiber_unit(density), px, px)
+
+
+def generate_glass_noise_png(size=256, seed=42):
+    """Grey grain tile with faint per-pixel alpha, deterministic for ``seed``.
+
+    Every pixel is drawn independently, so the tile has no spatial
+    correlation and repeats seamlessly at any ``size``.
+    """
+    if not HAS_PILLOW:
+        return None
+    if HAS_NUMPY:
+        rng = np.random.default_rng(seed)
+        v = rng.integers(0, 256, (size, size), dtype=np.uint8)
+        a = rng.integers(5, 26, (size, size), dtype=np.uint8)
+        return Image.fromarray(np.dstack((v, v, v, a)), "RGBA")
     import random
-    rng = random.Random(42)
+    rng = random.Random(seed)
     img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
     pixels = img.load()
     for y in range(size):
@@ -1052,77 +2060,1098 @@ def generate_glass_noise_png(size=256):
     return img
 
 
+# ---------------------------------------------------------------------------
+# SVG OPTIMIZATION
+# ---------------------------------------------------------------------------
+# Post-generation pass over the SVGs we ship. These files are inlined in
+# pages, so every byte counts: polygon outlines are refitted as cubic
+# Béziers within a pixel tolerance, numbers are rounded to the precision
+# the render size can show, default attributes are dropped and
+# inter-element whitespace is stripped.
+
+_NUMBER_RE = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_POLYGON_RE = re.compile(r"^M\s*([-\d.eE\s]+?)((?:\s*L\s*[-\d.eE]+\s+[-\d.eE]+)+)\s*Z$")
+_ATTR_RE = re.compile(r'\s([\w:-]+)="([^"]*)"')
+
+# Attributes holding geometry, rounded to the render-size precision.
+GEOMETRY_ATTRS = {"x", "y", "x1", "y1", "x2", "y2", "cx", "cy", "r", "rx", "ry", "width", "height",
+                  "transform", "stroke-width", "stroke-dasharray", "stdDeviation", "dx", "dy",
+                  "font-size", "letter-spacing", "viewBox"}
+# Unitless attributes rounded to a fixed precision.
+SCALAR_ATTRS = {"opacity", "stop-opacity", "flood-opacity", "fill-opacity", "stroke-opacity", "offset"}
+# Attribute values equal to the SVG initial value, safe to drop.
+DEFAULT_ATTRS = {("stop-opacity", "1"), ("opacity", "1"), ("fill-opacity", "1"),
+                 ("stroke-opacity", "1"), ("flood-opacity", "1")}
+
+
+def format_number(value, decimals):
+    """Shortest decimal form of ``value`` at ``decimals`` places ("0.50" -> ".5")."""
+    text = f"{value:.{decimals}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    if text.startswith("0.") and len(text) > 2:
+        text = text[1:]
+    elif text.startswith("-0.") and len(text) > 3:
+        text = "-" + text[2:]
+    return "0" if text in ("", "-0", "-") else text
+
+
+def round_numbers(text, decimals):
+    return _NUMBER_RE.sub(lambda m: format_number(float(m.group()), decimals), text)
+
+
+def coordinate_decimals(view_width, render_width, step_px=0.1):
+    """Decimal places needed to keep rounding error under ``step_px`` output pixels."""
+    units_per_px = view_width / render_width if render_width else 1
+    return max(0, -math.floor(math.log10(step_px * units_per_px)))
+
+
+def douglas_peucker(points, tolerance):
+    """Drop points closer than ``tolerance`` to the simplified polyline."""
+    if len(points) < 3:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        (x1, y1), (x2, y2) = points[first], points[last]
+        seg = math.hypot(x2 - x1, y2 - y1) or 1e-12
+        worst, index = 0.0, None
+        for i in range(first + 1, last):
+            px, py = points[i]
+            d = abs((x2 - x1) * (y1 - py) - (x1 - px) * (y2 - y1)) / seg
+            if d > worst:
+                worst, index = d, i
+        if index is not None and worst > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def _bezier_point(ctrl, t):
+    mt = 1 - t
+    a, b, c, d = mt * mt * mt, 3 * mt * mt * t, 3 * mt * t * t, t * t * t
+    return (a * ctrl[0][0] + b * ctrl[1][0] + c * ctrl[2][0] + d * ctrl[3][0],
+            a * ctrl[0][1] + b * ctrl[1][1] + c * ctrl[2][1] + d * ctrl[3][1])
+
+
+def _unit(vx, vy):
+    n = math.hypot(vx, vy) or 1e-12
+    return vx / n, vy / n
+
+
+def _fit_bezier(points, params, t1, t2):
+    """Least-squares cubic through ``points`` with fixed end tangents."""
+    p0, p3 = points[0], points[-1]
+    c00 = c01 = c11 = x0 = x1 = 0.0
+    for (px, py), u in zip(points, params):
+        mu = 1 - u
+        b0, b1, b2, b3 = mu ** 3, 3 * u * mu * mu, 3 * u * u * mu, u ** 3
+        a1 = (t1[0] * b1, t1[1] * b1)
+        a2 = (t2[0] * b2, t2[1] * b2)
+        c00 += a1[0] * a1[0] + a1[1] * a1[1]
+        c01 += a1[0] * a2[0] + a1[1] * a2[1]
+        c11 += a2[0] * a2[0] + a2[1] * a2[1]
+        rx = px - (p0[0] * (b0 + b1) + p3[0] * (b2 + b3))
+        ry = py - (p0[1] * (b0 + b1) + p3[1] * (b2 + b3))
+        x0 += a1[0] * rx + a1[1] * ry
+        x1 += a2[0] * rx + a2[1] * ry
+    det = c00 * c11 - c01 * c01
+    chord = math.hypot(p3[0] - p0[0], p3[1] - p0[1])
+    alpha1 = (x0 * c11 - c01 * x1) / det if abs(det) > 1e-12 else 0.0
+    alpha2 = (c00 * x1 - c01 * x0) / det if abs(det) > 1e-12 else 0.0
+    if alpha1 < 1e-6 * chord or alpha2 < 1e-6 * chord:
+        alpha1 = alpha2 = chord / 3
+    return (p0, (p0[0] + t1[0] * alpha1, p0[1] + t1[1] * alpha1),
+            (p3[0] + t2[0] * alpha2, p3[1] + t2[1] * alpha2), p3)
+
+
+def _fit_cubics(points, t1, t2, tolerance, out):
+    """Schneider's recursive cubic fit: split at the worst point until within tolerance."""
+    if len(points) == 2:
+        chord = math.hypot(points[1][0] - points[0][0], points[1][1] - points[0][1]) / 3
+        out.append((points[0], (points[0][0] + t1[0] * chord, points[0][1] + t1[1] * chord),
+                    (points[1][0] + t2[0] * chord, points[1][1] + t2[1] * chord), points[1]))
+        return
+    lengths = [0.0]
+    for (ax, ay), (bx, by) in zip(points, points[1:]):
+        lengths.append(lengths[-1] + math.hypot(bx - ax, by - ay))
+    total = lengths[-1] or 1e-12
+    params = [d / total for d in lengths]
+    ctrl = _fit_bezier(points, params, t1, t2)
+    worst, split = 0.0, len(points) // 2
+    for i, ((px, py), u) in enumerate(zip(points, params)):
+        bx, by = _bezier_point(ctrl, u)
+        d = math.hypot(bx - px, by - py)
+        if d > worst:
+            worst, split = d, i
+    if worst <= tolerance:
+        out.append(ctrl)
+        return
+    split = min(max(split, 1), len(points) - 2)
+    centre = _unit(points[split - 1][0] - points[split + 1][0], points[split - 1][1] - points[split + 1][1])
+    _fit_cubics(points[:split + 1], t1, centre, tolerance, out)
+    _fit_cubics(points[split:], (-centre[0], -centre[1]), t2, tolerance, out)
+
+
+def fit_polygon_cubics(points, tolerance, corner_deg=35):
+    """Refit a closed polygon as line and cubic segments, keeping corners sharp.
+
+    Each run between corners is encoded as whichever of a Douglas-Peucker
+    polyline or a cubic fit needs fewer coordinates. Segments are
+    ``(p0, p1)`` lines or ``(p0, c1, c2, p1)`` cubics.
+    """
+    n = len(points)
+    corners = []
+    for i in range(n):
+        (ax, ay), (bx, by), (cx, cy) = points[i - 1], points[i], points[(i + 1) % n]
+        turn = abs(math.degrees(math.atan2(cy - by, cx - bx) - math.atan2(by - ay, bx - ax)))
+        if min(turn, 360 - turn) > corner_deg:
+            corners.append(i)
+    if not corners:
+        corners = [0]
+    segments = []
+    for k, start in enumerate(corners):
+        end = corners[(k + 1) % len(corners)]
+        run = points[start:end + 1] if end > start else points[start:] + points[:end + 1]
+        if len(run) < 2:
+            continue
+        lines = douglas_peucker(run, tolerance)
+        cubics = []
+        if len(lines) > 2:
+            t1 = _unit(run[1][0] - run[0][0], run[1][1] - run[0][1])
+            t2 = _unit(run[-2][0] - run[-1][0], run[-2][1] - run[-1][1])
+            _fit_cubics(run, t1, t2, tolerance, cubics)
+        if cubics and 3 * len(cubics) < len(lines) - 1:
+            segments.extend(cubics)
+        else:
+            segments.extend(zip(lines, lines[1:]))
+    return segments
+
+
+def optimize_path_data(d, tolerance, decimals):
+    """Rewrite M/L/Z polygon path data as cubic Béziers; round anything else."""
+    match = _POLYGON_RE.match(d.strip())
+    if not match:
+        return round_numbers(d, decimals)
+    coords = [float(v) for v in _NUMBER_RE.findall(match.group(1) + " " + match.group(2))]
+    points = list(zip(coords[::2], coords[1::2]))
+    if len(points) < 8:
+        return round_numbers(d, decimals)
+    segments = fit_polygon_cubics(points, tolerance)
+    fmt = functools.partial(format_number, decimals=decimals)
+    parts = [f"M{fmt(segments[0][0][0])} {fmt(segments[0][0][1])}"]
+    for segment in segments:
+        command = "C" if len(segment) == 4 else "L"
+        parts.append(command + " ".join(fmt(v) for point in segment[1:] for v in point))
+    return "".join(parts) + "Z"
+
+
+@profiled("encode")
+def optimize_svg(svg, render_size=None, tolerance_px=0.1):
+    """Return a smaller equivalent of ``svg`` for display at ``render_size`` px wide.
+
+    ``render_size`` defaults to the document's declared width; geometry is
+    refitted within ``tolerance_px`` output pixels.
+    """
+    view_box = re.search(r'viewBox="([^"]+)"', svg)
+    view_width = float(view_box.group(1).split()[2]) if view_box else 0
+    if render_size is None:
+        declared = re.search(r'<svg[^>]*\swidth="([\d.]+)"', svg)
+        render_size = float(declared.group(1)) if declared else view_width
+    units_per_px = view_width / render_size if view_width and render_size else 1
+    decimals = coordinate_decimals(view_width or 1, render_size or 1)
+    tolerance = tolerance_px * units_per_px
+
+    def rewrite_attr(m):
+        name, value = m.group(1), m.group(2)
+        if (name, value) in DEFAULT_ATTRS:
+            return ""
+        if name == "d":
+            value = optimize_path_data(value, tolerance, decimals)
+        elif name in GEOMETRY_ATTRS:
+            value = round_numbers(value, decimals)
+        elif name in SCALAR_ATTRS:
+            value = round_numbers(value, 3)
+        return f' {name}="{value}"'
+
+    def rewrite_tag(m):
+        tag = re.sub(r"\s+", " ", m.group())
+        tag = _ATTR_RE.sub(rewrite_attr, tag)
+        return tag.replace(" />", "/>").replace(" >", ">")
+
+    svg = re.sub(r"<\?xml[^>]*\?>\s*", "", svg)
+    svg = re.sub(r"<!--.*?-->", "", svg, flags=re.S)
+    svg = re.sub(r"<[a-zA-Z][^>]*>", rewrite_tag, svg)
+    svg = re.sub(r">\s+<", "><", svg)
+    return svg.strip()
+
+
+# Decimal places kept by canonical_numbers().
+CANONICAL_DECIMALS = 6
+
+
+def canonical_numbers(text, decimals=CANONICAL_DECIMALS):
+    """Round numbers carrying more than ``decimals`` places, e.g. the float
+    noise in 15.560999999999998, so the bytes don't hinge on evaluation order."""
+    return re.sub(rf"-?\d+\.\d{{{decimals + 1},}}", lambda m: format_number(float(m.group()), decimals), text)
+
+
+def svg_job(optimize, canonical, tolerance_px, render_size, generator, *args):
+    """Generate an SVG and return its file bytes.
+
+    With ``optimize`` the result is ``(optimized bytes, original size)`` so
+    the build report can show the savings; ``canonical`` runs unoptimized
+    output through canonical_numbers (the optimizer rounds anyway).
+    """
+    with phase("generate"):
+        svg = generator(*args)
+    raw = svg.encode("utf-8")
+    if not optimize:
+        return canonical_numbers(svg).encode("utf-8") if canonical else raw
+    return optimize_svg(svg, render_size, tolerance_px).encode("utf-8"), len(raw)
+
+
+def text_job(generator, *args):
+    """Generate a text file and return its UTF-8 bytes."""
+    with phase("generate"):
+        return generator(*args).encode("utf-8")
+
+
 # ---------------------------------------------------------------------------
 # SVG to PNG CONVERSION
 # ---------------------------------------------------------------------------
 
+def cairo_svg2png(svg_content, width, height):
+    """Render with cairosvg."""
+    import cairosvg
+    return cairosvg.svg2png(bytestring=svg_content.encode("utf-8"), output_width=width, output_height=height)
+
+
 def svg_to_png(svg_content, width, height, output_path):
     """Convert SVG string to PNG file."""
-    if HAS_CAIRO:
+    png_data = render_svg_png(svg_content, width, height, label=output_path)
+    if png_data is None:
+        return False
+    with open(output_path, "wb") as f:
+        f.write(png_data)
+    return True
+
+
+def render_svg_png(svg_content, width, height, label="SVG"):
+    """Rasterize an SVG string to PNG bytes, or None if no backend succeeds."""
+    if has_cairo():
         try:
-            cairosvg.svg2png(bytestring=svg_content.encode("utf-8"),
-                            write_to=output_path,
-                            output_width=width,
-                            output_height=height)
-            return True
+            with phase("rasterize", "cairosvg"):
+                return cairo_svg2png(svg_content, width, height)
         except Exception as e:
-            print(f"  CairoSVG failed for {output_path}: {e}")
+            print(f"  CairoSVG failed for {label}: {e}")
     
     if HAS_PILLOW:
         try:
-            img = Image.new("RGBA", (width, height), (5, 4, 5, 255))
-            draw = ImageDraw.Draw(img)
-            draw.rectangle([width * 0.1, height * 0.1, width * 0.9, height * 0.9],
-                          fill=(18, 19, 24, 200))
-            try:
-                font = ImageFont.truetype("arial.ttf", max(12, width // 20))
-            except (OSError, IOError):
-                font = ImageFont.load_default()
-            draw.text((width * 0.15, height * 0.4), "iTrader.im",
-                     fill=(239, 240, 243, 255), font=font)
-            img.save(output_path, "PNG")
-            return True
+            with phase("rasterize", "pillow-placeholder"):
+                img = Image.new("RGBA", (width, height), (5, 4, 5, 255))
+                draw = ImageDraw.Draw(img)
+                draw.rectangle([width * 0.1, height * 0.1, width * 0.9, height * 0.9],
+                              fill=(18, 19, 24, 200))
+                font = typo_font("wordmark", max(12, width // 20))
+                draw.text((width * 0.15, height * 0.4), "iTrader.im",
+                         fill=(239, 240, 243, 255), font=font)
+            return encode_png(img)
         except Exception as e:
-            print(f"  Pillow fallback failed for {output_path}: {e}")
-    return False
+            print(f"  Pillow fallback failed for {label}: {e}")
+    return None
 
 
-def svg_to_pil(svg_content, width, height):
-    """Convert SVG to PIL Image object."""
-    if HAS_CAIRO:
-        try:
-            png_data = cairosvg.svg2png(bytestring=svg_content.encode("utf-8"),
-                                         output_width=width, output_height=height)
-            return Image.open(BytesIO(png_data)).convert("RGBA")
-        except Exception:
-            pass
-    if HAS_PILLOW:
-        img = Image.new("RGBA", (width, height), (5, 4, 5, 255))
-        return img
-    return None
+@profiled("encode")
+def encode_png(img):
+    """Encode a PIL image as PNG bytes."""
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
 
 
-# ---------------------------------------------------------------------------
-# WEBMANIFEST
-# ---------------------------------------------------------------------------
+@profiled("rasterize", "pillow-resample")
+def downsample_pyramid(master, sizes):
+    """Derive rasters ``sizes`` pixels wide from a larger ``master`` image,
+    keeping its aspect ratio.
 
-def generate_webmanifest():
-    return json.dumps({
-        "name": "iTrader.im",
-        "short_name": "iTrader",
-        "description": "BUY \u2022 SELL \u2022 UPGRADE - Isle of Man Marketplace",
-        "start_url": "/",
-        "display": "standalone",
-        "background_color": "#050405",
-        "theme_color": "#E22229",
-        "icons": [
-            {"src": "/favicon/android-chrome-192x192.png", "sizes": "192x192", "type": "image/png"},
-            {"src": "/favicon/android-chrome-512x512.png", "sizes": "512x512", "type": "image/png"},
-            {"src": "/favicon/icon.svg", "type": "image/svg+xml", "sizes": "any"}
-        ]
+    Works in premultiplied alpha so edges don't pick up dark fringes: each
+    level is halved with a 2x2 box filter while that stays at or above the
+    target, then a final Lanczos pass lands on the exact size.
+    """
+    current = master.convert("RGBa")
+    images = {}
+    for sz in sorted(sizes, reverse=True):
+        while current.width >= sz * 2:
+            current = current.reduce(2)
+        target = (sz, round(sz * master.height / master.width))
+        level = current if current.size == target else current.resize(target, Image.LANCZOS)
+        images[sz] = level.convert("RGBA")
+    return images
+
+
+def svg_for_size(svg_content, size):
+    """Resolve an SVG string, or a ``size -> SVG`` callable, for one render size."""
+    return svg_content(size) if callable(svg_content) else svg_content
+
+
+def render_generated_png(generator, gen_args, width, height):
+    """Generate an SVG and rasterize it to PNG bytes.
+
+    Without cairo, generators with a geometry scene are drawn from their
+    Shapes rather than the placeholder.
+    """
+    if not has_cairo():
+        img = geometry_image(generator, gen_args, width, height)
+        if img is not None:
+            return encode_png(img)
+    with phase("generate"):
+        svg = generator(*gen_args)
+    return render_svg_png(svg, width, height)
+
+
+def render_svg_target_png(svg_name, width, height, outputs):
+    """Rasterize the generated SVG target ``svg_name`` to PNG bytes."""
+    if svg_name not in outputs:
+        return None
+    return render_svg_png(outputs[svg_name].decode("utf-8"), width, height, label=svg_name)
+
+
+def downsample_png(master_name, width, outputs):
+    """Derive a ``width``-wide PNG from the already rendered target ``master_name``."""
+    if master_name not in outputs:
+        return None
+    master = Image.open(BytesIO(outputs[master_name])).convert("RGBA")
+    return encode_png(downsample_pyramid(master, [width])[width])
+
+
+def render_image_png(generator, *args):
+    """Call a Pillow-based generator and encode its image as PNG bytes."""
+    with phase("rasterize", "pillow"):
+        img = generator(*args)
+    return encode_png(img) if img else None
+
+
+@profiled("encode")
+def encode_webp(img):
+    """Encode a PIL image as lossless WebP bytes."""
+    buf = BytesIO()
+    img.save(buf, format="WEBP", lossless=True, method=6)
+    return buf.getvalue()
+
+
+def render_image_webp(generator, *args):
+    """Call a Pillow-based generator and encode its image as lossless WebP bytes."""
+    with phase("rasterize", "pillow"):
+        img = generator(*args)
+    return encode_webp(img) if img else None
+
+
+def svg_to_pil(svg_content, width, height):
+    """Rasterize an SVG to an RGBA PIL image, or None if no backend can.
+
+    ``svg_content`` may be a ``size -> SVG`` callable. Without cairo, a
+    functools.partial of a generator with a geometry scene (taking the
+    render size last) is drawn from its Shapes; anything else gives None
+    rather than a blank image.
+    """
+    if not HAS_PILLOW:
+        return None
+    if not has_cairo():
+        if isinstance(svg_content, functools.partial):
+            return geometry_image(svg_content.func, svg_content.args + (width,), width, height)
+        return None
+    with phase("generate"):
+        svg = svg_for_size(svg_content, width)
+    try:
+        with phase("rasterize", "cairosvg"):
+            png_data = cairo_svg2png(svg, width, height)
+            return Image.open(BytesIO(png_data)).convert("RGBA")
+    except Exception:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# GEOMETRY RASTERIZER (NumPy)
+# ---------------------------------------------------------------------------
+# Without cairo, generators that can describe their artwork as Shapes are
+# drawn straight from that geometry instead of the placeholder: polygons
+# are scan-converted with sub-scanline anti-aliasing, gradients evaluated
+# per pixel in objectBoundingBox space, glows and shadows blurred by the
+# glow engine and other filters approximated with box blurs, all
+# composited in premultiplied float RGBA.
+
+# Sub-scanlines sampled per pixel row by polygon_coverage().
+COVERAGE_SUBSAMPLES = 16
+
+
+def polygon_coverage(polygons, width, height, subsamples=COVERAGE_SUBSAMPLES):
+    """Anti-aliased nonzero coverage (0-1) of closed (N, 2) ``polygons`` on a pixel grid.
+
+    Every edge crossing of a sub-scanline adds its winding direction,
+    split between the two pixels either side of the crossing; a running
+    sum along each row then turns crossings into covered area. Holes are
+    contours wound opposite to their outline.
+    """
+    stride = width + 2
+    cells, weights = [], []
+    for poly in polygons:
+        x0, y0 = poly[:, 0], poly[:, 1]
+        x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+        first = np.clip(np.ceil(np.minimum(y0, y1) * subsamples - 0.5), 0, height * subsamples).astype(np.int64)
+        last = np.clip(np.ceil(np.maximum(y0, y1) * subsamples - 0.5), 0, height * subsamples).astype(np.int64)
+        counts = last - first
+        if not counts.any():
+            continue
+        edge = np.repeat(np.arange(len(poly)), counts)
+        line = first[edge] + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        t = ((line + 0.5) / subsamples - y0[edge]) / (y1[edge] - y0[edge])
+        x = np.clip(x0[edge] + t * (x1[edge] - x0[edge]), 0, width)
+        col = np.floor(x).astype(np.int64)
+        frac = x - col
+        direction = np.sign(y1 - y0)[edge]
+        cell = line // subsamples * stride + col
+        cells += [cell, cell + 1]
+        weights += [direction * (1 - frac), direction * frac]
+    if not cells:
+        return np.zeros((height, width), dtype=np.float32)
+    acc = np.bincount(np.concatenate(cells), np.concatenate(weights), minlength=height * stride)
+    cover = np.cumsum(acc.reshape(height, stride), axis=1)[:, :width] / subsamples
+    return np.minimum(np.abs(cover), 1).astype(np.float32)
+
+
+def box_blur_sizes(sigma, passes=3):
+    """Odd box widths whose ``passes`` successive blurs approximate a Gaussian of ``sigma``."""
+    ideal = math.sqrt(12 * sigma * sigma / passes + 1)
+    lower = int(ideal) - (int(ideal) % 2 == 0)
+    wide = round((12 * sigma * sigma - passes * lower * lower - 4 * passes * lower - 3 * passes)
+                 / (-4 * lower - 4))
+    return [lower if i < wide else lower + 2 for i in range(passes)]
+
+
+def box_blur_axis(a, radius, axis):
+    """Mean over a 2 * ``radius`` + 1 window along ``axis``, treating outside as zero."""
+    pad = [(0, 0)] * a.ndim
+    pad[axis] = (radius + 1, radius)
+    total = np.cumsum(np.pad(a, pad), axis=axis, dtype=np.float64)
+    n = a.shape[axis]
+    upper = np.take(total, np.arange(2 * radius + 1, 2 * radius + 1 + n), axis=axis)
+    lower = np.take(total, np.arange(n), axis=axis)
+    return ((upper - lower) / (2 * radius + 1)).astype(np.float32)
+
+
+def gaussian_blur_np(a, sigma):
+    """Blur the two leading axes of ``a`` with three box passes per axis."""
+    for width in box_blur_sizes(sigma):
+        if width > 1:
+            a = box_blur_axis(box_blur_axis(a, width // 2, 0), width // 2, 1)
+    return a
+
+
+def translate_np(a, dx, dy):
+    """Shift the two leading axes of ``a`` by (dx, dy) pixels, bilinear, zero filled."""
+    for axis, d in ((1, dx), (0, dy)):
+        whole = math.floor(d)
+        frac = d - whole
+        shifted = []
+        for step in (whole, whole + 1):
+            out = np.zeros_like(a)
+            n = a.shape[axis]
+            src = slice(max(0, -step), max(0, n - step))
+            dst = slice(max(0, step), max(0, n + step))
+            index = [slice(None)] * a.ndim
+            out[tuple(index[:axis] + [dst])] = a[tuple(index[:axis] + [src])]
+            shifted.append(out)
+        a = shifted[0] * (1 - frac) + shifted[1] * frac
+    return a
+
+
+def gradient_rgba(grad, u, v):
+    """Straight-alpha RGBA (0-1) of gradient spec ``grad`` at bounding-box coordinates (u, v)."""
+    if grad["type"] == "linear":
+        # Same endpoints as svg_gradient_def, including its rounding.
+        rad = math.radians(grad.get("angle", 0))
+        x1, y1 = round(50 - 50 * math.cos(rad), 1) / 100, round(50 - 50 * math.sin(rad), 1) / 100
+        x2, y2 = round(50 + 50 * math.cos(rad), 1) / 100, round(50 + 50 * math.sin(rad), 1) / 100
+        dx, dy = x2 - x1, y2 - y1
+        t = ((u - x1) * dx + (v - y1) * dy) / (dx * dx + dy * dy)
+    else:
+        t = np.hypot(u - 0.5, v - 0.5) / 0.5
+    offsets = [s["position"] / 100 for s in grad["stops"]]
+    channels = list(zip(*[[c / 255 for c in ImageColor.getrgb(s["color"])[:3]] + [s.get("opacity", 1)]
+                          for s in grad["stops"]]))
+    return np.stack([np.interp(t, offsets, ch) for ch in channels], axis=-1).astype(np.float32)
+
+
+def rounded_rect_points_np(x, y, w, h, r, scale):
+    """Outline of a rounded rectangle in view space, corners flattened within ARC_TOLERANCE_PX."""
+    r = max(0, min(r, w / 2, h / 2))
+    n = max(2, math.ceil(math.pi / 4 * math.sqrt(r * max(scale) / (2 * ARC_TOLERANCE_PX))))
+    t = np.radians(np.linspace(0, 90, n + 1))
+    corners = [(x + w - r, y + h - r), (x + r, y + h - r), (x + r, y + r), (x + w - r, y + r)]
+    return np.concatenate([np.column_stack((cx + r * np.cos(t + i * math.pi / 2), cy + r * np.sin(t + i * math.pi / 2)))
+                           for i, (cx, cy) in enumerate(corners)])
+
+
+def shape_polygons(shape, scale):
+    """Pixel-space polygons of ``shape``: [(fill polygons, paint), (stroke polygons, paint)]."""
+    sx, sy = scale
+    if shape.kind == "arc":
+        outer, inner = tapered_arc_outline(*shape.geometry)
+        fill = [np.concatenate((outer, inner[::-1]))]
+        stroke_rings = []
+    elif shape.kind == "rect":
+        x, y, w, h, r = shape.geometry
+        half = (shape.stroke_width or 0) / 2 if shape.stroke else 0
+        fill = [rounded_rect_points_np(x, y, w, h, r, scale)]
+        stroke_rings = [rounded_rect_points_np(x - half, y - half, w + 2 * half, h + 2 * half, r + half, scale),
+                        rounded_rect_points_np(x + half, y + half, w - 2 * half, h - 2 * half, r - half, scale)[::-1]]
+    else:
+        cx, cy, rx, ry, rot = shape.geometry
+        half = (shape.stroke_width or 0) / 2 if shape.stroke else 0
+        radius = (max(rx, ry) + half) * max(sx, sy)
+        n = max(16, math.ceil(math.pi * math.sqrt(radius / (2 * ARC_TOLERANCE_PX))))
+        t = np.arange(n) * 360 / n
+        px, py = ellipse_points_np(cx, cy, rx, ry, rot, t)
+        nx, ny = ellipse_normals_np(rx, ry, rot, t)
+        fill = [np.column_stack((px, py))]
+        stroke_rings = [np.column_stack((px + nx * half, py + ny * half)),
+                        np.column_stack((px - nx * half, py - ny * half))[::-1]]
+    parts = []
+    if shape.fill:
+        parts.append(([p * (sx, sy) for p in fill], shape.fill))
+    if shape.stroke:
+        parts.append(([p * (sx, sy) for p in stroke_rings], shape.stroke))
+    return parts
+
+
+def shape_paint(shape, paint, xs, ys):
+    """Straight-alpha RGBA of ``paint`` at view-space points, an (4,) or (h, w, 4) array.
+
+    Gradients use the shape's objectBoundingBox: the unrotated ellipse box,
+    the rectangle itself, or the outline's extent for arcs.
+    """
+    if not isinstance(paint, tuple):
+        return np.array([c / 255 for c in ImageColor.getrgb(paint)[:3]] + [1], dtype=np.float32)
+    if shape.kind == "arc":
+        outer, inner = tapered_arc_outline(*shape.geometry)
+        points = np.concatenate((outer, inner))
+        (bx, by), (bx1, by1) = points.min(axis=0), points.max(axis=0)
+        lx, ly = xs, ys
+    elif shape.kind == "rect":
+        x, y, w, h, _ = shape.geometry
+        bx, by, bx1, by1 = x, y, x + w, y + h
+        lx, ly = xs, ys
+    else:
+        cx, cy, rx, ry, rot = shape.geometry
+        c, s = math.cos(math.radians(rot)), math.sin(math.radians(rot))
+        lx = (xs - cx) * c + (ys - cy) * s + cx
+        ly = (ys - cy) * c - (xs - cx) * s + cy
+        bx, by, bx1, by1 = cx - rx, cy - ry, cx + rx, cy + ry
+    return gradient_rgba(paint[1], (lx - bx) / (bx1 - bx), (ly - by) / (by1 - by))
+
+
+def rasterize_shape(canvas, shape, scale):
+    """Paint one Shape onto premultiplied float ``canvas`` (h, w, 4) in place."""
+    sx, sy = scale
+    height, width = canvas.shape[:2]
+    parts = shape_polygons(shape, scale)
+    if not parts:
+        return
+    effect = shape.effect[1:] if shape.effect else (None, ())
+    kind, args = effect
+    if kind == "glow":
+        flood, blur, _, flood_opacity = args
+        dx = dy = 0
+    elif kind == "shadow":
+        dx, dy, blur, flood, flood_opacity = args
+    elif kind == "blur":
+        blur, = args
+    sigma = blur / 2 * (sx + sy) / 2 if kind else 0
+    offset = (dx * sx, dy * sy) if kind in ("glow", "shadow") else (0, 0)
+    margin = math.ceil(3 * sigma + max(map(abs, offset))) + 1 if kind else 1
+
+    points = np.concatenate([p for polys, _ in parts for p in polys])
+    x0 = max(math.floor(points[:, 0].min()) - margin, -margin if kind else 0)
+    y0 = max(math.floor(points[:, 1].min()) - margin, -margin if kind else 0)
+    x1 = min(math.ceil(points[:, 0].max()) + margin, width + margin if kind else width)
+    y1 = min(math.ceil(points[:, 1].max()) + margin, height + margin if kind else height)
+    if x1 <= max(x0, 0) or y1 <= max(y0, 0) or x0 >= width or y0 >= height:
+        return
+    w, h = x1 - x0, y1 - y0
+
+    xs = ((x0 + np.arange(w) + 0.5) / sx)[None, :]
+    ys = ((y0 + np.arange(h) + 0.5) / sy)[:, None]
+    src = None
+    for polys, paint in parts:
+        coverage = polygon_coverage([p - (x0, y0) for p in polys], w, h)
+        rgba = shape_paint(shape, paint, xs, ys)
+        layer = np.empty((h, w, 4), dtype=np.float32)
+        layer[..., 3] = coverage * rgba[..., 3]
+        layer[..., :3] = rgba[..., :3] * layer[..., 3:]
+        src = layer if src is None else layer + src * (1 - layer[..., 3:])
+
+    if kind == "blur":
+        src = gaussian_blur_np(src, sigma)
+    elif kind:
+        shadow = translate_np(blur_coverage(src[..., 3], sigma), *offset) * flood_opacity
+        flood_rgb = np.array([c / 255 for c in ImageColor.getrgb(flood)[:3]] + [1], dtype=np.float32)
+        src += flood_rgb * (shadow * (1 - src[..., 3]))[..., None]
+    src *= shape.opacity
+
+    cx0, cy0 = max(x0, 0), max(y0, 0)
+    cx1, cy1 = min(x1, width), min(y1, height)
+    part = src[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0]
+    region = canvas[cy0:cy1, cx0:cx1]
+    region *= 1 - part[..., 3:]
+    region += part
+
+
+def rasterize_shapes(shapes, view_w, view_h, width, height, clip=None):
+    """Draw Shapes laid out on a ``view_w`` x ``view_h`` viewBox as a ``width`` x ``height`` RGBA image.
+
+    ``clip`` is an optional Shape whose fill outline clips the drawing, like
+    a clip-path on the group holding ``shapes``.
+    """
+    scale = (width / view_w, height / view_h)
+    canvas = np.zeros((height, width, 4), dtype=np.float32)
+    for shape in shapes:
+        rasterize_shape(canvas, shape, scale)
+    if clip is not None:
+        canvas *= polygon_coverage(shape_polygons(clip, scale)[0][0], width, height)[..., None]
+    alpha = canvas[..., 3:]
+    rgb = np.divide(canvas[..., :3], alpha, out=np.zeros_like(canvas[..., :3]), where=alpha > 0)
+    rgba = np.clip(np.rint(np.concatenate((rgb, alpha), axis=2) * 255), 0, 255).astype(np.uint8)
+    return Image.fromarray(rgba, "RGBA")
+
+
+def offset_shape(shape, dx, dy):
+    """``shape`` moved by (dx, dy); every kind's geometry starts with its anchor point."""
+    x, y, *rest = shape.geometry
+    return Shape(shape.kind, (x + dx, y + dy, *rest), shape.fill, shape.stroke, shape.stroke_width,
+                 shape.opacity, shape.effect)
+
+
+def vortex_icon_scene(size, variant="core", with_glow=True, render_size=None):
+    """generate_vortex_icon_svg as (view width, view height, shapes, clip)."""
+    return size, size, vortex_icon_shapes(size, variant, with_glow, render_size), None
+
+
+def app_icon_scene(app_variant, app_size=1024):
+    """generate_app_icon_svg as (view width, view height, shapes, clip), or None for the text monogram."""
+    if app_variant != "vortexOnly":
+        return None
+    background, border = app_icon_container_shapes(app_size)
+    icon_size, x, y = app_icon_placement(app_size)
+    icon = [offset_shape(shape, x, y) for shape in vortex_icon_shapes(icon_size, "core", with_glow=True)]
+    return app_size, app_size, [background, border] + icon, background
+
+
+# Generators with a Shape description, by name: the scene builder takes the
+# generator's arguments and may return None when that output has no scene.
+GEOMETRY_SCENES = {
+    "generate_vortex_icon_svg": vortex_icon_scene,
+    "generate_app_icon_svg": app_icon_scene,
+}
+
+
+def geometry_image(generator, gen_args, width, height):
+    """Rasterize ``generator(*gen_args)`` from its Shapes, or None if it has no scene."""
+    scene = GEOMETRY_SCENES.get(generator.__name__)
+    if scene is None or not (HAS_NUMPY and HAS_PILLOW):
+        return None
+    with phase("generate"):
+        layout = scene(*gen_args)
+    if layout is None:
+        return None
+    view_w, view_h, shapes, clip = layout
+    with phase("rasterize", "numpy-geometry"):
+        return rasterize_shapes(shapes, view_w, view_h, width, height, clip)
+
+
+# ---------------------------------------------------------------------------
+# PNG OPTIMIZATION
+# ---------------------------------------------------------------------------
+# Lossless re-encoding of rendered PNGs. Opaque or grey images drop unused
+# channels, flat artwork (favicons, monochrome icons, badges) moves to a
+# palette, and each candidate is written with the smallest of several row
+# filter / zlib settings. The smallest encoding wins, original included,
+# and decodes to the same RGBA pixels. --png-near-lossless also admits a
+# quantized palette that is off by a few levels per channel.
+
+# Largest per-channel error accepted from near-lossless palette quantization.
+NEAR_LOSSLESS_MAX_ERROR = 3
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_COLOR_TYPES = {"L": 0, "RGB": 2, "P": 3, "LA": 4, "RGBA": 6}
+# Filter strategies tried per effort level: none and per-row adaptive cover
+# flat artwork and gradients respectively; effort 3 tries everything.
+PNG_FILTERS = {2: (0, "adaptive"), 3: (0, 1, 2, 3, 4, "adaptive")}
+
+
+def png_chunk(tag, payload):
+    body = tag + payload
+    return struct.pack(">I", len(payload)) + body + struct.pack(">I", zlib.crc32(body))
+
+
+def png_filter_residuals(rows, bpp):
+    """Residuals of a (height, stride) uint8 array under PNG filter types 0-4, stacked."""
+    x = rows.astype(np.int16)
+    left = np.zeros_like(x)
+    left[:, bpp:] = x[:, :-bpp]
+    up = np.zeros_like(x)
+    up[1:] = x[:-1]
+    up_left = np.zeros_like(x)
+    up_left[1:, bpp:] = x[:-1, :-bpp]
+    p = left + up - up_left
+    pa, pb, pc = np.abs(p - left), np.abs(p - up), np.abs(p - up_left)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+    predictors = (left, up, (left + up) >> 1, paeth)
+    return np.stack([rows] + [(x - pred).astype(np.uint8) for pred in predictors])
+
+
+def filter_png_rows(residuals, method):
+    """Filtered scanlines, each prefixed with its filter type.
+
+    ``method`` is a PNG filter type 0-4, or "adaptive" to pick per row the
+    filter with the smallest sum of absolute signed residuals.
+    """
+    height, stride = residuals.shape[1:]
+    if method == "adaptive":
+        cost = np.abs(residuals.view(np.int8).astype(np.int32)).sum(axis=2)
+        choice = cost.argmin(axis=0)
+        filtered = residuals[choice, np.arange(height)]
+    else:
+        choice = method
+        filtered = residuals[method]
+    out = np.empty((height, stride + 1), dtype=np.uint8)
+    out[:, 0] = choice
+    out[:, 1:] = filtered
+    return out
+
+
+def pack_png_rows(indices, bit_depth):
+    """Pack a (height, width) array of palette indices into ``bit_depth``-bit rows."""
+    if bit_depth == 8:
+        return indices.astype(np.uint8)
+    per_byte = 8 // bit_depth
+    h, w = indices.shape
+    padded = np.zeros((h, -(-w // per_byte) * per_byte), dtype=np.uint8)
+    padded[:, :w] = indices
+    groups = padded.reshape(h, -1, per_byte)
+    shifts = np.arange(per_byte - 1, -1, -1, dtype=np.uint8) * bit_depth
+    return (groups << shifts).sum(axis=2, dtype=np.uint16).astype(np.uint8)
+
+
+def encode_png_search(img, effort=2):
+    """Encode ``img`` under each filter (and at effort 3, zlib strategy), keeping the smallest."""
+    w, h = img.size
+    palette = trns = None
+    if img.mode == "P":
+        colors = np.asarray(img.getpalette("RGBA"), dtype=np.uint8).reshape(-1, 4)
+        indices = np.asarray(img)
+        count = int(indices.max()) + 1
+        bit_depth = next(d for d in (1, 2, 4, 8) if count <= 1 << d)
+        rows, bpp = pack_png_rows(indices, bit_depth), 1
+        palette = colors[:count, :3].tobytes()
+        alpha = colors[:count, 3]
+        opaque_tail = np.flatnonzero(alpha != 255)
+        if opaque_tail.size:
+            trns = alpha[:opaque_tail[-1] + 1].tobytes()
+    else:
+        bit_depth = 8
+        pixels = np.asarray(img)
+        bpp = pixels.shape[2] if pixels.ndim == 3 else 1
+        rows = pixels.reshape(h, w * bpp)
+
+    header = PNG_SIGNATURE + png_chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, bit_depth,
+                                                            PNG_COLOR_TYPES[img.mode], 0, 0, 0))
+    if palette is not None:
+        header += png_chunk(b"PLTE", palette)
+    if trns is not None:
+        header += png_chunk(b"tRNS", trns)
+    strategies = [zlib.Z_DEFAULT_STRATEGY]
+    if effort >= 3:
+        strategies += [zlib.Z_FILTERED, zlib.Z_RLE]
+    best = None
+    residuals = png_filter_residuals(rows, bpp)
+    for method in PNG_FILTERS[min(effort, 3)]:
+        raw = filter_png_rows(residuals, method).tobytes()
+        for strategy in strategies:
+            compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+            idat = compressor.compress(raw) + compressor.flush()
+            if best is None or len(idat) < len(best):
+                best = idat
+    return header + png_chunk(b"IDAT", best) + png_chunk(b"IEND", b"")
+
+
+def reduce_png_mode(img):
+    """Drop channels that carry no information: opaque alpha and equal RGB."""
+    img = img.convert("RGBA") if img.mode not in ("RGBA", "RGB", "LA", "L") else img
+    if img.mode in ("RGBA", "LA") and img.getchannel("A").getextrema() == (255, 255):
+        img = img.convert(img.mode[:-1])
+    if img.mode in ("RGB", "RGBA"):
+        r, g, b = img.getchannel("R"), img.getchannel("G"), img.getchannel("B")
+        if r.tobytes() == g.tobytes() == b.tobytes():
+            img = img.convert("LA" if img.mode == "RGBA" else "L")
+    return img
+
+
+def palette_candidate(img, max_error=0):
+    """Exact palette version of ``img`` if it has at most 256 colours, else
+    (with ``max_error`` above 0) a quantized one off by at most that much
+    per channel, else None."""
+    rgba = img.convert("RGBA")
+    colors = rgba.getcolors(256)
+    if colors is not None:
+        # Translucent entries first keeps the tRNS chunk short.
+        ordered = sorted((c for _, c in colors), key=lambda c: (c[3] == 255, c))
+        lookup = {c: i for i, c in enumerate(ordered)}
+        if HAS_NUMPY:
+            pixels = np.asarray(rgba).reshape(-1, 4)
+            packed = pixels.astype(np.uint32) @ np.array([1 << 24, 1 << 16, 1 << 8, 1], dtype=np.uint32)
+            unique, inverse = np.unique(packed, return_inverse=True)
+            rank = np.array([lookup[(u >> 24, u >> 16 & 255, u >> 8 & 255, u & 255)]
+                             for u in unique.tolist()], dtype=np.uint8)
+            indexed = Image.fromarray(rank[inverse].reshape(rgba.size[1], rgba.size[0]), "P")
+        else:
+            indexed = Image.new("P", rgba.size)
+            indexed.putdata([lookup[c] for c in rgba.getdata()])
+        indexed.putpalette([v for c in ordered for v in c], rawmode="RGBA")
+        return indexed
+    if max_error <= 0 or not HAS_NUMPY:
+        return None
+    quantized = rgba.quantize(256, method=Image.Quantize.FASTOCTREE)
+    error = np.abs(np.asarray(quantized.convert("RGBA"), dtype=np.int16) - np.asarray(rgba, dtype=np.int16))
+    return quantized if error.max() <= max_error else None
+
+
+@profiled("encode")
+def optimize_png(data, effort=2, reduce=True, max_error=0):
+    """Return the smallest lossless re-encoding of PNG ``data``.
+
+    effort 1 re-saves through Pillow at zlib level 9; 2 adds the filter
+    search; 3 tries every filter and alternative zlib strategies.
+    ``reduce=False`` keeps the colour type, for ICO entries that must stay
+    32-bit RGBA. ``max_error`` above 0 also tries a quantized palette off
+    by at most that much per channel (see palette_candidate).
+    """
+    if not HAS_PILLOW or effort <= 0:
+        return data
+    img = Image.open(BytesIO(data))
+    img.load()
+    candidates = [reduce_png_mode(img) if reduce else img]
+    if reduce:
+        indexed = palette_candidate(img, max_error)
+        if indexed is not None:
+            candidates.append(indexed)
+    best = data
+    for candidate in candidates:
+        if effort >= 2 and HAS_NUMPY:
+            encoded = encode_png_search(candidate, effort)
+        else:
+            buf = BytesIO()
+            candidate.save(buf, format="PNG", optimize=True)
+            encoded = buf.getvalue()
+        if len(encoded) < len(best):
+            best = encoded
+    return best
+
+
+def optimize_png_job(effort, max_error, fn, *args):
+    """Run render job ``fn`` and optimize its PNG output, returning ``(bytes, original_size)``."""
+    data = fn(*args)
+    if data is None:
+        return None
+    return optimize_png(data, effort, max_error=max_error), len(data)
+
+
+# ---------------------------------------------------------------------------
+# MODERN IMAGE FORMATS (WebP / AVIF)
+# ---------------------------------------------------------------------------
+# Lossy siblings of the banner PNGs, served through <picture>. Each is
+# encoded at the lowest quality whose SSIM against the PNG master stays
+# at or above a target, found by bisection over QUALITY_RANGE.
+
+# Format name -> (Pillow encoder, MIME type, encoder options).
+MODERN_FORMATS = {
+    "avif": ("AVIF", "image/avif", {}),
+    "webp": ("WEBP", "image/webp", {"method": 4}),
+}
+QUALITY_RANGE = (30, 95)
+# Quality used when NumPy is missing and SSIM cannot be measured.
+FALLBACK_QUALITY = 80
+SSIM_TARGET = 0.99
+
+
+def supported_formats(names):
+    """The entries of ``names`` this Pillow build can encode."""
+    return [n for n in names if HAS_PILLOW and features.check(n)]
+
+
+def _box_mean(x, k):
+    """Mean over every k x k window of a 2-D array (valid region only)."""
+    s = np.pad(x, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    return (s[k:, k:] - s[:-k, k:] - s[k:, :-k] + s[:-k, :-k]) / (k * k)
+
+
+def ssim(a, b, window=8):
+    """Mean structural similarity of two equally sized 2-D 8-bit arrays."""
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    a = a.astype(np.float64)
+    b = b.astype(np.float64)
+    mu_a, mu_b = _box_mean(a, window), _box_mean(b, window)
+    var_a = _box_mean(a * a, window) - mu_a * mu_a
+    var_b = _box_mean(b * b, window) - mu_b * mu_b
+    cov = _box_mean(a * b, window) - mu_a * mu_b
+    score = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(score.mean())
+
+
+def perceptual_planes(img):
+    """Planes compared by SSIM: luma, plus alpha when the image has any."""
+    planes = [np.asarray(img.convert("L"))]
+    if img.mode == "RGBA" and img.getchannel("A").getextrema()[0] < 255:
+        planes.append(np.asarray(img.getchannel("A")))
+    return planes
+
+
+def encode_lossy(img, fmt, quality):
+    encoder, _, options = MODERN_FORMATS[fmt]
+    buf = BytesIO()
+    img.save(buf, format=encoder, quality=quality, **options)
+    return buf.getvalue()
+
+
+@profiled("encode")
+def encode_perceptual(img, fmt, target=SSIM_TARGET):
+    """Encode ``img`` as ``fmt`` at the lowest quality scoring at least ``target`` SSIM.
+
+    Returns ``(bytes, quality)``; when no quality in QUALITY_RANGE reaches
+    the target the top of the range is used.
+    """
+    if not HAS_NUMPY:
+        return encode_lossy(img, fmt, FALLBACK_QUALITY), FALLBACK_QUALITY
+    img = img.convert("RGBA")
+    master = perceptual_planes(img)
+    lo, hi = QUALITY_RANGE
+    best = None
+    while lo <= hi:
+        quality = (lo + hi) // 2
+        data = encode_lossy(img, fmt, quality)
+        decoded = Image.open(BytesIO(data)).convert("RGBA")
+        score = min(ssim(m, d) for m, d in zip(master, perceptual_planes(decoded)))
+        if score >= target:
+            best, hi = (data, quality), quality - 1
+        else:
+            lo = quality + 1
+    return best or (encode_lossy(img, fmt, QUALITY_RANGE[1]), QUALITY_RANGE[1])
+
+
+def render_image_perceptual(fmt, target, generator, *args):
+    """Call a Pillow-based generator and encode its image via encode_perceptual."""
+    with phase("rasterize", "pillow"):
+        img = generator(*args)
+    return encode_perceptual(img, fmt, target)[0] if img else None
+
+
+def image_formats_manifest(images, outputs):
+    """JSON manifest of every format written for each banner, best first.
+
+    ``images`` holds ``(stem, width, height, names)`` with ``stem`` the
+    target name without extension; ``outputs`` maps target names to their
+    bytes, so failed renders are left out.
+    """
+    mime = {fmt: spec[1] for fmt, spec in MODERN_FORMATS.items()}
+    mime["png"] = "image/png"
+    entries = {}
+    for stem, w, h, names in images:
+        sources = [{"type": mime[Path(name).suffix[1:]], "src": f"/{name}", "bytes": len(outputs[name])}
+                   for name in names if name in outputs]
+        if sources:
+            entries[stem] = {"width": w, "height": h, "sources": sources}
+    return json.dumps(entries, indent=2).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# RESPONSIVE DERIVATIVES
+# ---------------------------------------------------------------------------
+# Narrower copies of the category hero banners for srcset, downsampled
+# from the full-size render, plus manifests the next/image loader reads.
+
+SRCSET_WIDTHS = (480, 768, 1024, 1440, 1920)
+
+
+def srcset_manifest(banners, outputs):
+    """Map each banner to its widths, smallest first.
+
+    ``banners`` holds ``(name, [(width, height, target), ...])``; targets
+    missing from ``outputs`` (failed renders) are left out.
+    """
+    manifest = {}
+    for name, variants in banners:
+        manifest[name] = [{"width": w, "height": h, "bytes": len(outputs[target]), "src": f"/{target}"}
+                          for w, h, target in sorted(variants) if target in outputs]
+    return manifest
+
+
+def srcset_manifest_ts(manifest):
+    """TypeScript module exporting ``manifest`` for the next/image loader."""
+    return ("// Generated by scripts/generate-brand-assets.py. Do not edit.\n\n"
+            "export interface SrcsetVariant {\n"
+            "  width: number;\n"
+            "  height: number;\n"
+            "  bytes: number;\n"
+            "  src: string;\n"
+            "}\n\n"
+            "export const categorySrcset: Record<string, readonly SrcsetVariant[]> = "
+            f"{json.dumps(manifest, indent=2)};\n")
+
+
+def srcset_manifest_file(fmt, banners, outputs):
+    """``srcset_manifest`` as JSON (``fmt="json"``) or TypeScript file bytes."""
+    manifest = srcset_manifest(banners, outputs)
+    text = json.dumps(manifest, indent=2) if fmt == "json" else srcset_manifest_ts(manifest)
+    return text.encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# WEBMANIFEST
+# ---------------------------------------------------------------------------
+
+def generate_webmanifest():
+    return json.dumps({
+        "name": "iTrader.im",
+        "short_name": "iTrader",
+        "description": "BUY \u2022 SELL \u2022 UPGRADE - Isle of Man Marketplace",
+        "start_url": "/",
+        "display": "standalone",
+        "background_color": "#050405",
+        "theme_color": "#E22229",
+        "icons": [
+            {"src": "/favicon/android-chrome-192x192.png", "sizes": "192x192", "type": "image/png"},
+            {"src": "/favicon/android-chrome-512x512.png", "sizes": "512x512", "type": "image/png"},
+            {"src": "/favicon/icon.svg", "type": "image/svg+xml", "sizes": "any"}
+        ]
     }, indent=2)
 
 
+def generate_usage_guidelines():
+    """Plain-text brand usage guidelines shipped in legal/."""
+    return ("iTrader.im Brand Usage Guidelines\n"
+            + "=" * 40 + "\n\n"
+            "1. Always use official logo files from this package.\n"
+            "2. Maintain minimum clear space around the logo.\n"
+            "3. Do not alter colors, proportions, or effects.\n"
+            "4. Use dark variants on dark backgrounds, light variants on light backgrounds.\n"
+            "5. The vortex icon may be used standalone at sizes >= 32px.\n"
+            f"6. Primary brand colors: Red {C['neonRed']['hex']}, Blue {C['electricBlue']['hex']}, Gold {C['premiumGold']['hex']}\n"
+            "7. For questions, contact the brand team.\n")
+
+
 # ---------------------------------------------------------------------------
 # SAFARI PINNED TAB
 # ---------------------------------------------------------------------------
@@ -1137,15 +3166,17 @@ def generate_safari_pinned_tab_svg():
     rot = geom["ellipseOuter"]["rotationDeg"]
     outer_thick = geom["arcThickness"]["outerRatioToOuterRy"] * outer_ry
     taper = geom["tailTaper"]
+    # Pinned tabs are drawn at tab size; sample for 64px to cover 2x screens.
+    tolerance = arc_tolerance(size, 64)
     
     path1 = tapered_arc_path(cx, cy, outer_rx, outer_ry, rot,
                               -30, 200, outer_thick,
                               taper["startThicknessRatio"], taper["endThicknessRatio"],
-                              taper["taperExponent"])
+                              taper["taperExponent"], tolerance=tolerance)
     path2 = tapered_arc_path(cx, cy, outer_rx, outer_ry, rot,
                               150, 380, outer_thick * 0.8,
                               taper["startThicknessRatio"], taper["endThicknessRatio"],
-                              taper["taperExponent"])
+                              taper["taperExponent"], tolerance=tolerance)
     
     core_rx = geom["coreCutout"]["rxRatio"] * size
     core_ry = geom["coreCutout"]["ryRatio"] * size
@@ -1162,206 +3193,666 @@ def generate_safari_pinned_tab_svg():
 
 
 # ---------------------------------------------------------------------------
-# MAIN GENERATION
+# APP ICON GENERATION
 # ---------------------------------------------------------------------------
 
-def ensure_dir(path):
-    os.makedirs(path, exist_ok=True)
+def app_icon_container_shapes(app_size):
+    """The app icon's rounded-rect gradient background and its inset border, as Shapes."""
+    corner_r = round(app_size * APP_ICON["container"]["cornerRadiusPct"] / 100, 1)
+    return [
+        Shape("rect", (0, 0, app_size, app_size, corner_r), fill=("appBg", find_gradient("appIconBackground"))),
+        Shape("rect", (2, 2, app_size - 4, app_size - 4, round(corner_r - 2, 1)),
+              stroke=C["slateSurface"]["hex"], stroke_width=2, opacity=0.9),
+    ]
 
 
-def main():
-    print("=" * 60)
-    print("iTrader.im Brand Asset Generator")
-    print("=" * 60)
-    
-    base = OUTPUT_DIR
-    dirs = ["logo", "icon", "favicon", "app", "category", "og", "badges",
-            "placeholders", "effects", "spinners", "email", "legal", "manifest"]
-    for d in dirs:
-        ensure_dir(base / d)
-    
-    generated_files = []
-    
-    # -----------------------------------------------------------------------
-    # 1. LOGOS
-    # -----------------------------------------------------------------------
-    print("\n[1/10] Generating logos...")
-    
+def app_icon_placement(app_size):
+    """(icon size, x, y) of the vortex inside a ``app_size`` app icon."""
+    offset_y = app_size * APP_ICON["iconPlacement"]["centerOffsetPct"]["y"] / 100
+    icon_offset = (app_size - app_size * 0.72) / 2
+    return int(app_size * 0.72), icon_offset, icon_offset + offset_y
+
+
+def generate_app_icon_svg(app_variant, app_size=1024):
+    """Generate an app icon SVG ("vortexOnly" or "monogramIT")."""
+    doc = SvgDocument(app_size, app_size)
+    background, border = app_icon_container_shapes(app_size)
+    markup = [background.to_svg(doc), border.to_svg(doc)]
+    clip_id = doc.define("appClip", f'<clipPath id="{DEF_ID}"><rect width="{app_size}" height="{app_size}" '
+                                    f'rx="{background.geometry[4]}"/></clipPath>')
+    container = SvgNode("g", {"clip-path": f"url(#{clip_id})"}, markup)
+
+    if app_variant == "vortexOnly":
+        icon_size, x, y = app_icon_placement(app_size)
+        icon_id = vortex_icon_symbol(doc, icon_size, "core", with_glow=True)
+        container.append(doc.use(icon_id, x, y, icon_size, icon_size))
+    else:
+        chrome_id = doc.define("chromeText", svg_gradient_def(find_gradient("chromeTextGradient"), DEF_ID))
+        container.append(f'''<text x="{app_size/2}" y="{app_size/2}" text-anchor="middle" dominant-baseline="central"
+      font-family="'Montserrat', 'Eurostile', sans-serif" font-weight="bold" font-size="{app_size * 0.4}"
+      font-style="italic" fill="url(#{chrome_id})">iT</text>
+<rect x="{app_size * 0.55}" y="{app_size * 0.62}" width="{app_size * 0.12}" height="{app_size * 0.032}" rx="4" fill="{C['neonRed']['hex']}" opacity="0.9"/>''')
+
+    doc.add(container)
+    return doc.to_svg()
+
+
+# ---------------------------------------------------------------------------
+# INCREMENTAL BUILD CACHE
+# ---------------------------------------------------------------------------
+
+# Bump to invalidate every cached output, e.g. after changing the key layout.
+CACHE_VERSION = "2"
+
+# A key covers everything its job functions reach by name: the source of
+# each module-level function and class they use, transitively, the plain
+# constants they read and the brand-spec sections behind the SpecSection
+# views they touch. Gradients are only looked up by name (find_gradient),
+# so just the entries named in that code or in those spec sections are
+# hashed, and editing one gradient leaves assets that never draw it cached.
+GRADIENT_KEYS = ("gradientSystem", "gradients")
+PLAIN_TYPES = (type(None), bool, int, float, str, bytes)
+
+_source_digests = {}
+
+
+@functools.lru_cache(maxsize=None)
+def module_definitions():
+    """{name: (source, AST node)} of every top-level function and class in this file.
+
+    One parse of the file instead of inspect.getsource() per object, which
+    re-scans the whole module for every class.
+    """
+    source = Path(__file__).read_text(encoding="utf-8")
+    lines = source.splitlines(keepends=True)
+    definitions = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            first = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            definitions[node.name] = "".join(lines[first - 1:node.end_lineno]), node
+    return definitions
+
+
+def _definition(obj):
+    """(source, AST node) of a function or class defined in this file."""
+    found = module_definitions().get(obj.__name__)
+    if found is None or obj.__module__ != __name__:
+        source = inspect.getsource(obj)
+        return source, ast.parse(source)
+    return found
+
+
+def _source_digest(fn):
+    if fn not in _source_digests:
+        source = _definition(fn)[0]
+        _source_digests[fn] = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    return _source_digests[fn]
+
+
+@functools.lru_cache(maxsize=None)
+def _references(obj):
+    """(names, string literals) appearing in the source of ``obj``."""
+    names, literals = set(), set()
+    for node in ast.walk(_definition(obj)[1]):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            literals.add(node.value)
+    return frozenset(names), frozenset(literals)
+
+
+def _stable_repr(value):
+    """repr() of a constant with sets and dicts in sorted order and code by name."""
+    if isinstance(value, PLAIN_TYPES + (SpecSection,)):
+        return repr(value)
+    if isinstance(value, dict):
+        return "{" + ", ".join(sorted(f"{_stable_repr(k)}: {_stable_repr(v)}" for k, v in value.items())) + "}"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ", ".join(sorted(map(_stable_repr, value))) + "}"
+    if isinstance(value, (tuple, list)):
+        return "[" + ", ".join(map(_stable_repr, value)) + "]"
+    return value.__qualname__
+
+
+@functools.lru_cache(maxsize=None)
+def code_dependencies(root):
+    """Everything the function or class ``root`` reaches through module globals.
+
+    Returns (functions and classes, constant names, spec key paths, string
+    literals), ``root`` included. Modules, paths and other
+    runtime objects are not followed.
+    """
+    namespace = globals()
+    code, constants, spec, literals = set(), set(), set(), set()
+    pending = [root]
+
+    def visit(value):
+        # Queue any code and spec views inside ``value``; True if it is data.
+        if isinstance(value, PLAIN_TYPES):
+            if isinstance(value, str):
+                literals.add(value)
+        elif isinstance(value, SpecSection):
+            spec.add(value._keys)
+        elif isinstance(value, (tuple, list, set, frozenset)):
+            return all([visit(v) for v in value])
+        elif isinstance(value, dict):
+            return all([visit(k) and visit(v) for k, v in value.items()])
+        elif (not inspect.ismodule(value) and getattr(value, "__module__", None) == __name__
+              and (inspect.isclass(value) or inspect.isfunction(inspect.unwrap(value)))):
+            pending.append(value)
+        else:
+            if type(value).__module__ == __name__:
+                pending.append(type(value))
+            return False
+        return True
+
+    while pending:
+        obj = pending.pop()
+        if obj in code:
+            continue
+        code.add(obj)
+        names, strings = _references(obj)
+        literals |= strings
+        for name in names & namespace.keys():
+            value = namespace[name]
+            if visit(value) and not callable(value):
+                constants.add(name)
+    return frozenset(code), frozenset(constants), frozenset(spec), frozenset(literals)
+
+
+def spec_subtree(keys):
+    """The part of the brand spec at ``keys``, or None if it is missing."""
+    value = brand_spec()
+    for key in keys:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def spec_strings(value, found=None):
+    """Every string in a parsed spec subtree, keys included."""
+    found = set() if found is None else found
+    if isinstance(value, str):
+        found.add(value)
+    elif isinstance(value, dict):
+        found.update(value)
+        for v in value.values():
+            spec_strings(v, found)
+    elif isinstance(value, list):
+        for v in value:
+            spec_strings(v, found)
+    return found
+
+
+def raster_backend():
+    """Identify the rasterizer in use so cached PNGs never cross backends."""
+    if has_cairo():
+        import cairosvg
+        backend = f"cairosvg-{cairosvg.__version__}"
+    elif HAS_PILLOW:
+        import PIL
+        backend = f"pillow-{PIL.__version__}"
+    else:
+        backend = "none"
+    # Seeded textures draw from NumPy's generator when it is available.
+    if HAS_NUMPY:
+        backend += f"+numpy-{np.__version__}"
+    return backend
+
+
+def asset_cache_key(jobs, params):
+    """Cache key for one output of the functions ``jobs`` called with ``params``.
+
+    Combines the code_dependencies() of every job function and generator
+    involved (their source, constants and spec sections, and the gradients
+    they name), the call parameters (including output size), the
+    rasterizer backend and the shipped fonts.
+    """
+    code, constants, spec, literals = set(), set(), set(), set()
+    for job in jobs:
+        job_code, job_constants, job_spec, job_literals = code_dependencies(job)
+        code |= job_code
+        constants |= job_constants
+        spec |= job_spec
+        literals |= job_literals
+    h = hashlib.sha256(f"v{CACHE_VERSION}".encode("utf-8"))
+    for obj in sorted(code, key=lambda obj: obj.__qualname__):
+        h.update(f"{obj.__qualname__}={_source_digest(obj)}".encode("utf-8"))
+    namespace = globals()
+    for name in sorted(constants):
+        h.update(f"{name}={_stable_repr(namespace[name])}".encode("utf-8"))
+    subtrees = {keys: spec_subtree(keys) for keys in spec - {GRADIENT_KEYS}}
+    for keys, subtree in sorted(subtrees.items()):
+        h.update(f"{'/'.join(keys)}={json.dumps(subtree, sort_keys=True)}".encode("utf-8"))
+    if GRADIENT_KEYS in spec:
+        names = literals | spec_strings(list(subtrees.values()))
+        gradients = [g for g in spec_subtree(GRADIENT_KEYS) or () if g.get("name") in names]
+        h.update(f"gradients={json.dumps(gradients, sort_keys=True)}".encode("utf-8"))
+    h.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+    h.update(raster_backend().encode("utf-8"))
+    h.update(font_stamp().encode("utf-8"))
+    return h.hexdigest()
+
+
+class AssetCache:
+    """Content-addressed on-disk store of rendered asset bytes."""
+
+    def __init__(self, root, enabled=True):
+        self.root = Path(root)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, key):
+        return self.root / key[:2] / key
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        try:
+            data = self._entry(key).read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def original_size(self, key):
+        """Size before optimization recorded by put(), or None."""
+        try:
+            return int(self._entry(key).with_suffix(".original").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def profile(self, key):
+        """(phase seconds, rasterizer, traced memory peak) recorded by put(), or None."""
+        try:
+            entry = json.loads(self._entry(key).with_suffix(".profile").read_text(encoding="utf-8"))
+            return entry["phases"], entry["backend"], entry["peak"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, data, original_size=None, profile=None):
+        if not self.enabled:
+            return
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        if original_size is not None:
+            entry.with_suffix(".original").write_text(str(original_size), encoding="utf-8")
+        if profile is not None:
+            phases, backend, peak = profile
+            entry.with_suffix(".profile").write_text(
+                json.dumps({"phases": phases, "backend": backend, "peak": peak}), encoding="utf-8")
+        tmp = entry.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, entry)
+
+
+# ---------------------------------------------------------------------------
+# RENDER QUEUE
+# ---------------------------------------------------------------------------
+
+def _pool_job(fn, *args):
+    """Run a render job, returning its result, elapsed seconds and profile
+    (seconds per phase, rasterizer, traced memory peak)."""
+    state = profile_state()
+    state.backend = state.peak = None
+    phases = dict(state.totals)
+    start = time.perf_counter()
+    data = fn(*args)
+    elapsed = time.perf_counter() - start
+    profile = ({k: state.totals[k] - phases[k] for k in PHASES}, state.backend, state.peak)
+    return data, elapsed, profile
+
+
+class RenderQueue:
+    """Render a dependency graph of asset targets.
+
+    A target's job is a top-level function returning file bytes (or None on
+    failure). run() starts every target as soon as the targets it depends
+    on are rendered: with one worker jobs run inline in pack order,
+    otherwise rasters go to a process pool and SVG and text jobs to a
+    thread pool, so independent stages overlap. Written targets reserve
+    their slot in ``generated_files`` up front so the list keeps pack order
+    however the work is scheduled, and a job that raises is reported
+    without stopping the rest of the run. Rendered bytes are kept in
+    ``outputs`` for dependent targets and in-memory callers. ``timings``
+    records the seconds each target took and ``profiles`` the
+    (phase seconds, rasterizer, traced memory peak) of its render; for
+    targets in ``restored`` that is the profile cached with their bytes.
+
+    ``sink(name, bytes)``, if given, receives each written target as it
+    is stored, e.g. ZipStream.add to package the pack while it renders.
+
+    With ``png_effort`` above 0, .png targets also run their output through
+    optimize_png unless they opt out (AssetTarget.optimize), losslessly
+    unless ``near_lossless``. ``savings`` records the sizes before and after
+    optimization of every SVG and PNG rendered (not restored) this run, and
+    ``original_sizes`` the size before optimization of every optimized
+    output, restored ones included.
+    """
+
+    def __init__(self, base, cache, workers=1, png_effort=0, sink=None, near_lossless=False):
+        self.base = base
+        self.cache = cache
+        self.workers = workers
+        self.sink = sink
+        self.png_effort = png_effort if HAS_PILLOW else 0
+        self.png_max_error = NEAR_LOSSLESS_MAX_ERROR if near_lossless else 0
+        self.executor = None
+        self.threads = None
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+            self.threads = ThreadPoolExecutor(max_workers=workers)
+        self.generated_files = []
+        self.outputs = {}
+        self.timings = {}
+        self.profiles = {}
+        self.restored = set()
+        self.failed = []
+        self.savings = {"svg": [], "png": []}
+        self.original_sizes = {}
+
+    def run(self, targets, names, write=(), progress=None):
+        """Render ``names`` (and nothing else) from ``targets``, writing those in ``write``.
+
+        Dependencies outside ``names`` are taken from ``outputs`` if present.
+        ``progress(target, ok)`` is called as each target finishes.
+        """
+        import heapq
+        from concurrent.futures import FIRST_COMPLETED, wait
+        order = {name: i for i, name in enumerate(names)}
+        slots = {}
+        for name in names:
+            if name in write:
+                slots[name] = len(self.generated_files)
+                self.generated_files.append(None)
+        waiting = {name: {dep for dep in targets[name].deps if dep in order} for name in names}
+        dependents = {}
+        for name, deps in waiting.items():
+            for dep in deps:
+                dependents.setdefault(dep, []).append(name)
+        ready = [order[name] for name in names if not waiting[name]]
+        heapq.heapify(ready)
+        running = {}
+
+        def finished(name, ok):
+            if progress is not None:
+                progress(targets[name], ok)
+            for child in dependents.get(name, ()):
+                waiting[child].discard(name)
+                if not waiting[child]:
+                    heapq.heappush(ready, order[child])
+
+        while ready or running:
+            if ready:
+                name = names[heapq.heappop(ready)]
+                future = self._start(targets[name], slots.get(name))
+                if future is None:
+                    finished(name, name in self.outputs)
+                else:
+                    running[future] = name
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: order[running[f]]):
+                name = running.pop(future)
+                slot, key = slots.get(name), self._key(targets[name])
+                finished(name, self._finish(slot, name, key, functools.partial(self._pool_result, future)))
+        self.generated_files[:] = [f for f in self.generated_files if f is not None]
+
+    def _start(self, target, slot):
+        """Restore or run ``target`` inline; returns a future if it was handed to a pool."""
+        fn, args, key = target.fn, target.args, self._key(target)
+        if self._optimizes(target):
+            fn, args = optimize_png_job, (self.png_effort, self.png_max_error, fn) + args
+        start = time.perf_counter()
+        data = self.cache.get(key) if key is not None else None
+        if data is not None:
+            self.timings[target.name] = time.perf_counter() - start
+            self.restored.add(target.name)
+            profile = self.cache.profile(key)
+            if profile is not None:
+                self.profiles[target.name] = profile
+            self._store(slot, target.name, None, data, self.cache.original_size(key))
+            return None
+        if target.deps:
+            args += ({dep: self.outputs[dep] for dep in target.deps if dep in self.outputs},)
+        if self.executor is None:
+            self._finish(slot, target.name, key, lambda: self._timed(target.name, _pool_job(fn, *args)))
+            return None
+        pool = self.executor if target.raster else self.threads
+        future = pool.submit(_pool_job, fn, *args)
+        future.target_name = target.name
+        return future
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.threads.shutdown()
+
+    def print_savings(self, kind, label):
+        report = self.savings[kind]
+        before = sum(b for _, b, _ in report)
+        after = sum(a for _, _, a in report)
+        print(f"{label}: {before / 1024:.1f} KB -> {after / 1024:.1f} KB "
+              f"({before - after} bytes saved, {len(report)} files)")
+        for name, b, a in report:
+            print(f"  {name}: {b} -> {a} bytes (-{(b - a) / b * 100 if b else 0:.0f}%)")
+
+    def _key(self, target):
+        key = target.key
+        if key is None or not self._optimizes(target):
+            return key
+        return asset_cache_key((optimize_png_job,), {"asset": key, "effort": self.png_effort,
+                                                     "max_error": self.png_max_error})
+
+    def _optimizes(self, target):
+        return self.png_effort and target.optimize and target.name.endswith(".png")
+
+    def _timed(self, name, result):
+        data, elapsed, profile = result
+        self.timings[name] = elapsed
+        self.profiles[name] = profile
+        return data
+
+    def _pool_result(self, future):
+        return self._timed(future.target_name, future.result())
+
+    def _finish(self, slot, name, key, result):
+        try:
+            data = result()
+        except Exception as e:
+            print(f"  Render failed for {name}: {e}")
+            data = None
+        if data is None:
+            self.failed.append(name)
+            return False
+        return self._store(slot, name, key, data)
+
+    def _store(self, slot, name, key, data, original=None):
+        if isinstance(data, tuple):
+            data, original = data
+            self.savings[Path(name).suffix[1:]].append((name, original, len(data)))
+        if original is not None:
+            self.original_sizes[name] = original
+        self.outputs[name] = data
+        if key is not None:
+            self.cache.put(key, data, original, self.profiles.get(name))
+        if slot is not None:
+            with open(self.base / name, "wb") as f:
+                f.write(data)
+            self.generated_files[slot] = name
+            if self.sink is not None:
+                self.sink(name, data)
+        return True
+
+
+# ---------------------------------------------------------------------------
+# ASSET TARGETS
+# ---------------------------------------------------------------------------
+# Every file of the pack is a target: its path inside the pack, the stage
+# that produces it, the top-level job that renders its bytes and the cache
+# key for them. Targets derived from other targets (pyramid levels, srcset
+# widths, manifests) list those in ``deps``; their job gets the rendered
+# deps as a trailing {name: bytes} argument.
+
+# Generation stages, in pack order.
+STAGES = ("logos", "icon system", "favicons and app icons", "app icon variants",
+          "category expressions", "OG images", "badges", "placeholders",
+          "effects & spinners", "email, manifest, legal")
+RASTER_SUFFIXES = {".png", ".ico", ".webp", ".avif"}
+
+
+class AssetTarget:
+    """One file of the brand pack and the job that renders it.
+
+    ``optimize=False`` keeps a .png out of the optimize_png pass, e.g. a
+    banded banner that must never be decoded whole.
+    """
+
+    __slots__ = ("name", "stage", "fn", "args", "key", "deps", "optimize")
+
+    def __init__(self, name, stage, fn, args=(), key=None, deps=(), optimize=True):
+        self.name = name
+        self.stage = stage
+        self.fn = fn
+        self.args = tuple(args)
+        self.key = key
+        self.deps = tuple(deps)
+        self.optimize = optimize
+
+    @property
+    def raster(self):
+        return Path(self.name).suffix in RASTER_SUFFIXES
+
+    def __repr__(self):
+        return f"AssetTarget({self.name!r})"
+
+
+def build_targets(options=None):
+    """Every target of the brand pack, in pack order, keyed by name.
+
+    ``options`` is a parse_args() namespace; None means the CLI defaults.
+    Nothing is rendered until the targets are run by a RenderQueue.
+    """
+    options = options or parse_args([])
+    targets = {}
+    optimize = not options.no_svg_optimize
+
+    def add(name, stage, fn, *args, key=None, deps=(), optimize=True):
+        targets[name] = AssetTarget(name, stage, fn, args, key, deps, optimize)
+
+    def add_svg(name, stage, generator, *args, render_size=None):
+        add(name, stage, svg_job, optimize, options.reproducible, options.svg_tolerance, render_size,
+            generator, *args)
+
+    def add_ladder(stage, outputs, generator, gen_args, generators, params):
+        # Square PNGs of ``generator(*gen_args(size))``. In pyramid mode the
+        # largest size is rendered once and the others, except vector_sizes,
+        # are downsampled from it.
+        generators += (render_generated_png,)
+        derived = [sz for sz, _ in outputs if sz not in options.vector_sizes] if options.pyramid else []
+        master = max(derived) if len(derived) > 1 and HAS_PILLOW else None
+        master_name = dict(outputs).get(master)
+        for sz, name in outputs:
+            if master is None or sz == master or sz not in derived:
+                add(name, stage, render_generated_png, generator, gen_args(sz), sz, sz,
+                    key=asset_cache_key(generators, dict(params, size=[sz, sz])))
+            else:
+                add(name, stage, downsample_png, master_name, sz, deps=(master_name,),
+                    key=asset_cache_key(generators + (downsample_png,),
+                                        dict(params, size=[sz, sz], pyramid_from=master)))
+
+    # 1. Logos
     logo_configs = [
-        ("logo-full-dark.svg", 1200, 400, "dark", True, True),
-        ("logo-full-light.svg", 1200, 400, "light", True, True),
-        ("logo-compact-dark.svg", 400, 140, "dark", True, False),
-        ("logo-compact-light.svg", 400, 140, "light", True, False),
-        ("logo-wordmark.svg", 800, 200, "dark", False, False),
-        ("logo-wordmark-light.svg", 800, 200, "light", False, False),
+        ("logo-full-dark", 1200, 400, "dark", True, True),
+        ("logo-full-light", 1200, 400, "light", True, True),
+        ("logo-compact-dark", 400, 140, "dark", True, False),
+        ("logo-compact-light", 400, 140, "light", True, False),
+        ("logo-wordmark", 800, 200, "dark", False, False),
+        ("logo-wordmark-light", 800, 200, "light", False, False),
     ]
-    
-    for fname, w, h, mode, icon, tagline in logo_configs:
-        svg = generate_wordmark_svg(w, h, mode, icon, tagline)
-        path = base / "logo" / fname
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(svg)
-        generated_files.append(str(path.relative_to(base)))
-        print(f"  Created {fname}")
-    
-    # PNG exports
-    for svg_name, png_w in [("logo-full-dark.svg", 1200), ("logo-full-light.svg", 1200),
-                             ("logo-compact-dark.svg", 400), ("logo-compact-light.svg", 400)]:
-        svg_path = base / "logo" / svg_name
-        with open(svg_path, "r", encoding="utf-8") as f:
-            svg_content = f.read()
-        
-        png_name = svg_name.replace(".svg", ".png")
-        aspect = 400 / 1200 if "full" in svg_name else 140 / 400
-        png_h = int(png_w * aspect)
-        png_path = base / "logo" / png_name
-        if svg_to_png(svg_content, png_w, png_h, str(png_path)):
-            generated_files.append(str(png_path.relative_to(base)))
-            print(f"  Created {png_name}")
-    
-    # -----------------------------------------------------------------------
-    # 2. ICON SYSTEM
-    # -----------------------------------------------------------------------
-    print("\n[2/10] Generating icon system...")
-    
+    for fname, *wordmark_args in logo_configs:
+        add_svg(f"logo/{fname}.svg", 1, generate_wordmark_svg, *wordmark_args)
+    for fname, *wordmark_args in logo_configs[:4]:
+        png_w, png_h = wordmark_args[:2]
+        add(f"logo/{fname}.png", 1, render_svg_target_png, f"logo/{fname}.svg", png_w, png_h,
+            deps=(f"logo/{fname}.svg",),
+            key=asset_cache_key((render_svg_target_png, svg_job, generate_wordmark_svg),
+                                {"wordmark": wordmark_args, "size": [png_w, png_h],
+                                 "svg": [optimize, options.reproducible, options.svg_tolerance]}))
+
+    # 2. Icon system
     icon_variants = ["core", "energy", "trust", "premium", "monochromeWhite", "monochromeDark"]
     icon_file_names = ["icon-core", "icon-energy", "icon-trust", "icon-premium",
                        "icon-monochrome-white", "icon-monochrome-dark"]
-    icon_sizes = [1024, 512, 256, 128, 64, 32]
-    
     for variant, fname_base in zip(icon_variants, icon_file_names):
-        svg = generate_vortex_icon_svg(1024, variant, with_glow=True)
-        svg_path = base / "icon" / f"{fname_base}.svg"
-        with open(svg_path, "w", encoding="utf-8") as f:
-            f.write(svg)
-        generated_files.append(str(svg_path.relative_to(base)))
-        print(f"  Created {fname_base}.svg")
-        
-        for sz in icon_sizes:
-            png_path = base / "icon" / f"{fname_base}-{sz}.png"
-            if svg_to_png(svg, sz, sz, str(png_path)):
-                generated_files.append(str(png_path.relative_to(base)))
-        print(f"  Created {fname_base} PNGs ({', '.join(str(s) for s in icon_sizes)})")
-    
-    # -----------------------------------------------------------------------
-    # 3. FAVICONS & APP ICONS
-    # -----------------------------------------------------------------------
-    print("\n[3/10] Generating favicons and app icons...")
-    
-    icon_svg = generate_vortex_icon_svg(512, "core", with_glow=False)
-    
-    svg_path = base / "favicon" / "icon.svg"
-    with open(svg_path, "w", encoding="utf-8") as f:
-        f.write(icon_svg)
-    generated_files.append(str(svg_path.relative_to(base)))
-    
+        add_svg(f"icon/{fname_base}.svg", 2, generate_vortex_icon_svg, 1024, variant, True)
+        add_ladder(2, [(sz, f"icon/{fname_base}-{sz}.png") for sz in [1024, 512, 256, 128, 64, 32]],
+                   generate_vortex_icon_svg, lambda sz, variant=variant: (1024, variant, True, sz),
+                   (generate_vortex_icon_svg,),
+                   {"variant": variant, "glow": True, "svg_size": 1024})
+
+    # 3. Favicons
+    # Browsers show the SVG favicon at tab size; keep headroom for 2x screens.
+    add_svg("favicon/icon.svg", 3, generate_vortex_icon_svg, 512, "core", False, 64, render_size=64)
     favicon_sizes = {"icon.png": 32, "apple-icon.png": 180,
                      "android-chrome-192x192.png": 192, "android-chrome-512x512.png": 512,
                      "mstile-150x150.png": 150}
-    
-    pil_icons = {}
-    for fname, sz in favicon_sizes.items():
-        png_path = base / "favicon" / fname
-        if svg_to_png(icon_svg, sz, sz, str(png_path)):
-            generated_files.append(str(png_path.relative_to(base)))
-            print(f"  Created {fname}")
-        pil_img = svg_to_pil(icon_svg, sz, sz)
-        if pil_img:
-            pil_icons[sz] = pil_img
-    
-    ico_path = base / "favicon" / "favicon.ico"
-    ico_images = {}
-    for sz in [16, 32, 48]:
-        pil_img = svg_to_pil(icon_svg, sz, sz)
-        if pil_img:
-            ico_images[sz] = pil_img
-    if ico_images:
-        create_ico(ico_images, str(ico_path))
-        generated_files.append(str(ico_path.relative_to(base)))
-        print("  Created favicon.ico")
-    
-    safari_svg = generate_safari_pinned_tab_svg()
-    safari_path = base / "favicon" / "safari-pinned-tab.svg"
-    with open(safari_path, "w", encoding="utf-8") as f:
-        f.write(safari_svg)
-    generated_files.append(str(safari_path.relative_to(base)))
-    print("  Created safari-pinned-tab.svg")
-    
-    # -----------------------------------------------------------------------
-    # 4. APP ICON VARIANTS
-    # -----------------------------------------------------------------------
-    print("\n[4/10] Generating app icon variants...")
-    
-    app_bg_grad = find_gradient("appIconBackground")
-    
+    favicon_key = {"variant": "core", "glow": False, "svg_size": 512}
+    add_ladder(3, [(sz, f"favicon/{fname}") for fname, sz in favicon_sizes.items()],
+               generate_vortex_icon_svg, lambda sz: (512, "core", False, sz),
+               (generate_vortex_icon_svg,), favicon_key)
+    # The ICO reuses favicon rasters of its sizes; in pyramid mode the rest
+    # are downsampled from the largest one.
+    ico_sizes = [16, 32, 48]
+    favicon_names = {sz: f"favicon/{fname}" for fname, sz in favicon_sizes.items()}
+    ico_reuse = {sz: favicon_names[sz] for sz in ico_sizes if sz in favicon_names}
+    if options.pyramid and HAS_PILLOW:
+        ico_reuse = {sz: ico_reuse.get(sz, favicon_names[max(favicon_names)]) for sz in ico_sizes}
+    add("favicon/favicon.ico", 3, render_ico, functools.partial(generate_vortex_icon_svg, 512, "core", False),
+        ico_sizes, options.png_effort, ico_reuse, deps=sorted(set(ico_reuse.values())),
+        key=asset_cache_key((render_ico, generate_vortex_icon_svg),
+                            dict(favicon_key, ico_sizes=ico_sizes, reuse=sorted(ico_reuse.items()),
+                                 pyramid=options.pyramid, png_effort=options.png_effort)))
+    add_svg("favicon/safari-pinned-tab.svg", 3, generate_safari_pinned_tab_svg)
+
+    # 4. App icon variants
     for app_variant in ["vortexOnly", "monogramIT"]:
-        app_size = 1024
-        
-        if app_variant == "vortexOnly":
-            inner_icon = generate_vortex_icon_svg(int(app_size * 0.72), "core", with_glow=True)
-            icon_inner_defs = inner_icon.split("<defs>")[1].split("</defs>")[0] if "<defs>" in inner_icon else ""
-            icon_inner_body = inner_icon.split("</defs>")[1].split("</svg>")[0] if "</defs>" in inner_icon else ""
-            
-            corner_r = app_size * APP_ICON["container"]["cornerRadiusPct"] / 100
-            
-            defs = [svg_gradient_def(app_bg_grad, "appBg"), icon_inner_defs]
-            defs.append(svg_glow_filter("edgeGlow", "#FFFFFF", app_size * 0.06, 0, 0.22))
-            
-            offset_y = app_size * APP_ICON["iconPlacement"]["centerOffsetPct"]["y"] / 100
-            icon_offset = (app_size - app_size * 0.72) / 2
-            
-            svg = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {app_size} {app_size}" width="{app_size}" height="{app_size}">
-<defs>
-{chr(10).join(defs)}
-<clipPath id="appClip"><rect width="{app_size}" height="{app_size}" rx="{corner_r:.1f}"/></clipPath>
-</defs>
-<g clip-path="url(#appClip)">
-<rect width="{app_size}" height="{app_size}" rx="{corner_r:.1f}" fill="url(#appBg)"/>
-<rect x="2" y="2" width="{app_size-4}" height="{app_size-4}" rx="{corner_r-2:.1f}" fill="none" stroke="{C['slateSurface']['hex']}" stroke-width="2" opacity="0.9"/>
-<g transform="translate({icon_offset:.1f}, {icon_offset + offset_y:.1f})">
-{icon_inner_body}
-</g>
-</g>
-</svg>'''
-        else:
-            corner_r = app_size * APP_ICON["container"]["cornerRadiusPct"] / 100
-            chrome_grad = find_gradient("chromeTextGradient")
-            defs = [svg_gradient_def(app_bg_grad, "appBg"),
-                    svg_gradient_def(chrome_grad, "chromeText")]
-            
-            svg = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {app_size} {app_size}" width="{app_size}" height="{app_size}">
-<defs>
-{chr(10).join(defs)}
-<clipPath id="appClip"><rect width="{app_size}" height="{app_size}" rx="{corner_r:.1f}"/></clipPath>
-</defs>
-<g clip-path="url(#appClip)">
-<rect width="{app_size}" height="{app_size}" rx="{corner_r:.1f}" fill="url(#appBg)"/>
-<rect x="2" y="2" width="{app_size-4}" height="{app_size-4}" rx="{corner_r-2:.1f}" fill="none" stroke="{C['slateSurface']['hex']}" stroke-width="2" opacity="0.9"/>
-<text x="{app_size/2}" y="{app_size/2}" text-anchor="middle" dominant-baseline="central"
-      font-family="'Montserrat', 'Eurostile', sans-serif" font-weight="bold" font-size="{app_size * 0.4}"
-      font-style="italic" fill="url(#chromeText)">iT</text>
-<rect x="{app_size * 0.55}" y="{app_size * 0.62}" width="{app_size * 0.12}" height="{app_size * 0.032}" rx="4" fill="{C['neonRed']['hex']}" opacity="0.9"/>
-</g>
-</svg>'''
-        
-        svg_out = base / "app" / f"app-icon-{app_variant.lower()}.svg"
-        with open(svg_out, "w", encoding="utf-8") as f:
-            f.write(svg)
-        generated_files.append(str(svg_out.relative_to(base)))
-        
-        for sz in [1024, 512, 256, 128]:
-            png_path = base / "app" / f"app-icon-{app_variant.lower()}-{sz}.png"
-            if svg_to_png(svg, sz, sz, str(png_path)):
-                generated_files.append(str(png_path.relative_to(base)))
-        print(f"  Created app-icon-{app_variant.lower()} (SVG + PNGs)")
-    
-    # -----------------------------------------------------------------------
-    # 5. CATEGORY EXPRESSIONS
-    # -----------------------------------------------------------------------
-    print("\n[5/10] Generating category expressions...")
-    
+        stem = f"app/app-icon-{app_variant.lower()}"
+        add_svg(f"{stem}.svg", 4, generate_app_icon_svg, app_variant)
+        add_ladder(4, [(sz, f"{stem}-{sz}.png") for sz in [1024, 512, 256, 128]],
+                   generate_app_icon_svg, lambda sz, app_variant=app_variant: (app_variant,),
+                   (generate_app_icon_svg,),
+                   {"variant": app_variant})
+
+    # 5-6. Category and OG banners, each with optional WebP/AVIF siblings.
+    banner_formats = supported_formats([f for f in MODERN_FORMATS if f in options.banner_formats])
+    banners = []
+
+    def add_banner(stage, stem, generator, params, *gen_args):
+        # Banners over the memory budget are streamed in bands; their lossy
+        # siblings and PNG re-encoding would need the whole frame, so are skipped.
+        names = []
+        if banner_banded(*params["size"], options.memory_budget):
+            names.append(f"{stem}.png")
+            add(names[-1], stage, render_banner_bands, options.memory_budget, generator, *gen_args,
+                optimize=False, key=asset_cache_key((render_banner_bands, generator),
+                                                    dict(params, banded=True)))
+            banners.append((stem, *params["size"], names))
+            return
+        for fmt in banner_formats:
+            names.append(f"{stem}.{fmt}")
+            add(names[-1], stage, render_image_perceptual, fmt, options.ssim_target, generator, *gen_args,
+                key=asset_cache_key((render_image_perceptual, generator),
+                                    dict(params, format=fmt, ssim=options.ssim_target)))
+        names.append(f"{stem}.png")
+        add(names[-1], stage, render_image_png, generator, *gen_args,
+            key=asset_cache_key((render_image_png, generator), params))
+        banners.append((stem, *params["size"], names))
+
     cat_configs = [
         ("vehicles", "category-vehicles"),
         ("hifiAv", "category-hifi-av"),
@@ -1369,64 +3860,44 @@ def main():
         ("luxury", "category-luxury"),
         ("vehicles", "category-default"),
     ]
-    
+    hero_w, hero_h = 1920, 1080
+    srcset_widths = sorted({w for w in options.srcset if 0 < w < hero_w})
+    srcset_banners = []
     for cat_key, fname_base in cat_configs:
-        for w, h, suffix in [(1920, 1080, ""), (1200, 630, "-og")]:
-            img = generate_category_png(cat_key, w, h)
-            if img:
-                png_path = base / "category" / f"{fname_base}{suffix}.png"
-                img.save(str(png_path), "PNG")
-                generated_files.append(str(png_path.relative_to(base)))
-        print(f"  Created {fname_base} (1920x1080 + 1200x630)")
-    
-    # -----------------------------------------------------------------------
-    # 6. OPEN GRAPH IMAGES
-    # -----------------------------------------------------------------------
-    print("\n[6/10] Generating OG images...")
-    
+        for w, h, suffix in [(hero_w, hero_h, ""), (1200, 630, "-og")] + [(w, h, f"-{w}x{h}")
+                                                                         for w, h in options.hero_sizes]:
+            add_banner(5, f"category/{fname_base}{suffix}", generate_category_png,
+                       {"category": cat_key, "size": [w, h]}, cat_key, w, h)
+        if not options.srcset:
+            continue
+        hero = f"category/{fname_base}.png"
+        variants = [(hero_w, hero_h, hero)]
+        for w in srcset_widths:
+            name = f"category/{fname_base}-{w}w.png"
+            add(name, 5, downsample_png, hero, w, deps=(hero,),
+                key=asset_cache_key((downsample_png, generate_category_png),
+                                    {"category": cat_key, "size": [hero_w, hero_h], "width": w}))
+            variants.append((w, round(w * hero_h / hero_w), name))
+        srcset_banners.append((fname_base, variants))
+
     og_configs = [
-        ("opengraph-image.png", "default", 1200, 630),
-        ("opengraph-image-listing.png", "listing", 1200, 630),
-        ("opengraph-image-categories.png", "categories", 1200, 630),
-        ("twitter-image.png", "default", 1200, 600),
+        ("opengraph-image", "default", 1200, 630),
+        ("opengraph-image-listing", "listing", 1200, 630),
+        ("opengraph-image-categories", "categories", 1200, 630),
+        ("twitter-image", "default", 1200, 600),
     ]
-    
     for fname, variant, w, h in og_configs:
-        img = generate_og_image(variant, w, h)
-        if img:
-            png_path = base / "og" / fname
-            img.save(str(png_path), "PNG")
-            generated_files.append(str(png_path.relative_to(base)))
-            print(f"  Created {fname}")
-    
-    # -----------------------------------------------------------------------
-    # 7. BADGES
-    # -----------------------------------------------------------------------
-    print("\n[7/10] Generating badges...")
-    
+        add_banner(6, f"og/{fname}", generate_og_image, {"variant": variant, "size": [w, h]}, variant, w, h)
+
+    # 7. Badges
     for badge_type, fname in [("verifiedDealer", "badge-verified-dealer"),
-                               ("featured", "badge-featured"),
-                               ("premium", "badge-premium")]:
-        svg = generate_badge_svg(badge_type)
-        svg_path = base / "badges" / f"{fname}.svg"
-        with open(svg_path, "w", encoding="utf-8") as f:
-            f.write(svg)
-        generated_files.append(str(svg_path.relative_to(base)))
-        print(f"  Created {fname}.svg")
-    
+                              ("featured", "badge-featured"),
+                              ("premium", "badge-premium")]:
+        add_svg(f"badges/{fname}.svg", 7, generate_badge_svg, badge_type)
     for ptype, fname in [("stripe", "payment-stripe"), ("secure", "payment-secure")]:
-        svg = generate_payment_badge_svg(ptype)
-        svg_path = base / "badges" / f"{fname}.svg"
-        with open(svg_path, "w", encoding="utf-8") as f:
-            f.write(svg)
-        generated_files.append(str(svg_path.relative_to(base)))
-        print(f"  Created {fname}.svg")
-    
-    # -----------------------------------------------------------------------
-    # 8. PLACEHOLDERS
-    # -----------------------------------------------------------------------
-    print("\n[8/10] Generating placeholders...")
-    
+        add_svg(f"badges/{fname}.svg", 7, generate_payment_badge_svg, ptype)
+
+    # 8. Placeholders
     placeholder_configs = [
         ("listing", "placeholder-listing"),
         ("avatar", "placeholder-avatar"),
@@ -1435,116 +3906,721 @@ def main():
         ("empty-state-no-results", "empty-state-no-results"),
         ("empty-state-no-messages", "empty-state-no-messages"),
     ]
-    
     for ptype, fname in placeholder_configs:
-        svg = generate_placeholder_svg(ptype)
-        svg_path = base / "placeholders" / f"{fname}.svg"
-        with open(svg_path, "w", encoding="utf-8") as f:
-            f.write(svg)
-        generated_files.append(str(svg_path.relative_to(base)))
-        print(f"  Created {fname}.svg")
-    
-    # -----------------------------------------------------------------------
-    # 9. EFFECTS
-    # -----------------------------------------------------------------------
-    print("\n[9/10] Generating effects & spinners...")
-    
+        add_svg(f"placeholders/{fname}.svg", 8, generate_placeholder_svg, ptype)
+
+    # 9. Effects & spinners
     for direction, fname in [("horizontal", "gradient-streak-horizontal"),
-                              ("vertical", "gradient-streak-vertical")]:
-        svg = generate_streak_svg(direction)
-        svg_path = base / "effects" / f"{fname}.svg"
-        with open(svg_path, "w", encoding="utf-8") as f:
-            f.write(svg)
-        generated_files.append(str(svg_path.relative_to(base)))
-        print(f"  Created {fname}.svg")
-    
-    noise_svg = generate_noise_svg()
-    noise_path = base / "effects" / "noise-texture.svg"
-    with open(noise_path, "w", encoding="utf-8") as f:
-        f.write(noise_svg)
-    generated_files.append(str(noise_path.relative_to(base)))
-    print("  Created noise-texture.svg")
-    
-    carbon = generate_carbon_fiber_png()
-    if carbon:
-        carbon_path = base / "effects" / "carbon-fiber-pattern.png"
-        carbon.save(str(carbon_path), "PNG")
-        generated_files.append(str(carbon_path.relative_to(base)))
-        print("  Created carbon-fiber-pattern.png")
-    
-    glass = generate_glass_noise_png()
-    if glass:
-        glass_path = base / "effects" / "glass-noise.png"
-        glass.save(str(glass_path), "PNG")
-        generated_files.append(str(glass_path.relative_to(base)))
-        print("  Created glass-noise.png")
-    
-    # Spinners
+                             ("vertical", "gradient-streak-vertical")]:
+        add_svg(f"effects/{fname}.svg", 9, generate_streak_svg, direction)
+    add_svg("effects/noise-texture.svg", 9, generate_noise_svg)
+    texture_formats = [("png", render_image_png)]
+    if options.webp_textures and supported_formats(["webp"]):
+        texture_formats.append(("webp", render_image_webp))
+    textures = [(generate_glass_noise_png, "glass-noise", ())]
+    for density in CARBON_DENSITIES:
+        suffix = f"@{density}x" if density > 1 else ""
+        textures.append((generate_carbon_fiber_png, f"carbon-fiber-pattern{suffix}", (256, density)))
+    for generator, stem, gen_args in textures:
+        for ext, encoder in texture_formats:
+            add(f"effects/{stem}.{ext}", 9, encoder, generator, *gen_args,
+                key=asset_cache_key((encoder, generator),
+                                    {"args": list(gen_args), "format": ext}))
     for preset in ["energy", "trust", "default"]:
-        svg = generate_spinner_svg(preset)
-        svg_path = base / "spinners" / f"spinner-{preset}.svg"
-        with open(svg_path, "w", encoding="utf-8") as f:
-            f.write(svg)
-        generated_files.append(str(svg_path.relative_to(base)))
-        print(f"  Created spinner-{preset}.svg")
-    
-    anim_svg = generate_logo_animated_svg()
-    anim_path = base / "spinners" / "logo-animated.svg"
-    with open(anim_path, "w", encoding="utf-8") as f:
-        f.write(anim_svg)
-    generated_files.append(str(anim_path.relative_to(base)))
-    print("  Created logo-animated.svg")
-    
-    # -----------------------------------------------------------------------
-    # 10. EMAIL, MANIFEST, LEGAL
-    # -----------------------------------------------------------------------
-    print("\n[10/10] Generating email, manifest, legal...")
-    
-    # Email assets
-    email_logo_svg = generate_wordmark_svg(600, 200, "dark", True, False)
+        add_svg(f"spinners/spinner-{preset}.svg", 9, generate_spinner_svg, preset)
+    add_svg("spinners/logo-animated.svg", 9, generate_logo_animated_svg)
+
+    # 10. Email, manifests, legal
+    email_args = (600, 200, "dark", True, False)
     for fname, ew in [("email-header-logo.png", 600), ("email-footer-logo.png", 400)]:
         eh = int(ew * 200 / 600)
-        png_path = base / "email" / fname
-        if svg_to_png(email_logo_svg, ew, eh, str(png_path)):
-            generated_files.append(str(png_path.relative_to(base)))
-            print(f"  Created {fname}")
-    
-    # Webmanifest
-    manifest = generate_webmanifest()
-    manifest_path = base / "manifest" / "site.webmanifest"
-    with open(manifest_path, "w", encoding="utf-8") as f:
-        f.write(manifest)
-    generated_files.append(str(manifest_path.relative_to(base)))
-    print("  Created site.webmanifest")
-    
-    # Legal placeholder
-    legal_path = base / "legal" / "brand-usage-guidelines.txt"
-    with open(legal_path, "w", encoding="utf-8") as f:
-        f.write("iTrader.im Brand Usage Guidelines\n")
-        f.write("=" * 40 + "\n\n")
-        f.write("1. Always use official logo files from this package.\n")
-        f.write("2. Maintain minimum clear space around the logo.\n")
-        f.write("3. Do not alter colors, proportions, or effects.\n")
-        f.write("4. Use dark variants on dark backgrounds, light variants on light backgrounds.\n")
-        f.write("5. The vortex icon may be used standalone at sizes >= 32px.\n")
-        f.write(f"6. Primary brand colors: Red {C['neonRed']['hex']}, Blue {C['electricBlue']['hex']}, Gold {C['premiumGold']['hex']}\n")
-        f.write("7. For questions, contact the brand team.\n")
-    generated_files.append(str(legal_path.relative_to(base)))
-    print("  Created brand-usage-guidelines.txt")
+        add(f"email/{fname}", 10, render_generated_png, generate_wordmark_svg, email_args, ew, eh,
+            key=asset_cache_key((render_generated_png, generate_wordmark_svg),
+                                {"wordmark": list(email_args), "size": [ew, eh]}))
+    add("manifest/site.webmanifest", 10, text_job, generate_webmanifest)
+    add("manifest/image-formats.json", 10, image_formats_manifest, banners,
+        deps=[name for _, _, _, names in banners for name in names])
+    if options.srcset:
+        srcset_deps = [name for _, variants in srcset_banners for _, _, name in variants]
+        for ext in ("json", "ts"):
+            add(f"manifest/category-srcset.{ext}", 10, srcset_manifest_file, ext, srcset_banners,
+                deps=srcset_deps)
+    add("legal/brand-usage-guidelines.txt", 10, text_job, generate_usage_guidelines)
+    return targets
+
+
+def match_targets(targets, patterns):
+    """Names of ``targets`` matching any of the glob ``patterns``, in pack order.
+
+    Raises KeyError for a pattern that matches nothing.
+    """
+    import fnmatch
+    matched = set()
+    for pattern in patterns:
+        matches = [name for name in targets if fnmatch.fnmatchcase(name, pattern)]
+        if not matches:
+            raise KeyError(f"no target matches {pattern!r}")
+        matched.update(matches)
+    return [name for name in targets if name in matched]
+
+
+def with_dependencies(targets, names):
+    """``names`` plus every target they depend on, dependencies first."""
+    ordered = []
+    seen = set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        for dep in targets[name].deps:
+            visit(dep)
+        ordered.append(name)
+
+    for name in names:
+        visit(name)
+    return ordered
+
+
+def critical_path(targets, timings):
+    """Longest chain of dependent targets by render time, as (seconds, [names]).
+
+    No schedule can finish the timed targets faster than this chain, so it
+    is the floor for the build's wall time given enough workers.
+    """
+    finish = {}
+    chain = {}
+    for name in with_dependencies(targets, list(timings)):
+        deps = [dep for dep in targets[name].deps if dep in finish]
+        prev = max(deps, key=finish.get) if deps else None
+        finish[name] = timings.get(name, 0.0) + (finish[prev] if prev else 0.0)
+        chain[name] = (chain[prev] if prev else []) + [name]
+    if not finish:
+        return 0.0, []
+    end = max(finish, key=finish.get)
+    return finish[end], chain[end]
+
+
+def list_targets(options=None):
+    """Names of every target of the brand pack, e.g. "og/opengraph-image-listing.png"."""
+    return list(build_targets(options))
+
+
+def render_targets(patterns, options=None, cache=None):
+    """Render the targets matching ``patterns`` and return {name: bytes}.
+
+    Nothing is written to the output directory; pass an AssetCache to reuse
+    (and fill) the build cache. Dependencies are rendered as needed but
+    only the matching targets are returned.
+    """
+    options = options or parse_args([])
+    targets = build_targets(options)
+    wanted = match_targets(targets, patterns)
+    queue = RenderQueue(None, cache or AssetCache(options.cache_dir, enabled=False),
+                        workers=options.workers, png_effort=options.png_effort,
+                        near_lossless=options.png_near_lossless)
+    try:
+        queue.run(targets, with_dependencies(targets, wanted))
+    finally:
+        queue.shutdown()
+    return {name: queue.outputs[name] for name in wanted if name in queue.outputs}
+
+
+# ---------------------------------------------------------------------------
+# ZIP PACKAGE
+# ---------------------------------------------------------------------------
+# The pack is streamed into the archive from memory as targets finish
+# instead of being re-read from disk afterwards. Raster formats are
+# already compressed and are stored unless a fast deflate pass still
+# saves ZIP_MIN_SAVING (large flat images do, as deflate matches top out
+# at 258 bytes); SVG and text entries are deflated. Compression runs on a
+# thread pool (zlib releases the GIL) while rendering carries on, and
+# entries are written in the order they were added.
+
+PRECOMPRESSED_SUFFIXES = {".png", ".webp", ".avif", ".ico"}
+ZIP_DEFLATE_LEVEL = 9
+ZIP_PRECOMPRESSED_LEVEL = 1
+ZIP_MIN_SAVING = 1 / 8
+ZIP_STORED, ZIP_DEFLATED = 0, 8
+ZIP_VERSION = 20
+# Earliest timestamp a ZIP entry can hold.
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+def reproducible_date_time():
+    """Entry timestamp for reproducible archives: $SOURCE_DATE_EPOCH (UTC) if set, else ZIP_EPOCH."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if not epoch:
+        return ZIP_EPOCH
+    return max(tuple(time.gmtime(int(epoch))[:6]), ZIP_EPOCH)
+
+
+def zip_entry(name, data, date_time):
+    """Compress one archive entry.
+
+    Returns (name, method, CRC-32, payload, size, DOS time, DOS date);
+    entries that deflate no smaller (by ZIP_MIN_SAVING for rasters) are
+    stored.
+    """
+    method, payload = ZIP_STORED, data
+    precompressed = Path(name).suffix in PRECOMPRESSED_SUFFIXES
+    level, min_saving = (ZIP_PRECOMPRESSED_LEVEL, ZIP_MIN_SAVING) if precompressed else (ZIP_DEFLATE_LEVEL, 0)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+    if len(deflated) < len(data) * (1 - min_saving):
+        method, payload = ZIP_DEFLATED, deflated
+    year, month, day, hour, minute, second = date_time
+    dos_time = hour << 11 | minute << 5 | second // 2
+    dos_date = (max(year, 1980) - 1980) << 9 | month << 5 | day
+    return name, method, zlib.crc32(data), payload, len(data), dos_time, dos_date
+
+
+class ZipStream:
+    """Write a ZIP archive entry by entry from in-memory bytes.
+
+    Compression runs on ``workers`` threads; finished entries are written
+    as soon as everything added before them is. With ``sort`` entries are
+    held back and written by name at close() instead, and ``date_time``
+    fixes every entry's timestamp (default: the time it was added). The
+    archive is built in a temporary file that close() moves over
+    ``path``. ``count`` and ``size`` track the entries and bytes written
+    so far.
+    """
+
+    def __init__(self, path, workers=1, date_time=None, sort=False):
+        from concurrent.futures import ThreadPoolExecutor
+        self.path = Path(path)
+        self.tmp = self.path.with_name(self.path.name + ".tmp")
+        self.file = open(self.tmp, "wb")
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        self.date_time = date_time
+        self.sort = sort
+        self.queued = deque()
+        self.central = []
+        self.count = 0
+        self.size = 0
+
+    def add(self, name, data):
+        date_time = self.date_time or time.localtime()[:6]
+        self.queued.append((name, self.pool.submit(zip_entry, name, data, date_time)))
+        if not self.sort:
+            self._flush(block=False)
+
+    def close(self):
+        """Finish the archive and move it into place; returns the entry count."""
+        if self.sort:
+            self.queued = deque(sorted(self.queued, key=lambda entry: entry[0]))
+        self._flush(block=True)
+        self.pool.shutdown()
+        directory = b"".join(self.central)
+        self.file.write(directory)
+        self.file.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, self.count, self.count,
+                                    len(directory), self.size, 0))
+        self.size = self.file.tell()
+        self.file.close()
+        os.replace(self.tmp, self.path)
+        return self.count
+
+    def _flush(self, block):
+        while self.queued and (block or self.queued[0][1].done()):
+            self._write(*self.queued.popleft()[1].result())
+
+    def _write(self, name, method, crc, payload, size, dos_time, dos_date):
+        encoded = name.encode("utf-8")
+        flags = 0 if encoded.isascii() else 0x800
+        if self.size + len(payload) > 0xFFFFFFFF or self.count >= 0xFFFF:
+            raise ValueError("archive too large for ZIP without ZIP64")
+        fields = struct.pack("<HHHHIIIH", flags, method, dos_time, dos_date, crc, len(payload), size,
+                             len(encoded))
+        self.file.write(struct.pack("<IH", 0x04034B50, ZIP_VERSION) + fields + b"\0\0" + encoded)
+        self.file.write(payload)
+        # Made by Unix (3) so the 0644 permissions in the external attributes apply.
+        self.central.append(struct.pack("<IHH", 0x02014B50, 3 << 8 | ZIP_VERSION, ZIP_VERSION) + fields
+                            + struct.pack("<HHHHII", 0, 0, 0, 0, 0o100644 << 16, self.size) + encoded)
+        self.size = self.file.tell()
+        self.count += 1
+
+
+# ---------------------------------------------------------------------------
+# BUILD REPORT
+# ---------------------------------------------------------------------------
+# One record per written asset, saved as JSON and CSV next to the ZIP so
+# the slowest and heaviest assets can be tracked between builds.
+
+REPORT_FIELDS = ("name", "stage", "status", "seconds") + PHASES + ("bytes", "original_bytes", "optimized_bytes",
+                                                                    "width", "height", "backend", "peak_bytes")
+
+
+def _dimension(value):
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return int(number) if number.is_integer() else number
+
+
+def asset_dimensions(name, data):
+    """(width, height) of a rendered asset; (None, None) for text files."""
+    suffix = Path(name).suffix
+    if suffix == ".svg":
+        tag = re.search(rb"<svg\b[^>]*>", data)
+        attrs = {k.decode(): v.decode() for k, v in re.findall(rb'\s(width|height|viewBox)="([^"]*)"',
+                                                               tag.group() if tag else b"")}
+        if "width" in attrs and "height" in attrs:
+            return _dimension(attrs["width"]), _dimension(attrs["height"])
+        view_box = attrs.get("viewBox", "").split()
+        if len(view_box) == 4:
+            return _dimension(view_box[2]), _dimension(view_box[3])
+    elif suffix in RASTER_SUFFIXES and HAS_PILLOW:
+        try:
+            return Image.open(BytesIO(data)).size
+        except Exception:
+            pass
+    return None, None
+
+
+def build_report(targets, queue, names):
+    """Report records for ``names`` after ``queue`` has run them, in the given order.
+
+    ``status`` is "rendered", "restored" (from the build cache) or
+    "failed". ``seconds`` is what the asset cost this build; phase seconds,
+    ``backend`` and ``peak_bytes`` (the tracemalloc peak of banded renders)
+    describe its render, as cached alongside the bytes for restored assets.
+    ``original_bytes`` and ``optimized_bytes`` are the sizes before and
+    after the SVG or PNG optimization pass, for assets that went through one.
+    """
+    records = []
+    for name in names:
+        data = queue.outputs.get(name)
+        phases, backend, peak = queue.profiles.get(name, ({}, None, None))
+        if name in queue.failed:
+            status = "failed"
+        else:
+            status = "restored" if name in queue.restored else "rendered"
+        width, height = asset_dimensions(name, data) if data is not None else (None, None)
+        record = {"name": name, "stage": STAGES[targets[name].stage - 1], "status": status,
+                  "seconds": round(queue.timings.get(name, 0.0), 6)}
+        record.update((p, round(phases.get(p, 0.0), 6)) for p in PHASES)
+        original = queue.original_sizes.get(name)
+        record.update(bytes=len(data) if data is not None else None, original_bytes=original,
+                      optimized_bytes=len(data) if original is not None else None,
+                      width=width, height=height, backend=backend, peak_bytes=peak)
+        records.append(record)
+    return records
+
+
+def write_report(records, stem):
+    """Write ``records`` to ``stem``.json and ``stem``.csv; returns both paths."""
+    import csv
+    json_path, csv_path = stem.with_suffix(".json"), stem.with_suffix(".csv")
+    json_path.write_text(json.dumps({"backend": raster_backend(), "assets": records}, indent=2) + "\n",
+                         encoding="utf-8")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+    return json_path, csv_path
+
+
+def print_report_summary(records, top=10):
+    """Print the ``top`` slowest assets and per-stage totals, most expensive first."""
+    total = sum(r["seconds"] for r in records)
+    print(f"Slowest assets ({min(top, len(records))} of {len(records)}, {total:.2f}s in all):")
+    print(f"  {'asset':<44} {'total':>7} {'gen':>6} {'raster':>6} {'encode':>6} {'bytes':>8}  "
+          f"{'size':<9} {'backend':<18} status")
+    for r in sorted(records, key=lambda r: r["seconds"], reverse=True)[:top]:
+        size = f"{r['width']}x{r['height']}" if r["width"] is not None else "-"
+        print(f"  {r['name']:<44} {r['seconds']:7.3f} {r['generate']:6.3f} {r['rasterize']:6.3f} "
+              f"{r['encode']:6.3f} {r['bytes'] or 0:8}  {size:<9} {r['backend'] or '-':<18} {r['status']}")
+    stages = {}
+    for r in records:
+        entry = stages.setdefault(r["stage"], [0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += r["seconds"]
+        entry[2] += r["bytes"] or 0
+    print("By stage:")
+    for stage, (count, seconds, size) in sorted(stages.items(), key=lambda kv: kv[1][1], reverse=True):
+        print(f"  {stage:<26} {count:4} assets {seconds:8.3f}s {size / 1024:9.1f} KB")
+    banded = [r for r in records if r.get("peak_bytes") is not None]
+    if banded:
+        print("Banded renders (tracemalloc peak):")
+        for r in banded:
+            print(f"  {r['name']:<44} {r['peak_bytes'] / 1024 / 1024:8.1f} MB")
+
+
+# ---------------------------------------------------------------------------
+# BENCHMARKS
+# ---------------------------------------------------------------------------
+# Times each generator, rasterization path and encoder over a matrix of
+# sizes and variants, using only the brand spec on disk. Results are JSON
+# so a run can be compared against a stored baseline.
+
+# A case regresses when its best time exceeds the baseline by this fraction.
+BENCH_THRESHOLD = 0.25
+# Slowdowns smaller than this many seconds are timer noise, never regressions.
+BENCH_NOISE_FLOOR = 1e-4
+# Each case repeats until this many seconds have passed, within BENCH_RUNS.
+BENCH_MIN_TIME = 0.5
+BENCH_RUNS = (3, 500)
+
+
+def benchmark_cases():
+    """Every benchmark case as (name, fn, args), cheapest first.
+
+    A case returning bytes (or a str) also records its output size.
+    """
+    cases = []
+    for i, args in enumerate(icon_arc_args()):
+        size = (1024, 512, 32)[i // 2]
+        cases.append((f"geometry/tapered_arc_path/{size}-{i % 2}", tapered_arc_path, args))
+
+    svg_cases = [(f"svg/vortex-icon/{variant}-{size}", generate_vortex_icon_svg, (size, variant, True))
+                 for variant in ("core", "energy", "monochromeWhite") for size in (1024, 64)]
+    svg_cases += [(f"svg/wordmark/{w}x{h}-{mode}", generate_wordmark_svg, (w, h, mode, icon, tagline))
+                  for w, h, mode, icon, tagline in [(1200, 400, "dark", True, True),
+                                                    (400, 140, "light", True, False),
+                                                    (800, 200, "dark", False, False)]]
+    svg_cases += [(f"svg/app-icon/{variant}", generate_app_icon_svg, (variant,))
+                  for variant in ("vortexOnly", "monogramIT")]
+    svg_cases += [("svg/badge/verifiedDealer", generate_badge_svg, ("verifiedDealer",)),
+                  ("svg/placeholder/listing", generate_placeholder_svg, ("listing",)),
+                  ("svg/spinner/energy", generate_spinner_svg, ("energy",)),
+                  ("svg/logo-animated", generate_logo_animated_svg, ())]
+    for name, generator, args in svg_cases:
+        cases.append((name, generator, args))
+        cases.append((name.replace("svg/", "svg-optimize/", 1), optimize_svg, (generator(*args),)))
+
+    icon_svg = generate_vortex_icon_svg(1024, "core", True)
+    for size in (1024, 512, 128, 32):
+        cases.append((f"raster/vortex-icon/{size}", render_svg_png, (icon_svg, size, size)))
+    if HAS_NUMPY and HAS_PILLOW:
+        cases += [(f"raster/vortex-geometry/{size}", geometry_image,
+                   (generate_vortex_icon_svg, (1024, "core", True, size), size, size)) for size in (1024, 128)]
+        # Whole glows composited onto a canvas, as the banners draw them.
+        cases += [("glow/disc/r480-sigma240", glow_over, (np.zeros((1080, 1920, 3), dtype=np.float32), 1920, 1080,
+                                                          (480, 60, 1439, 1019), (226, 34, 41, 40), 240, (0, 1080))),
+                  ("glow/ellipse/400x200-sigma80", glow_over, (np.zeros((630, 1200, 3), dtype=np.float32), 1200, 630,
+                                                               (400, 215, 799, 414), (21, 123, 202, 25), 80, (0, 630))),
+                  ("glow/blur-coverage/1024-sigma46", blur_coverage,
+                   (np.pad(np.ones((512, 512), dtype=np.float32), 256), 46))]
+    logo_svg = generate_wordmark_svg(1200, 400, "dark", True, True)
+    cases.append(("raster/logo-full/1200x400", render_svg_png, (logo_svg, 1200, 400)))
+
+    if HAS_PILLOW:
+        cases += [(f"texture/carbon-fiber/@{d}x", generate_carbon_fiber_png, (256, d)) for d in (1, 3)]
+        cases.append(("texture/glass-noise", generate_glass_noise_png, ()))
+        for w, h in [(1200, 630), (1920, 1080)]:
+            cases += [(f"banner/category/{cat}-{w}x{h}", generate_category_png, (cat, w, h))
+                      for cat in ("vehicles", "watches")]
+            cases.append((f"banner/og/default-{w}x{h}", generate_og_image, ("default", w, h)))
+        cases.append(("banner/category-banded/vehicles-1920x1080", render_banner_bands,
+                       (64, generate_category_png, "vehicles", 1920, 1080)))
+        banner = generate_category_png("vehicles", 1200, 630)
+        png = encode_png(banner)
+        cases.append(("encode/png/1200x630", encode_png, (banner,)))
+        cases += [(f"encode/png-optimize/effort-{e}", optimize_png, (png, e)) for e in (1, 2)]
+        for fmt in supported_formats(list(MODERN_FORMATS)):
+            cases.append((f"encode/{fmt}/q{FALLBACK_QUALITY}", encode_lossy, (banner, fmt, FALLBACK_QUALITY)))
+    return cases
+
+
+def time_case(fn, args):
+    """Run ``fn(*args)`` repeatedly; returns (best seconds, mean seconds, runs, output bytes).
+
+    An untimed first call warms up the spec sections and caches ``fn`` reads.
+    """
+    result = fn(*args)
+    times = []
+    while len(times) < BENCH_RUNS[1] and (len(times) < BENCH_RUNS[0] or sum(times) < BENCH_MIN_TIME):
+        start = time.perf_counter()
+        result = fn(*args)
+        times.append(time.perf_counter() - start)
+    if isinstance(result, str):
+        result = result.encode("utf-8")
+    size = len(result) if isinstance(result, bytes) else None
+    return min(times), sum(times) / len(times), len(times), size
+
+
+def run_benchmarks(patterns=None):
+    """Time every benchmark case (or those matching the glob ``patterns``) and return the results."""
+    import fnmatch
+    import platform
+    cases = [c for c in benchmark_cases()
+             if not patterns or any(fnmatch.fnmatchcase(c[0], p) for p in patterns)]
+    results = {}
+    for name, fn, args in cases:
+        best, mean, runs, size = time_case(fn, args)
+        results[name] = {"best": round(best, 6), "mean": round(mean, 6), "runs": runs, "bytes": size}
+        print(f"  {name:<46} {best * 1000:9.2f} ms" + (f"  {size:>9} bytes" if size is not None else ""))
+    return {"python": platform.python_version(), "backend": raster_backend(),
+            "spec": str(spec_path()), "cases": results}
+
+
+def compare_benchmarks(results, baseline, threshold=BENCH_THRESHOLD):
+    """Print each case against ``baseline`` and return the names that regressed."""
+    if baseline.get("backend") != results["backend"]:
+        print(f"Note: baseline used {baseline.get('backend')}, this run {results['backend']}")
+    regressions = []
+    for name, new in results["cases"].items():
+        old = baseline["cases"].get(name)
+        if old is None:
+            print(f"  {name:<46} new case")
+            continue
+        ratio = new["best"] / old["best"] if old["best"] else 1.0
+        size_note = ""
+        if new["bytes"] is not None and old.get("bytes") not in (None, new["bytes"]):
+            size_note = f"  bytes {old['bytes']} -> {new['bytes']}"
+        flag = ""
+        if ratio > 1 + threshold and new["best"] - old["best"] > BENCH_NOISE_FLOOR:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:<46} {ratio:6.2f}x{size_note}{flag}")
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# MAIN GENERATION
+# ---------------------------------------------------------------------------
+
+def ensure_dir(path):
+    os.makedirs(path, exist_ok=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the iTrader.im brand asset pack.")
+    parser.add_argument("--spec", type=Path,
+                        help=f"brand spec JSON (default: ${SPEC_ENV}, else {JSON_PATH.relative_to(ROOT)}, "
+                             f"else {SPEC_FALLBACKS[0].relative_to(ROOT)})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-render every asset instead of restoring unchanged ones from the build cache")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR,
+                        help=f"build cache location (default: {CACHE_DIR.relative_to(ROOT)})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="rasterization processes (plus as many threads for SVG and text jobs); "
+                             "1 renders inline, 0 uses every CPU (default: 1)")
+    parser.add_argument("--pyramid", action="store_true",
+                        help="render each icon/favicon/app-icon ladder once at its largest size "
+                             "and derive the smaller sizes by downsampling")
+    parser.add_argument("--vector-sizes", type=lambda v: [int(s) for s in v.split(",") if s], default=[],
+                        metavar="N,N", help="ladder sizes that keep a true vector render in --pyramid mode")
+    parser.add_argument("--no-svg-optimize", action="store_true",
+                        help="write SVGs exactly as generated, skipping the optimization pass")
+    parser.add_argument("--svg-tolerance", type=float, default=0.1, metavar="PX",
+                        help="max deviation in output pixels when refitting SVG paths (default: 0.1)")
+    parser.add_argument("--png-effort", type=int, choices=range(4), default=2, metavar="0-3",
+                        help="PNG re-encoding effort: 0 off, 1 colour/palette reduction at zlib level 9, "
+                             "2 adds a row filter search, 3 tries every filter and zlib strategy "
+                             "(default: 2)")
+    parser.add_argument("--png-near-lossless", action="store_true",
+                        help="with --png-effort, also accept a quantized palette off by at most "
+                             f"{NEAR_LOSSLESS_MAX_ERROR} levels per channel; by default optimized PNGs "
+                             "decode to the same RGBA pixels")
+    parser.add_argument("--banner-formats", type=lambda v: [f for f in v.split(",") if f], default=[],
+                        metavar="FMT,FMT", help="lossy siblings to emit for category and OG banners: "
+                                               f"any of {', '.join(MODERN_FORMATS)}")
+    parser.add_argument("--srcset", type=lambda v: [int(w) for w in v.split(",") if w], nargs="?",
+                        const=list(SRCSET_WIDTHS), default=[], metavar="W,W",
+                        help="also emit category hero banners at these widths (up to 1920), with JSON/TS "
+                             f"manifests (default ladder: {','.join(map(str, SRCSET_WIDTHS))})")
+    parser.add_argument("--hero-sizes", default=[], metavar="WxH,WxH",
+                        type=lambda v: [tuple(int(n) for n in s.split("x")) for s in v.split(",") if s],
+                        help="also emit each category hero banner at these sizes, e.g. 7680x4320")
+    parser.add_argument("--memory-budget", type=int, default=BANNER_MEMORY_BUDGET_MB, metavar="MB",
+                        help="banners whose full frame would exceed this working set are drawn and "
+                             "PNG-encoded in horizontal bands, without WebP/AVIF siblings or PNG "
+                             f"re-encoding (default: {BANNER_MEMORY_BUDGET_MB})")
+    parser.add_argument("--ssim-target", type=float, default=SSIM_TARGET,
+                        help="minimum SSIM against the PNG master when picking banner WebP/AVIF "
+                             f"quality (default: {SSIM_TARGET})")
+    parser.add_argument("--webp-textures", action="store_true",
+                        help="also emit lossless WebP copies of the tiled effect textures")
+    parser.add_argument("--list", action="store_true",
+                        help="print the name of every target in the pack and exit")
+    parser.add_argument("--only", action="append", metavar="PATTERN",
+                        help="build only targets matching this glob, e.g. 'og/*.png' or "
+                             "'icon/icon-core-512.png' (repeatable; skips the ZIP and report files)")
+    parser.add_argument("--reproducible", action="store_true",
+                        help="byte-for-byte reproducible output: canonical numbers in unoptimized SVGs, "
+                             "ZIP entries sorted by name and stamped $SOURCE_DATE_EPOCH (else 1980-01-01)")
+    parser.add_argument("--check-reproducible", action="store_true",
+                        help="build the pack twice with --reproducible under different hash seeds, "
+                             "compare every file and exit 1 if any differs")
+    parser.add_argument("--pack-digests", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--benchmark", type=Path, nargs="?", const=ROOT / ".cache" / "brand-benchmark.json",
+                        metavar="OUT.json",
+                        help="time every generator, rasterizer and encoder case, write the results as JSON "
+                             "(default: .cache/brand-benchmark.json) and exit")
+    parser.add_argument("--bench-cases", action="append", metavar="PATTERN",
+                        help="with --benchmark, only run cases matching this glob, e.g. 'raster/*' (repeatable)")
+    parser.add_argument("--baseline", type=Path, metavar="BASELINE.json",
+                        help="with --benchmark, compare against these results and exit 1 on a regression")
+    parser.add_argument("--bench-threshold", type=float, default=BENCH_THRESHOLD, metavar="FRACTION",
+                        help="slowdown against --baseline counted as a regression "
+                             f"(default: {BENCH_THRESHOLD})")
+    parser.add_argument("--bench-geometry", action="store_true",
+                        help="benchmark the NumPy arc geometry against the pure-Python version and exit")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.banner_formats) - set(MODERN_FORMATS))
+    if unknown:
+        parser.error(f"unknown --banner-formats: {', '.join(unknown)}")
+    if args.workers <= 0:
+        args.workers = os.cpu_count() or 1
+    return args
+
+
+def pack_digests(options):
+    """SHA-256 of every file of a fresh in-memory build of the pack, and of its ZIP."""
+    import tempfile
+    outputs = render_targets(["*"], options)
+    digests = {name: hashlib.sha256(data).hexdigest() for name, data in outputs.items()}
+    with tempfile.TemporaryDirectory() as tmp:
+        package = ZipStream(Path(tmp) / "pack.zip", options.workers,
+                            date_time=reproducible_date_time(), sort=True)
+        for name, data in outputs.items():
+            package.add(name, data)
+        package.close()
+        digests["(zip)"] = hashlib.sha256(package.path.read_bytes()).hexdigest()
+    return digests
+
+
+def check_reproducible(argv):
+    """Build the pack in memory twice, in fresh interpreters with different
+    string hash seeds, and report any file whose bytes differ."""
+    import subprocess
+    import tempfile
+    argv = [a for a in argv if a != "--check-reproducible"] + ["--reproducible"]
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for seed in ("1", "2"):
+            out = Path(tmp) / f"digests-{seed}.json"
+            print(f"Building with PYTHONHASHSEED={seed}...")
+            result = subprocess.run([sys.executable, str(Path(__file__).resolve()), *argv, "--pack-digests", str(out)],
+                                    env=dict(os.environ, PYTHONHASHSEED=seed), check=False)
+            if result.returncode:
+                sys.exit(f"Build with PYTHONHASHSEED={seed} failed (exit {result.returncode})")
+            runs.append(json.loads(out.read_text(encoding="utf-8")))
+    first, second = runs
+    differing = sorted(name for name in first.keys() | second.keys() if first.get(name) != second.get(name))
+    if differing:
+        print(f"Not reproducible: {len(differing)} of {len(first)} files differ")
+        for name in differing:
+            print(f"  DIFFERS: {name}")
+        sys.exit(1)
+    print(f"Reproducible: {len(first) - 1} files and the ZIP are byte-identical across builds")
+    return True
+
+
+def benchmark_main(args):
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            sys.exit(f"Cannot read baseline {args.baseline}: {e}")
+    print("=" * 60)
+    print("iTrader.im Brand Asset Benchmarks")
+    print("=" * 60)
+    print(f"Spec: {spec_path()}")
+    print(f"Rasterizer: {raster_backend()}")
+    results = run_benchmarks(args.bench_cases)
+    if not results["cases"]:
+        sys.exit(f"No benchmark case matches {', '.join(args.bench_cases)}")
+    ensure_dir(args.benchmark.parent)
+    args.benchmark.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    print(f"\nResults written to {args.benchmark}")
+    if baseline is None:
+        return str(args.benchmark)
+    print(f"\nAgainst {args.baseline} (regression above {args.bench_threshold:.0%} slower):")
+    regressions = compare_benchmarks(results, baseline, args.bench_threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regressions: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nNo regressions")
+    return str(args.benchmark)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.spec:
+        # Exported so pool workers resolve the same spec.
+        os.environ[SPEC_ENV] = str(args.spec)
+        brand_spec.cache_clear()
+    try:
+        brand_spec()
+    except FileNotFoundError as e:
+        sys.exit(str(e))
+    if args.bench_geometry:
+        return benchmark_geometry()
+    if args.benchmark:
+        return benchmark_main(args)
+    if args.check_reproducible:
+        return check_reproducible(sys.argv[1:] if argv is None else list(argv))
+    if args.pack_digests:
+        args.pack_digests.write_text(json.dumps(pack_digests(args), indent=2), encoding="utf-8")
+        return str(args.pack_digests)
+    
+    targets = build_targets(args)
+    if args.list:
+        for name in targets:
+            print(name)
+        return
+    try:
+        wanted = match_targets(targets, args.only) if args.only else list(targets)
+    except KeyError as e:
+        sys.exit(e.args[0])
+    
+    print("=" * 60)
+    print("iTrader.im Brand Asset Generator")
+    print("=" * 60)
+    print(f"Spec: {spec_path()}")
+    if args.only:
+        print(f"Targets: {len(wanted)} of {len(targets)} ({', '.join(args.only)})")
+    for fmt in args.banner_formats:
+        if not supported_formats([fmt]):
+            print(f"Skipping {fmt} banners: not supported by this Pillow build")
+    
+    base = OUTPUT_DIR
+    cache = AssetCache(args.cache_dir, enabled=not args.no_cache)
+    dirs = ["logo", "icon", "favicon", "app", "category", "og", "badges",
+            "placeholders", "effects", "spinners", "email", "legal", "manifest"]
+    for d in dirs:
+        ensure_dir(base / d)
+    
+    zip_path = ZIP_PATH
+    package = None
+    if not args.only:
+        package = ZipStream(zip_path, args.workers, sort=args.reproducible,
+                            date_time=reproducible_date_time() if args.reproducible else None)
+    rasters = RenderQueue(base, cache, workers=args.workers, png_effort=args.png_effort,
+                          sink=package.add if package else None, near_lossless=args.png_near_lossless)
+    write = set(wanted)
+    stages_started = set()
+    
+    def progress(target, ok):
+        stage = target.stage
+        if stage not in stages_started:
+            stages_started.add(stage)
+            print(f"\n[{stage}/{len(STAGES)}] Generating {STAGES[stage - 1]}...")
+        if ok and target.name in write:
+            print(f"  Created {target.name}")
+    
+    if rasters.executor is not None:
+        print(f"Rendering on {rasters.workers} processes as dependencies allow")
+    build_start = time.perf_counter()
+    rasters.run(targets, with_dependencies(targets, wanted), write, progress)
+    build_time = time.perf_counter() - build_start
+    rasters.shutdown()
+    generated_files = rasters.generated_files
     
     # -----------------------------------------------------------------------
     # ZIP PACKAGE
     # -----------------------------------------------------------------------
     print("\n" + "=" * 60)
-    print("Packaging ZIP...")
-    
-    zip_path = ROOT / "itrader-brand-assets-v2.zip"
-    with zipfile.ZipFile(str(zip_path), "w", zipfile.ZIP_DEFLATED) as zf:
-        for root_dir, dirs, files in os.walk(str(base)):
-            for file in files:
-                file_path = os.path.join(root_dir, file)
-                arcname = os.path.relpath(file_path, str(base))
-                zf.write(file_path, arcname)
+    if package is None:
+        print("Skipping ZIP: --only builds part of the pack")
+    else:
+        print("Finishing ZIP...")
+        package.close()
     
     # Validation
     print("\n" + "=" * 60)
@@ -1563,20 +4639,40 @@ def main():
     if missing:
         for m in missing:
             print(f"  MISSING: {m}")
-    
-    with zipfile.ZipFile(str(zip_path), "r") as zf:
-        zip_count = len(zf.namelist())
-    
-    zip_size_mb = os.path.getsize(str(zip_path)) / (1024 * 1024)
-    print(f"ZIP contains: {zip_count} files")
-    print(f"ZIP size: {zip_size_mb:.2f} MB")
-    print(f"ZIP location: {zip_path}")
+    if rasters.failed:
+        print(f"Failed renders: {len(rasters.failed)}")
+        for f_rel in rasters.failed:
+            print(f"  FAILED: {f_rel}")
+    
+    if package is not None:
+        zip_size_mb = package.size / (1024 * 1024)
+        print(f"ZIP contains: {package.count} files")
+        print(f"ZIP size: {zip_size_mb:.2f} MB")
+        print(f"ZIP location: {zip_path}")
+    if cache.enabled:
+        print(f"Build cache: {cache.hits} restored, {cache.misses} rendered ({args.cache_dir})")
+    if rasters.savings["svg"]:
+        rasters.print_savings("svg", "SVG optimization")
+    if rasters.savings["png"]:
+        rasters.print_savings("png", "PNG optimization")
+    records = build_report(targets, rasters, wanted)
+    if args.only:
+        print("Skipping build report files: --only builds part of the pack")
+    else:
+        json_report, csv_report = write_report(records, zip_path.with_name(zip_path.stem + "-report"))
+        print(f"Build report: {json_report.name}, {csv_report.name} ({len(records)} assets)")
+    path_time, path = critical_path(targets, rasters.timings)
+    print(f"Build time: {build_time:.2f}s wall, {sum(rasters.timings.values()):.2f}s of jobs")
+    if path:
+        print(f"Critical path: {path_time:.2f}s ({' -> '.join(path)})")
+    print()
+    print_report_summary(records)
     
     print("\n" + "=" * 60)
     print("ASSET GENERATION COMPLETE")
     print("=" * 60)
     
-    return str(zip_path)
+    return None if args.only else str(zip_path)
 
 
 if __name__ == "__main__":